@@ -0,0 +1,115 @@
+"""Proximity search latency benchmark, in-process grid index against a full scan and, when TEST_DATABASE_URL is
+set, the MySQL SPATIAL index query over the properties stored there.
+
+Usage: python -m benchmarks.geo_benchmark [--properties 100000] [--queries 300]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import time
+
+from src.commons.geo import build_grid, haversine_km
+from src.models import PropertyFilters
+
+# Most listings are clustered around the main cities, the rest spread over the country
+CITIES = {
+    'bogota': (4.711, -74.0721),
+    'medellin': (6.2442, -75.5812),
+    'cali': (3.4516, -76.532),
+    'barranquilla': (10.9685, -74.7813),
+    'cartagena': (10.391, -75.4794),
+}
+RADII = [1, 5, 25]
+
+
+def _points(total: int):
+    rand = random.Random(42)
+    centers = list(CITIES.values())
+
+    for item_id in range(1, total + 1):
+        if rand.random() < 0.8:
+            lat, lon = rand.choice(centers)
+            yield item_id, rand.gauss(lat, 0.08), rand.gauss(lon, 0.08)
+        else:
+            yield item_id, rand.uniform(-4.2, 12.4), rand.uniform(-79, -67)
+
+
+def _percentile(values, percent):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * percent / 100))]
+
+
+def _report(name, latencies, results):
+    print(
+        f'{name:28} p50: {statistics.median(latencies):8.3f}ms p95: {_percentile(latencies, 95):8.3f}ms '
+        f'p99: {_percentile(latencies, 99):8.3f}ms results: {statistics.mean(results):8.1f}'
+    )
+
+
+def _timed(function, centers, radius):
+    latencies, results = [], []
+
+    for lat, lon in centers:
+        start = time.perf_counter()
+        found = function(lat, lon, radius)
+        latencies.append((time.perf_counter() - start) * 1000)
+        results.append(len(found))
+
+    return latencies, results
+
+
+def _mysql(centers, radius):
+    # pylint: disable=import-outside-toplevel
+    from pydbrepo.drivers.mysql import Mysql
+
+    from src.ports.repositories import PropertiesRepository
+
+    with Mysql(url=os.getenv('TEST_DATABASE_URL')) as driver:
+        repo = PropertiesRepository(driver)
+
+        def search(lat, lon, radius):
+            return repo.find_by_filters(PropertyFilters(lat=lat, lon=lon, radius=radius, fields=['id'])) or []
+
+        return _timed(search, centers, radius)
+
+
+def main():
+    """Benchmark entry point."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--properties', type=int, default=100000)
+    parser.add_argument('--queries', type=int, default=300)
+    parser.add_argument('--cell-size', type=float, default=0.02)
+    args = parser.parse_args()
+
+    points = list(_points(args.properties))
+
+    start = time.perf_counter()
+    index = build_grid(points, args.cell_size)
+    build_time = time.perf_counter() - start
+
+    rand = random.Random(7)
+    centers = [
+        (rand.gauss(lat, 0.05), rand.gauss(lon, 0.05))
+        for lat, lon in rand.choices(list(CITIES.values()), k=args.queries)
+    ]
+
+    def scan(lat, lon, radius):
+        return [
+            item_id for item_id, item_lat, item_lon in points if haversine_km(lat, lon, item_lat, item_lon) <= radius
+        ]
+
+    print(f'properties: {args.properties} grid build: {build_time:.2f}s cell size: {args.cell_size}')
+
+    for radius in RADII:
+        _report(f'grid {radius}km', *_timed(index.within, centers, radius))
+        _report(f'full scan {radius}km', *_timed(scan, centers[:max(args.queries // 30, 1)], radius))
+
+        if os.getenv('TEST_DATABASE_URL'):
+            _report(f'mysql spatial {radius}km', *_mysql(centers, radius))
+
+
+if __name__ == '__main__':
+    main()
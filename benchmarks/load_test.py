@@ -0,0 +1,428 @@
+"""Multi-process load test of the /properties route driven by API Gateway proxy events.
+
+Every worker process plays a warm Lambda container: it imports `src.routes.properties` on its own, so module state
+(caches, rate limiter, single flight, search backend detection) is per process, and invokes `find(event, context)`
+for the requests it takes from a shared queue, one at a time. Arrivals are scheduled open loop (Poisson process at
+`--rate` requests per second) and latency is measured from the scheduled arrival, queueing while every container
+is busy included.
+
+By default the database is a stand-in driver that answers every query after `--db-latency` ms with generated
+catalog rows, use `--database-url` to run against a local MySQL instead. Connections opened by the routes are
+counted in both cases.
+
+Usage: python -m benchmarks.load_test [--processes 4] [--rate 200] [--duration 30] [--database-url mysql://...]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import queue
+import random
+import re
+import statistics
+import time
+import uuid
+from collections import Counter
+
+CITIES = ['bogota', 'medellin', 'cali', 'barranquilla', 'cartagena', 'pereira']
+WORDS = ['piscina', 'balcon', 'terraza', 'chimenea', 'jardin', 'remodelado']
+
+_SELECT_COLUMNS_RE = re.compile(r'^SELECT (?:/\*.*?\*/ )?(.*?) FROM `property`')
+
+
+class StandInDatabase:
+    """pydbrepo Mysql driver stand-in that answers the property queries with generated rows after a fixed latency.
+
+    :param latency: Seconds every query takes
+    :param connect_latency: Seconds a connection takes
+    :param rows: Max rows returned by a property search
+    :param catalog_size: Number of generated properties
+    """
+
+    def __init__(self, latency: float, connect_latency: float, rows: int, catalog_size: int, **_):
+        self.latency = latency
+        self.rows = rows
+        self.catalog_size = catalog_size
+
+        time.sleep(connect_latency)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        return False
+
+    @staticmethod
+    def placeholder(**_):
+        return '%s'
+
+    def query(self, sql, args=None, **_):
+        time.sleep(self.latency)
+
+        if sql.startswith('SELECT property_id from'):
+            return [(property_id, ) for property_id in range(1, self.catalog_size + 1)]
+
+        match = _SELECT_COLUMNS_RE.match(sql)
+
+        if match is None:
+            return []
+
+        columns = [column.strip('`') for column in match.group(1).split(',')]
+        rand = random.Random(len(args or []))
+
+        return [tuple(_value(column, item, rand) for column in columns) for item in range(1, self.rows + 1)]
+
+    def query_one(self, sql, args=None, **kwargs):
+        records = self.query(sql, args, **kwargs)
+        return records[0] if records else None
+
+    def query_none(self, sql, args=None, **_):
+        time.sleep(self.latency)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+def _value(column, item, rand):
+    return {
+        'id': item,
+        'address': f'calle {rand.randint(1, 200)} # {rand.randint(1, 99)}',
+        'city': rand.choice(CITIES),
+        'price': rand.randint(100, 900) * 1000000,
+        'description': ' '.join(rand.choices(WORDS, k=8)),
+        'year': rand.randint(1960, 2021),
+        'latitude': rand.uniform(3, 11),
+        'longitude': rand.uniform(-77, -73),
+    }.get(column, None)
+
+
+class ConnectionCounter:
+    """Driver factory wrapper that counts opened and concurrently open connections.
+
+    :param connect: Driver factory
+    """
+
+    def __init__(self, connect):
+        self.connect = connect
+        self.opened = 0
+        self.open = 0
+        self.peak = 0
+
+    def __call__(self, **kwargs):
+        driver = self.connect(**kwargs)
+
+        self.opened += 1
+        self.open += 1
+        self.peak = max(self.peak, self.open)
+
+        return _TrackedConnection(driver, self)
+
+
+class _TrackedConnection:
+    """Connection proxy that tells the counter when it is closed."""
+
+    def __init__(self, driver, counter):
+        self._driver = driver
+        self._counter = counter
+
+    def __enter__(self):
+        self._driver.__enter__()
+        return self
+
+    def __exit__(self, *args):
+        self._counter.open -= 1
+        return self._driver.__exit__(*args)
+
+    def __getattr__(self, name):
+        return getattr(self._driver, name)
+
+
+class LambdaContext:
+    """Lambda context stand-in.
+
+    :param timeout: Function timeout in seconds
+    """
+
+    def __init__(self, timeout: float):
+        self.aws_request_id = str(uuid.uuid4())
+        self.function_name = 'habi-api-load-test-find_properties'
+        self._deadline = time.monotonic() + timeout
+
+    def get_remaining_time_in_millis(self) -> int:
+        return int(max(self._deadline - time.monotonic(), 0) * 1000)
+
+
+def build_event(query_params, user_id):
+    """Build an API Gateway proxy event for GET /properties.
+
+    :param query_params: Query string parameters
+    :param user_id: Value of the x-user-id header
+    :return dict: Lambda http event
+    """
+
+    return {
+        'resource': '/properties',
+        'path': '/properties',
+        'httpMethod': 'GET',
+        'headers': {
+            'Accept': 'application/json',
+            'x-user-id': str(user_id)
+        },
+        'queryStringParameters': query_params or None,
+        'pathParameters': None,
+        'requestContext': {
+            'path': '/dev/properties',
+            'httpMethod': 'GET',
+            'requestId': str(uuid.uuid4()),
+            'identity': {
+                'sourceIp': f'10.0.{user_id % 256}.{user_id // 256 % 256}'
+            },
+        },
+        'body': None,
+        'isBase64Encoded': False,
+    }
+
+
+def random_query(rand):
+    """Random filters following a mix of common searches.
+
+    :param rand: Random generator
+    :return dict: Query string parameters
+    """
+
+    params = {}
+
+    if rand.random() < 0.7:
+        params['city'] = ','.join(rand.sample(CITIES, rand.choice([1, 1, 2])))
+
+    if rand.random() < 0.4:
+        params['status'] = ','.join(str(item) for item in rand.sample([3, 4, 5], rand.randint(1, 2)))
+
+    if rand.random() < 0.3:
+        year = rand.randint(1980, 2015)
+        params['year_min'], params['year_max'] = str(year), str(year + rand.randint(1, 10))
+
+    if rand.random() < 0.2:
+        params['price_max'] = str(rand.randint(2, 9) * 100000000)
+
+    if rand.random() < 0.15:
+        params['q'] = ' '.join(rand.sample(WORDS, 2))
+
+    if rand.random() < 0.2:
+        params['sort'] = rand.choice(['price', '-price', 'year,-price'])
+
+    return params
+
+
+def worker(options, requests, results):
+    """Worker process loop, one simulated warm container.
+
+    :param options: Command line options
+    :param requests: Queue of (scheduled_at, query_params, user_id) tuples, None stops the worker
+    :param results: Queue of result messages
+    """
+
+    os.environ['LOG_LEVEL'] = options['log_level']
+
+    if options['database_url']:
+        os.environ['DATABASE_URL'] = options['database_url']
+    else:
+        # The stand-in database has no search indexes to detect
+        os.environ.setdefault('SEARCH_BACKEND', 'mysql')
+        os.environ.setdefault('GEO_BACKEND', 'mysql')
+
+    start = time.monotonic()
+
+    # pylint: disable=import-outside-toplevel
+    from pydbrepo.drivers.mysql import Mysql
+
+    from src.adapters.database import database
+    from src.routes import properties
+
+    if options['database_url']:
+        counter = ConnectionCounter(Mysql)
+    else:
+        counter = ConnectionCounter(
+            lambda **_: StandInDatabase(
+                latency=options['db_latency'],
+                connect_latency=options['db_connect_latency'],
+                rows=options['rows'],
+                catalog_size=options['catalog_size'],
+            )
+        )
+
+    database.ROUTER = database.ReplicaRouter(primary_url=options['database_url'], replica_urls=[], connect=counter)
+
+    results.put(('ready', os.getpid(), time.monotonic() - start))
+
+    while True:
+        request = requests.get()
+
+        if request is None:
+            break
+
+        scheduled_at, query_params, user_id = request
+        started_at = time.monotonic()
+
+        try:
+            response = properties.find(build_event(query_params, user_id), LambdaContext(options['timeout']))
+            status = response['statusCode']
+        except Exception:  # pylint: disable=broad-except
+            status = 'exception'
+
+        results.put(('request', scheduled_at, started_at, time.monotonic(), status))
+
+    results.put(('done', os.getpid(), counter.opened, counter.peak))
+
+
+def _percentile(values, percent):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * percent / 100))]
+
+
+def _latencies(name, values):
+    values = [value * 1000 for value in values]
+
+    return (
+        f'{name:10} p50: {statistics.median(values):8.2f}ms p90: {_percentile(values, 90):8.2f}ms '
+        f'p99: {_percentile(values, 99):8.2f}ms max: {max(values):8.2f}ms'
+    )
+
+
+def main():
+    """Load test entry point."""
+
+    # pylint: disable=too-many-locals
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--processes', type=int, default=4, help='Simulated warm containers')
+    parser.add_argument('--rate', type=float, default=200, help='Arrivals per second (open loop)')
+    parser.add_argument('--duration', type=float, default=30, help='Seconds of arrivals')
+    parser.add_argument('--users', type=int, default=1000, help='Distinct x-user-id values')
+    parser.add_argument('--timeout', type=float, default=6, help='Simulated function timeout in seconds')
+    parser.add_argument('--database-url', default=None, help='Local MySQL, the stand-in database when it is not set')
+    parser.add_argument('--db-latency', type=float, default=2, help='Stand-in query latency in ms')
+    parser.add_argument('--db-connect-latency', type=float, default=1, help='Stand-in connection latency in ms')
+    parser.add_argument('--rows', type=int, default=50, help='Stand-in rows per search')
+    parser.add_argument('--catalog-size', type=int, default=10000, help='Stand-in property ids')
+    parser.add_argument('--log-level', default='ERROR', help='Route log level')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', action='store_true', help='Print the summary as JSON')
+    args = parser.parse_args()
+
+    options = {
+        'database_url': args.database_url,
+        'db_latency': args.db_latency / 1000,
+        'db_connect_latency': args.db_connect_latency / 1000,
+        'rows': args.rows,
+        'catalog_size': args.catalog_size,
+        'timeout': args.timeout,
+        'log_level': args.log_level,
+    }
+
+    # Spawned workers start from a clean interpreter, like new containers
+    mp_context = multiprocessing.get_context('spawn')
+    requests, results = mp_context.Queue(), mp_context.Queue()
+    workers = [mp_context.Process(target=worker, args=(options, requests, results)) for _ in range(args.processes)]
+
+    for process in workers:
+        process.start()
+
+    init_times = [results.get()[2] for _ in workers]
+
+    rand = random.Random(args.seed)
+    started_at = time.monotonic()
+    scheduled_at = started_at
+    scheduled = 0
+
+    while True:
+        scheduled_at += rand.expovariate(args.rate)
+
+        if scheduled_at - started_at > args.duration:
+            break
+
+        delay = scheduled_at - time.monotonic()
+
+        if delay > 0:
+            time.sleep(delay)
+
+        requests.put((scheduled_at, random_query(rand), rand.randint(1, args.users)))
+        scheduled += 1
+
+    for _ in workers:
+        requests.put(None)
+
+    latencies, service_times, statuses, finished_at = [], [], Counter(), started_at
+    connections, peak_connections, done = 0, 0, 0
+
+    while done < len(workers):
+        try:
+            message = results.get(timeout=args.timeout + 60)
+        except queue.Empty:
+            break
+
+        if message[0] == 'request':
+            _, request_scheduled_at, request_started_at, request_finished_at, status = message
+            latencies.append(request_finished_at - request_scheduled_at)
+            service_times.append(request_finished_at - request_started_at)
+            statuses[status] += 1
+            finished_at = max(finished_at, request_finished_at)
+        else:
+            done += 1
+            connections += message[2]
+            peak_connections += message[3]
+
+    for process in workers:
+        process.join(timeout=5)
+
+    errors = sum(total for status, total in statuses.items() if status == 'exception' or status >= 400)
+    elapsed = max(finished_at - started_at, 1e-9)
+
+    summary = {
+        'processes': args.processes,
+        'database': 'mysql' if args.database_url else 'stand-in',
+        'scheduled': scheduled,
+        'completed': len(latencies),
+        'throughput_rps': round(len(latencies) / elapsed, 1),
+        'error_rate': round(errors / max(len(latencies), 1), 4),
+        'statuses': {str(status): total
+                     for status, total in sorted(statuses.items(), key=str)},
+        'connections_opened': connections,
+        'connections_peak': peak_connections,
+        'init_seconds_max': round(max(init_times), 3),
+    }
+
+    if latencies:
+        for name, values in (('latency', latencies), ('service', service_times)):
+            summary[f'{name}_ms'] = {
+                'p50': round(statistics.median(values) * 1000, 2),
+                'p90': round(_percentile(values, 90) * 1000, 2),
+                'p99': round(_percentile(values, 99) * 1000, 2),
+                'max': round(max(values) * 1000, 2),
+            }
+
+    if args.json:
+        print(json.dumps(summary))
+        return
+
+    print(
+        f"processes: {args.processes} database: {summary['database']} rate: {args.rate}/s "
+        f"duration: {args.duration}s init: {summary['init_seconds_max']}s"
+    )
+    print(
+        f"completed: {summary['completed']}/{scheduled} throughput: {summary['throughput_rps']}/s "
+        f"error rate: {summary['error_rate']:.2%} statuses: {summary['statuses']}"
+    )
+    print(f"connections opened: {connections} peak open: {peak_connections}")
+
+    if latencies:
+        print(_latencies('latency', latencies))
+        print(_latencies('service', service_times))
+
+
+if __name__ == '__main__':
+    main()
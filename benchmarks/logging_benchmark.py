@@ -0,0 +1,115 @@
+"""Per request logging overhead, synchronous handler versus the async batch pipeline.
+
+Every simulated request emits the same records as a /properties call (a debug record plus the `handled request`
+record with path, request and response fields). The output stream simulates a pipe with a fixed cost per write
+call, like stdout captured by the Lambda runtime.
+
+Usage: python -m benchmarks.logging_benchmark [--requests 2000] [--rows 50] [--write-cost-us 40]
+"""
+
+import argparse
+import io
+import logging
+import statistics
+import time
+
+from elasticlogger import Logger
+
+from src.commons.logging.pipeline import AsyncBatchHandler
+
+
+class SlowStream(io.StringIO):
+    """In memory stream with a fixed cost per write call."""
+
+    def __init__(self, write_cost: float):
+        super().__init__()
+        self.write_cost = write_cost
+
+    def write(self, text):
+        end = time.perf_counter() + self.write_cost
+
+        while time.perf_counter() < end:
+            pass
+
+        return super().write(text)
+
+
+def _response(rows: int):
+    return {
+        'properties': [
+            {
+                'id': index,
+                'address': f'calle {index} # 10-20',
+                'city': 'bogota',
+                'price': 250000000,
+                'description': 'Apartamento amplio con balcon y vista a la ciudad ' * 3,
+                'year': 2010,
+            } for index in range(rows)
+        ]
+    }
+
+
+def _run(name: str, logger: Logger, requests: int, rows: int, flush=None):
+    body = _response(rows)
+    latencies = []
+    start = time.perf_counter()
+
+    for _ in range(requests):
+        request_start = time.perf_counter()
+
+        logger.field('service', 'mysql').debug('querying properties')
+        logger.fields({
+            'path': '/properties',
+            'method': 'GET',
+            'request': {
+                'status': '3,4'
+            },
+            'response': body,
+        }).info('handled request')
+
+        if flush is not None:
+            flush()
+
+        latencies.append((time.perf_counter() - request_start) * 1e6)
+
+    total = time.perf_counter() - start
+    print(
+        f'{name:28} mean: {statistics.mean(latencies):8.1f}us p50: {statistics.median(latencies):8.1f}us '
+        f'total: {total:6.2f}s'
+    )
+
+
+def main():
+    """Benchmark entry point."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--rows', type=int, default=50)
+    parser.add_argument('--write-cost-us', type=float, default=40)
+    args = parser.parse_args()
+
+    write_cost = args.write_cost_us / 1e6
+
+    sync_logger = Logger('bench-sync', level=logging.DEBUG)
+    sync_logger.logger.propagate = False
+    sync_logger.logger.handlers[0].setStream(SlowStream(write_cost))
+
+    async_logger = Logger('bench-async', level=logging.DEBUG)
+    async_logger.logger.propagate = False
+    target = async_logger.logger.handlers[0]
+    target.setStream(SlowStream(write_cost))
+    pipeline = AsyncBatchHandler([target])
+    async_logger.logger.removeHandler(target)
+    async_logger.logger.addHandler(pipeline)
+
+    print(f'requests: {args.requests} response rows: {args.rows} write cost: {args.write_cost_us}us')
+    _run('sync', sync_logger, args.requests, args.rows)
+    _run('async (request path only)', async_logger, args.requests, args.rows)
+    pipeline.flush(timeout=60)
+    _run('async + flush per request', async_logger, args.requests, args.rows, flush=pipeline.flush)
+    pipeline.flush(timeout=60)
+    print(f'async records written: {pipeline.written} dropped: {pipeline.dropped}')
+
+
+if __name__ == '__main__':
+    main()
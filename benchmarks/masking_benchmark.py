@@ -0,0 +1,103 @@
+"""Protected data masking benchmark on deep and wide payloads.
+
+Compares the previous recursive in place masking with the copy on write masker.
+
+Usage: python -m benchmarks.masking_benchmark [--iterations 200]
+"""
+
+import argparse
+import copy
+import statistics
+import time
+
+from src.commons.masking import Masker
+from src.models import Property
+
+PROTECTED = {'password', 'password_confirmation'}
+
+
+def _legacy_mask(data):
+    """Previous implementation, it walks and rewrites every container."""
+
+    if isinstance(data, list):
+        for index, value in enumerate(data):
+            data[index] = _legacy_mask(value)
+
+    if isinstance(data, dict):
+        protected = {
+            'password',
+            'password_confirmation',
+        }
+
+        for key in data.keys():
+            if key in protected:
+                data[key] = '******'
+                continue
+
+            data[key] = _legacy_mask(data[key])
+
+    return data
+
+
+def _wide_payload(size):
+    return {
+        'properties': [
+            {
+                'id': index,
+                'address': f'calle {index}',
+                'city': 'bogota',
+                'price': 1000 * index,
+                'description': 'apartamento con balcon',
+                'year': 2000,
+            } for index in range(size)
+        ]
+    }
+
+
+def _deep_payload(depth, width):
+    node = {'password': 'secret', 'value': 1}
+
+    for level in range(depth):
+        node = {f'child{index}': node if index == 0 else {'level': level, 'items': [1, 2, 3]} for index in range(width)}
+
+    return node
+
+
+def _measure(function, payload, iterations):
+    latencies = []
+
+    for _ in range(iterations):
+        start = time.perf_counter()
+        function(payload)
+        latencies.append((time.perf_counter() - start) * 1000000)
+
+    return statistics.mean(latencies), statistics.median(latencies)
+
+
+def main():
+    """Benchmark entry point."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--iterations', type=int, default=200)
+    args = parser.parse_args()
+
+    plain = Masker(PROTECTED)
+    shaped = Masker(PROTECTED, safe_shapes=[vars(Property())])
+
+    payloads = {
+        'wide (1000 properties)': _wide_payload(1000),
+        'deep (depth 12, width 4)': _deep_payload(12, 4),
+    }
+
+    for name, payload in payloads.items():
+        print(name)
+
+        for label, function in [
+            ('legacy in place', _legacy_mask), ('copy on write', plain.mask), ('copy on write + shapes', shaped.mask)
+        ]:
+            mean, p50 = _measure(function, copy.deepcopy(payload), args.iterations)
+            print(f'  {label:24} mean: {mean:9.1f}us p50: {p50:9.1f}us')
+
+
+if __name__ == '__main__':
+    main()
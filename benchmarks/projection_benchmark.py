@@ -0,0 +1,78 @@
+"""Field projection bytes on wire benchmark.
+
+Compares the response size of full property rows with sparse fieldsets. When TEST_DATABASE_URL is set it also
+measures the bytes MySQL sends for the search query of each fieldset.
+
+Usage: python -m benchmarks.projection_benchmark [--rows 10000]
+"""
+
+import argparse
+import json
+import os
+import random
+
+from src.models import PropertyFilters
+
+FIELDSETS = [None, ['id', 'city', 'price'], ['id', 'address', 'city', 'price', 'year']]
+WORDS = ['apartamento', 'casa', 'balcon', 'piscina', 'terraza', 'gimnasio', 'parqueadero', 'jardin', 'chimenea']
+
+
+def _rows(total):
+    rand = random.Random(7)
+
+    return [
+        {
+            'id': index,
+            'address': f'calle {rand.randint(1, 200)} # {rand.randint(1, 99)}-{rand.randint(1, 99)}',
+            'city': rand.choice(['bogota', 'medellin', 'cali']),
+            'price': rand.randint(100, 2000) * 1000000,
+            'description': ' '.join(rand.choices(WORDS, k=rand.randint(20, 80))),
+            'year': rand.randint(1950, 2021),
+        } for index in range(total)
+    ]
+
+
+def _database_bytes(fields):
+    # pylint: disable=import-outside-toplevel
+    from pydbrepo.drivers.mysql import Mysql
+
+    from src.ports.repositories import PropertiesRepository
+
+    with Mysql(url=os.getenv('TEST_DATABASE_URL')) as driver:
+        repo = PropertiesRepository(driver)
+        ids = repo._get_property_ids_by_status() or [0]  # pylint: disable=protected-access
+        sql_query, values = repo.build_filters_query(PropertyFilters(fields=fields), ids)
+
+        before = int(driver.query_one(sql="SHOW SESSION STATUS LIKE 'Bytes_sent'")[1])
+        driver.query(sql=str(sql_query), args=values)
+        after = int(driver.query_one(sql="SHOW SESSION STATUS LIKE 'Bytes_sent'")[1])
+
+    return after - before
+
+
+def main():
+    """Benchmark entry point."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=10000)
+    args = parser.parse_args()
+
+    rows = _rows(args.rows)
+    full_size = None
+
+    print(f'rows: {args.rows}')
+
+    for fields in FIELDSETS:
+        projected = rows if fields is None else [{field: row[field] for field in fields} for row in rows]
+        size = len(json.dumps({'properties': projected}).encode())
+        full_size = full_size or size
+        line = f'{",".join(fields or ["all"]):36} response: {size / 1024:8.1f} KiB ({size / full_size:4.0%})'
+
+        if os.getenv('TEST_DATABASE_URL'):
+            line += f' mysql: {_database_bytes(fields) / 1024:8.1f} KiB'
+
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""Property listing response formats size and encode/decode benchmark.
+
+Usage: python -m benchmarks.response_format_benchmark [--rows 10000] [--iterations 20]
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+
+import msgpack
+
+from src.commons.http import to_columns
+
+WORDS = ['apartamento', 'casa', 'balcon', 'piscina', 'terraza', 'gimnasio', 'parqueadero', 'jardin', 'chimenea']
+CITIES = ['bogota', 'medellin', 'cali', 'pereira', 'barranquilla']
+
+
+def _rows(total):
+    rand = random.Random(7)
+
+    return [
+        {
+            'id': index,
+            'address': f'calle {rand.randint(1, 200)} # {rand.randint(1, 99)}-{rand.randint(1, 99)}',
+            'city': rand.choice(CITIES),
+            'price': rand.randint(100, 2000) * 1000000,
+            'description': ' '.join(rand.choices(WORDS, k=rand.randint(5, 15))),
+            'year': rand.randint(1950, 2021),
+        } for index in range(total)
+    ]
+
+
+def _measure(function, iterations):
+    latencies = []
+    result = None
+
+    for _ in range(iterations):
+        start = time.perf_counter()
+        result = function()
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    return result, statistics.median(latencies)
+
+
+def main():
+    """Benchmark entry point."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--iterations', type=int, default=20)
+    args = parser.parse_args()
+
+    rows = _rows(args.rows)
+    formats = [
+        ('json rows', lambda: json.dumps({
+            'properties': rows
+        }).encode(), json.loads),
+        ('json columnar', lambda: json.dumps({
+            'properties': to_columns(rows)
+        }).encode(), json.loads),
+        ('msgpack rows', lambda: msgpack.packb({'properties': rows}), msgpack.unpackb),
+        ('msgpack columnar', lambda: msgpack.packb({'properties': to_columns(rows)}), msgpack.unpackb),
+    ]
+
+    print(f'rows: {args.rows}')
+
+    for name, encode, decode in formats:
+        payload, encode_time = _measure(encode, args.iterations)
+        _, decode_time = _measure(lambda: decode(payload), args.iterations)  # pylint: disable=cell-var-from-loop
+
+        print(
+            f'{name:18} size: {len(payload) / 1024:8.1f} KiB (as base64 {len(payload) * 4 / 3 / 1024:8.1f} KiB) '
+            f'encode p50: {encode_time:6.2f}ms decode p50: {decode_time:6.2f}ms'
+        )
+
+
+if __name__ == '__main__':
+    main()
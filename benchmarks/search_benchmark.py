@@ -0,0 +1,83 @@
+"""Local search index build and query latency benchmark.
+
+Usage: python -m benchmarks.search_benchmark [--documents 100000] [--queries 500]
+"""
+
+import argparse
+import itertools
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from src.commons.search import InvertedIndex, build_index
+
+# Common words shared by most listings plus a long tail vocabulary, so term frequencies follow a
+# Zipf-like distribution similar to real descriptions.
+COMMON_WORDS = [
+    'apartamento', 'casa', 'balcon', 'piscina', 'terraza', 'gimnasio', 'parqueadero', 'jardin', 'chimenea',
+    'remodelado', 'iluminado', 'amplio', 'vista', 'estudio', 'duplex', 'penthouse', 'cocina', 'integral', 'ascensor',
+    'porteria', 'conjunto', 'cerrado', 'norte', 'sur', 'centro', 'bogota', 'medellin', 'cali'
+]
+STREETS = ['calle', 'carrera', 'avenida', 'transversal', 'diagonal']
+VOCABULARY = COMMON_WORDS + [f'palabra{index}' for index in range(20000)]
+CUM_WEIGHTS = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(VOCABULARY))))
+
+QUERIES = ['apartamento', 'casa jardin', 'penthouse terraza chimenea', 'medellin norte', 'palabra120 palabra4500']
+
+
+def _documents(total: int):
+    rand = random.Random(42)
+
+    for doc_id in range(1, total + 1):
+        description = ' '.join(rand.choices(VOCABULARY, cum_weights=CUM_WEIGHTS, k=rand.randint(15, 60)))
+        address = f'{rand.choice(STREETS)} {rand.randint(1, 200)} # {rand.randint(1, 99)}'
+        yield doc_id, f'{description} {address}'
+
+
+def _percentile(values, percent):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * percent / 100))]
+
+
+def main():
+    """Benchmark entry point."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--documents', type=int, default=100000)
+    parser.add_argument('--queries', type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'properties.idx')
+
+        start = time.perf_counter()
+        build_index(_documents(args.documents), path)
+        build_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index = InvertedIndex(path)
+        open_time = time.perf_counter() - start
+
+        print(f'documents: {args.documents} index size: {os.path.getsize(path) / 1024 / 1024:.1f} MiB')
+        print(f'build: {build_time:.2f}s open: {open_time * 1000:.3f}ms')
+
+        for query in QUERIES:
+            latencies = []
+
+            for _ in range(args.queries // len(QUERIES)):
+                start = time.perf_counter()
+                index.search(query, limit=50)
+                latencies.append((time.perf_counter() - start) * 1000)
+
+            print(
+                f'{query!r:32} p50: {statistics.median(latencies):7.2f}ms '
+                f'p95: {_percentile(latencies, 95):7.2f}ms p99: {_percentile(latencies, 99):7.2f}ms'
+            )
+
+        index.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""Catalog snapshot build, open and search latency benchmark.
+
+Usage: python -m benchmarks.snapshot_benchmark [--properties 100000] [--queries 200]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from pypika import Order
+
+from src.commons.snapshot import CatalogSnapshot, build_snapshot
+from src.models import PropertyFilters
+from src.models.types import PropertyStatus
+from src.ports.repositories import SnapshotPropertiesRepository
+
+CITIES = ['bogota', 'medellin', 'cali', 'barranquilla', 'cartagena'] + [f'municipio{index}' for index in range(200)]
+
+FILTERS = {
+    'city': PropertyFilters(cities=['medellin']),
+    'city year range': PropertyFilters(cities=['bogota'], year_min=1990, year_max=2000),
+    'cities year price': PropertyFilters(cities=['cali', 'bogota'], year=2000, price_max=500000000),
+    'year price': PropertyFilters(year=2005, price_max=300000000),
+    'status sorted': PropertyFilters(statuses=[PropertyStatus.vendido], sort=[('price', Order.desc)]),
+    '500 ids': PropertyFilters(ids=list(range(1, 100000, 200))),
+    'city fields': PropertyFilters(cities=['medellin'], fields=['id', 'price']),
+}
+
+
+def _records(total: int):
+    rand = random.Random(42)
+    weights = [30, 20, 15, 8, 7] + [0.1] * (len(CITIES) - 5)
+
+    for property_id in range(1, total + 1):
+        yield {
+            'id': property_id,
+            'address': f'calle {rand.randint(1, 200)} # {rand.randint(1, 99)}-{rand.randint(1, 99)}',
+            'city': rand.choices(CITIES, weights)[0],
+            'price': rand.randint(50, 2000) * 1000000,
+            'description': f'apartamento {rand.randint(1, 5)} habitaciones',
+            'year': rand.randint(1950, 2021),
+            'latitude': rand.uniform(-4, 12),
+            'longitude': rand.uniform(-79, -67),
+            'status_id': rand.choice([3, 4, 5]),
+        }
+
+
+def _percentile(values, percent):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * percent / 100))]
+
+
+def main():
+    """Benchmark entry point."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--properties', type=int, default=100000)
+    parser.add_argument('--queries', type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'catalog.snap')
+
+        start = time.perf_counter()
+        build_snapshot(_records(args.properties), path)
+        build_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        snapshot = CatalogSnapshot(path)
+        open_time = time.perf_counter() - start
+
+        repo = SnapshotPropertiesRepository(snapshot)
+
+        print(f'properties: {args.properties} snapshot size: {os.path.getsize(path) / 1024 / 1024:.1f} MiB')
+        print(f'build: {build_time:.2f}s open: {open_time * 1000:.3f}ms')
+
+        for name, filters in FILTERS.items():
+            latencies = []
+            results = 0
+
+            for _ in range(max(args.queries // len(FILTERS), 1)):
+                start = time.perf_counter()
+                results = len(repo.find_by_filters(filters) or [])
+                latencies.append((time.perf_counter() - start) * 1000)
+
+            print(
+                f'{name:20} p50: {statistics.median(latencies):8.2f}ms p95: {_percentile(latencies, 95):8.2f}ms '
+                f'results: {results}'
+            )
+
+        snapshot.close()
+
+
+if __name__ == '__main__':
+    main()
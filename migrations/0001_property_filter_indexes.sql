@@ -0,0 +1,23 @@
+-- Composite indexes used by PropertiesRepository.find_by_filters.
+--
+-- The repository picks one of these indexes through a `USE INDEX` hint (see FILTER_INDEXES in
+-- src/ports/repositories/properties_repository.py) and orders the WHERE predicates so equality
+-- filters cover the leftmost index columns followed by at most one range filter:
+--
+--   city=...                          -> idx_property_city_year_price (city)
+--   city=...&year=...                 -> idx_property_city_year_price (city, year)
+--   city=...&year_min=...&year_max=.. -> idx_property_city_year_price (city, year range)
+--   city=...&year=...&price_min=...   -> idx_property_city_year_price (city, year, price range)
+--   year=...&price_max=...            -> idx_property_year_price (year, price range)
+--   year_min=...                      -> idx_property_year_price (year range)
+--   price_min=...&price_max=...       -> idx_property_price (price range)
+--
+-- Keep FILTER_INDEXES in sync when adding or dropping any of these indexes.
+
+CREATE INDEX idx_property_city_year_price ON property (city, year, price);
+CREATE INDEX idx_property_year_price ON property (year, price);
+CREATE INDEX idx_property_price ON property (price);
+
+-- Latest status lookup used by _get_property_ids_by_status.
+CREATE INDEX idx_status_history_property_date ON status_history (property_id, update_date, status_id);
+CREATE INDEX idx_status_history_status_property ON status_history (status_id, property_id);
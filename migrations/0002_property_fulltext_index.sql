@@ -0,0 +1,7 @@
+-- FULLTEXT index used by the `q` search parameter of /properties.
+--
+-- When this index exists (and SEARCH_BACKEND is `auto` or `mysql`) PropertiesRepository resolves searches
+-- with MATCH(description, address) AGAINST (... IN NATURAL LANGUAGE MODE). Without it the adapter falls back
+-- to the local index built with `make search-index`.
+
+CREATE FULLTEXT INDEX ft_property_description_address ON property (description, address);
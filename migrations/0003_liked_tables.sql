@@ -0,0 +1,26 @@
+-- Liked properties tables (see "Requirement number 2 explanation" on the README).
+--
+-- `liked` keeps the current likes of every user, one row per (property, user). `liked_history` is append only,
+-- LikesRepository.insert_history writes it with multi-row INSERTs flushed from an in-memory buffer.
+
+CREATE TABLE IF NOT EXISTS liked (
+    id INT UNSIGNED NOT NULL AUTO_INCREMENT,
+    property_id INT NOT NULL,
+    user_id INT NOT NULL,
+    create_date DATETIME NOT NULL,
+    PRIMARY KEY (id),
+    UNIQUE KEY uk_liked_property_user (property_id, user_id),
+    KEY idx_liked_user (user_id),
+    CONSTRAINT fk_liked_property FOREIGN KEY (property_id) REFERENCES property (id)
+);
+
+CREATE TABLE IF NOT EXISTS liked_history (
+    id BIGINT UNSIGNED NOT NULL AUTO_INCREMENT,
+    property_id INT NOT NULL,
+    user_id INT NOT NULL,
+    liked TINYINT(1) NOT NULL,
+    update_date DATETIME NOT NULL,
+    PRIMARY KEY (id),
+    KEY idx_liked_history_property_date (property_id, update_date),
+    KEY idx_liked_history_user_date (user_id, update_date)
+);
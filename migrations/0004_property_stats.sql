@@ -0,0 +1,35 @@
+-- Incrementally maintained aggregates served by /properties/stats.
+--
+-- StatsRepository rolls up status_history rows with an id greater than aggregate_watermark.last_id: every property
+-- whose latest status changed is moved from its previous (city, year, status) bucket to the new one and
+-- property_current_status keeps the status, city and year it is currently counted under. The scheduled refresh
+-- also moves the properties whose city or year changed without a status change (e.g. bulk imports). Each batch,
+-- the aggregates and the new watermark are written in one transaction holding the watermark row lock.
+
+CREATE TABLE IF NOT EXISTS aggregate_watermark (
+    name VARCHAR(64) NOT NULL,
+    last_id BIGINT UNSIGNED NOT NULL DEFAULT 0,
+    update_date DATETIME NULL,
+    PRIMARY KEY (name)
+);
+
+CREATE TABLE IF NOT EXISTS property_current_status (
+    property_id INT NOT NULL,
+    status_id INT NOT NULL,
+    update_date DATETIME NULL,
+    city VARCHAR(64) NULL,
+    year INT NULL,
+    PRIMARY KEY (property_id)
+);
+
+CREATE TABLE IF NOT EXISTS property_stats (
+    city VARCHAR(64) NOT NULL DEFAULT '',
+    year INT NOT NULL DEFAULT 0,
+    status_id INT NOT NULL,
+    total INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (city, year, status_id),
+    KEY idx_property_stats_status (status_id),
+    KEY idx_property_stats_year (year)
+);
+
+INSERT IGNORE INTO aggregate_watermark (name, last_id) VALUES ('property_stats', 0);
@@ -0,0 +1,7 @@
+-- Property coordinates used by the `lat`, `lon` and `radius` parameters of /properties.
+--
+-- Properties without coordinates never match a proximity search.
+
+ALTER TABLE property
+    ADD COLUMN latitude DOUBLE NULL,
+    ADD COLUMN longitude DOUBLE NULL;
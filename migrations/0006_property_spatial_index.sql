@@ -0,0 +1,14 @@
+-- SPATIAL index used by proximity searches (`lat`, `lon` and `radius` parameters of /properties).
+--
+-- `location` is POINT(longitude, latitude) in SRID 0 so MBRContains over a longitude/latitude box can use the
+-- index, the exact distance is computed with ST_Distance_Sphere. Properties without coordinates are stored at
+-- POINT(0 0) and excluded by the `latitude IS NOT NULL` predicate.
+--
+-- When this index exists (and GEO_BACKEND is `auto` or `mysql`) PropertiesRepository resolves proximity searches
+-- in MySQL. Without it the adapter falls back to an in-process grid index loaded from the coordinates columns.
+
+ALTER TABLE property
+    ADD COLUMN location POINT SRID 0
+        GENERATED ALWAYS AS (POINT(IFNULL(longitude, 0), IFNULL(latitude, 0))) STORED NOT NULL;
+
+CREATE SPATIAL INDEX sp_property_location ON property (location);
@@ -0,0 +1,8 @@
+-- Server assigned insertion time of status_history rows for the /properties/changes feed and the stats rollup.
+--
+-- Both page over the status_history AUTO_INCREMENT id (PRIMARY) instead of update_date, which bulk imports can set
+-- to any past date, so no extra index is needed. recorded_at is always set by the server and only decides whether a
+-- row is old enough to be read: a page stops at the first row recorded less than the settle time ago
+-- (CHANGES_SETTLE_SECONDS, STATS_SETTLE_SECONDS), so the lower ids of transactions still in flight are not skipped.
+
+ALTER TABLE status_history ADD COLUMN recorded_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6);
@@ -0,0 +1,19 @@
+-- Replication heartbeat read by the ReplicaRouter lag check (DEFAULT_LAG_QUERY).
+--
+-- An event on the primary updates beat_at every second and the update reaches the replicas through replication, so
+-- a replica lag is the age of the beat it sees. Unlike the applier status, this also reports lag for replicas that
+-- are idle, stopped or disconnected: their beat just keeps getting older. Requires event_scheduler=ON on the
+-- primary (the MySQL 8 default), without beats every replica is considered lagging and reads go to the primary.
+
+CREATE TABLE IF NOT EXISTS replication_heartbeat (
+    id TINYINT UNSIGNED NOT NULL,
+    beat_at TIMESTAMP(6) NOT NULL,
+    PRIMARY KEY (id)
+);
+
+INSERT IGNORE INTO replication_heartbeat (id, beat_at) VALUES (1, NOW(6));
+
+CREATE EVENT IF NOT EXISTS replication_heartbeat
+    ON SCHEDULE EVERY 1 SECOND
+    ON COMPLETION PRESERVE
+    DO UPDATE replication_heartbeat SET beat_at = NOW(6) WHERE id = 1;
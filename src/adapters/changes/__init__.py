@@ -0,0 +1,3 @@
+"""Export resources."""
+
+from .changes import find_changes
@@ -0,0 +1,28 @@
+"""Property changes feed adapter methods."""
+
+import os
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from src.adapters import database
+from src.models import Property
+from src.ports.repositories import PropertiesRepository
+
+# Seconds a status change waits before it is served, it has to be longer than the transactions that insert
+# status_history rows (import chunks included) so a page never goes past the id of an uncommitted row
+CHANGES_SETTLE_SECONDS = float(os.getenv('CHANGES_SETTLE_SECONDS', '5'))
+
+
+def find_changes(after_id: Optional[int], limit: int) -> Tuple[List[Tuple[int, int, datetime, Property]], bool]:
+    """Read a page of status changes after the cursor. Pages are read on the primary, a lagging replica may apply
+    a lower id after the settle window already let a consumer go past it.
+
+    :param after_id: Status history id cursor, None to start from the first change
+    :param limit: Page size
+    :return Tuple[List[Tuple[int, int, datetime, Property]], bool]: (changes, has_more)
+    """
+
+    with database.primary() as driver:
+        rows = PropertiesRepository(driver).find_status_changes(after_id, limit + 1, CHANGES_SETTLE_SECONDS)
+
+    return rows[:limit], len(rows) > limit
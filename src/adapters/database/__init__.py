@@ -0,0 +1,3 @@
+"""Export resources."""
+
+from .database import ROUTER, ReplicaRouter, primary, read
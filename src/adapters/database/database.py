@@ -0,0 +1,263 @@
+"""Database connections routing.
+
+Writes go to the primary (DATABASE_URL). Read only queries executed with `read()` are routed to the replicas in
+DATABASE_REPLICA_URLS (comma separated) balanced by least outstanding requests or round robin
+(DATABASE_REPLICA_BALANCING). Replicas lagging more than DATABASE_REPLICA_MAX_LAG seconds are skipped until the
+next lag check and replicas that fail are skipped for DATABASE_REPLICA_RETRY_AFTER seconds, in both cases the
+query is executed on the primary. Without replicas every query goes to the primary.
+"""
+
+import itertools
+import os
+import threading
+import time
+from typing import Any, AnyStr, Callable, List, Optional, Tuple
+
+from mysql.connector import Error as MysqlError
+from pydbrepo.drivers.mysql import Mysql
+
+from src.commons import metrics, warmup
+from src.commons.logging import logger
+
+LEAST_OUTSTANDING = 'least_outstanding'
+ROUND_ROBIN = 'round_robin'
+
+# Age of the last primary heartbeat replicated (migrations/0008_replication_heartbeat.sql), it keeps growing when
+# replication is stopped or broken, NULL without heartbeat counts as lagging
+DEFAULT_LAG_QUERY = (
+    'SELECT TIMESTAMPDIFF(MICROSECOND, beat_at, NOW(6)) / 1000000 FROM replication_heartbeat WHERE id = 1'
+)
+
+
+class Replica:
+    """Replica endpoint state.
+
+    :param url: Connection url
+    """
+
+    def __init__(self, url: AnyStr):
+        self.url = url
+        self.outstanding = 0
+        self.lag = None
+        self.lag_checked_at = None
+        self.failed_at = None
+
+
+class ReplicaRouter:
+    """Route read only queries to replicas with failover to the primary.
+
+    :param primary_url: Primary connection url, None to use the driver defaults
+    :param replica_urls: Replica connection urls
+    :param balancing: least_outstanding or round_robin
+    :param max_lag: Max replication lag in seconds, 0 disables the lag check
+    :param lag_check_interval: Seconds between lag checks of a replica
+    :param retry_after: Seconds a failed replica is skipped
+    :param lag_query: Query that returns the replication lag in seconds
+    :param connect: Driver factory, it receives the connection url
+    """
+
+    # pylint: disable=too-many-arguments
+
+    def __init__(
+        self,
+        primary_url: Optional[AnyStr],
+        replica_urls: List[AnyStr],
+        balancing: AnyStr = LEAST_OUTSTANDING,
+        max_lag: float = 5.0,
+        lag_check_interval: float = 10.0,
+        retry_after: float = 30.0,
+        lag_query: AnyStr = DEFAULT_LAG_QUERY,
+        connect: Callable[..., Any] = Mysql,
+    ):
+        self.primary_url = primary_url
+        self.replicas = [Replica(url) for url in replica_urls]
+        self.balancing = balancing
+        self.max_lag = max_lag
+        self.lag_check_interval = lag_check_interval
+        self.retry_after = retry_after
+        self.lag_query = lag_query
+
+        self._connect = connect
+        self._next = itertools.count()
+        self._lock = threading.Lock()
+
+    def primary(self, **kwargs: Any) -> Any:
+        """Open a primary connection.
+
+        :param kwargs: Extra driver parameters
+        :return Any: Database driver
+        """
+
+        return self._open(url=self.primary_url, **kwargs)
+
+    def read(self, function: Callable[[Any], Any]) -> Any:
+        """Execute a read only function on a replica, on the primary if there's no healthy replica or it fails.
+
+        :param function: Function that receives a database driver
+        :return Any: Function result
+        """
+
+        replica = self._acquire()
+
+        if replica is None:
+            return self._read_primary(function)
+
+        try:
+            fallback, result = self._read_replica(replica, function)
+        except MysqlError as err:
+            replica.failed_at = time.monotonic()
+            metrics.incr('database.replica.failovers')
+            logger.field('replica', _host(replica.url)).err(err).warning('replica query failed, using primary')
+            fallback, result = True, None
+        finally:
+            with self._lock:
+                replica.outstanding -= 1
+
+        if fallback:
+            return self._read_primary(function)
+
+        metrics.incr('database.replica.reads')
+
+        return result
+
+    def _read_replica(self, replica: Replica, function: Callable[[Any], Any]) -> Tuple[bool, Any]:
+        """Execute a read only function on a replica unless it is lagging.
+
+        :param replica: Replica state
+        :param function: Function that receives a database driver
+        :return Tuple[bool, Any]: (lagging, result)
+        """
+
+        with self._open(url=replica.url) as driver:
+            if self._is_lagging(replica, driver):
+                return True, None
+
+            return False, function(driver)
+
+    def _open(self, url: Optional[AnyStr], **kwargs: Any) -> Any:
+        """Open a connection recording how long it took on the `database.connect_seconds` gauge, the load shedder
+        uses it to detect a saturated database.
+
+        :param url: Connection url
+        :param kwargs: Extra driver parameters
+        :return Any: Database driver
+        """
+
+        start = time.perf_counter()
+
+        try:
+            return self._connect(url=url, **kwargs)
+        finally:
+            metrics.observe('database.connect_seconds', time.perf_counter() - start)
+
+    def _read_primary(self, function: Callable[[Any], Any]) -> Any:
+        metrics.incr('database.primary.reads')
+
+        with self.primary() as driver:
+            return function(driver)
+
+    def _acquire(self) -> Optional[Replica]:
+        """Pick a healthy replica and count the request as outstanding.
+
+        :return Optional[Replica]: Selected replica, None if there's no healthy replica
+        """
+
+        now = time.monotonic()
+
+        with self._lock:
+            healthy = [replica for replica in self.replicas if self._is_healthy(replica, now)]
+
+            if not healthy:
+                return None
+
+            offset = next(self._next) % len(healthy)
+            healthy = healthy[offset:] + healthy[:offset]
+
+            if self.balancing == LEAST_OUTSTANDING:
+                replica = min(healthy, key=lambda item: item.outstanding)
+            else:
+                replica = healthy[0]
+
+            replica.outstanding += 1
+
+        return replica
+
+    def _is_healthy(self, replica: Replica, now: float) -> bool:
+        if replica.failed_at is not None and now - replica.failed_at < self.retry_after:
+            return False
+
+        if replica.lag is None or not self.max_lag:
+            return True
+
+        return replica.lag <= self.max_lag or now - replica.lag_checked_at >= self.lag_check_interval
+
+    def _is_lagging(self, replica: Replica, driver: Any) -> bool:
+        """Refresh the replica lag when the last check is stale.
+
+        :param replica: Replica state
+        :param driver: Replica connection
+        :return bool: True if the replica lag is over the limit
+        """
+
+        if not self.max_lag:
+            return False
+
+        now = time.monotonic()
+
+        if replica.lag_checked_at is None or now - replica.lag_checked_at >= self.lag_check_interval:
+            row = driver.query_one(sql=self.lag_query)
+            replica.lag = float(row[0]) if row and row[0] is not None else float('inf')
+            replica.lag_checked_at = now
+
+        if replica.lag <= self.max_lag:
+            return False
+
+        metrics.incr('database.replica.lagging')
+        logger.fields({'replica': _host(replica.url), 'lag': replica.lag}).warning('replica lag over the limit')
+
+        return True
+
+
+def _host(url: AnyStr) -> AnyStr:
+    """Strip credentials from a connection url for logging."""
+
+    return url.rsplit('@', 1)[-1]
+
+
+ROUTER = ReplicaRouter(
+    primary_url=os.getenv('DATABASE_URL', None),
+    replica_urls=[url.strip() for url in os.getenv('DATABASE_REPLICA_URLS', '').split(',') if url.strip()],
+    balancing=os.getenv('DATABASE_REPLICA_BALANCING', LEAST_OUTSTANDING).lower(),
+    max_lag=float(os.getenv('DATABASE_REPLICA_MAX_LAG', '5')),
+    lag_check_interval=float(os.getenv('DATABASE_REPLICA_LAG_CHECK_INTERVAL', '10')),
+    retry_after=float(os.getenv('DATABASE_REPLICA_RETRY_AFTER', '30')),
+    lag_query=os.getenv('DATABASE_REPLICA_LAG_QUERY', DEFAULT_LAG_QUERY),
+)
+
+
+def primary(**kwargs: Any) -> Any:
+    """Open a primary connection with the default router.
+
+    :param kwargs: Extra driver parameters
+    :return Any: Database driver
+    """
+
+    return ROUTER.primary(**kwargs)
+
+
+@warmup.register
+def warm_up():
+    """Open a primary connection ahead of the first request."""
+
+    with primary():
+        pass
+
+
+def read(function: Callable[[Any], Any]) -> Any:
+    """Execute a read only function with the default router.
+
+    :param function: Function that receives a database driver
+    :return Any: Function result
+    """
+
+    return ROUTER.read(function)
@@ -0,0 +1,3 @@
+"""Export resources."""
+
+from .likes import like_property, unlike_property
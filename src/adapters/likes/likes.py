@@ -0,0 +1,92 @@
+"""Likes adapter methods."""
+
+import os
+from datetime import datetime
+from typing import Any, AnyStr, Dict
+
+from src.adapters import database
+from src.commons.cache import CounterCache
+from src.models import LikedHistory
+from src.ports.repositories import LikesRepository
+
+COUNTERS_TTL = float(os.getenv('LIKES_COUNTERS_TTL', '60'))
+
+PROPERTY_LIKES = CounterCache(ttl=COUNTERS_TTL)
+USER_LIKES = CounterCache(ttl=COUNTERS_TTL)
+
+
+def like_property(user_id: int, property_id: int) -> Dict[AnyStr, Any]:
+    """Like a property on behalf of a user.
+
+    :param user_id: User id
+    :param property_id: Property id
+    :return Dict[AnyStr, Any]: Like status and counters
+    """
+
+    return _toggle(user_id, property_id, liked=True)
+
+
+def unlike_property(user_id: int, property_id: int) -> Dict[AnyStr, Any]:
+    """Remove a property like of a user.
+
+    :param user_id: User id
+    :param property_id: Property id
+    :return Dict[AnyStr, Any]: Like status and counters
+    """
+
+    return _toggle(user_id, property_id, liked=False)
+
+
+def _toggle(user_id: int, property_id: int, liked: bool) -> Dict[AnyStr, Any]:
+    """Store the current like status with its history movement in a single transaction and update the counters.
+
+    Only actual changes are recorded in history and counters, repeated likes or unlikes are no-ops.
+
+    :param user_id: User id
+    :param property_id: Property id
+    :param liked: New like status
+    :return Dict[AnyStr, Any]: Like status and counters
+    """
+
+    with database.primary() as driver:
+        repo = LikesRepository(driver)
+        changed = repo.like(user_id, property_id) if liked else repo.unlike(user_id, property_id)
+
+        if changed:
+            repo.insert_history([_history_record(user_id, property_id, liked)])
+
+        driver.commit()
+
+        if changed:
+            delta = 1 if liked else -1
+            PROPERTY_LIKES.incr(property_id, delta)
+            USER_LIKES.incr(user_id, delta)
+
+        property_likes = PROPERTY_LIKES.get(property_id, lambda: repo.count_by_property(property_id))
+        user_likes = USER_LIKES.get(user_id, lambda: repo.count_by_user(user_id))
+
+    return {
+        'property_id': property_id,
+        'liked': liked,
+        'likes': property_likes,
+        'user_likes': user_likes,
+    }
+
+
+def _history_record(user_id: int, property_id: int, liked: bool) -> LikedHistory:
+    """Build a like history movement.
+
+    :param user_id: User id
+    :param property_id: Property id
+    :param liked: New like status
+    :return LikedHistory: History record
+    """
+
+    return LikedHistory.from_dict(
+        {
+            'property_id': property_id,
+            'user_id': user_id,
+            'liked': liked,
+            'update_date': datetime.utcnow(),
+        }
+    )
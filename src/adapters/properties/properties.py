@@ -1,32 +1,298 @@
 """Properties adapter methods."""
 
-from typing import AnyStr, List, Optional
+# pylint: disable=global-statement
 
-from pydbrepo.drivers.mysql import Mysql
+import copy
+import os
+import threading
+import time
+from typing import List, Optional, Union
 
-from src.models import Property
-from src.models.types import PropertyStatus
-from src.ports.repositories import PropertiesRepository
+from src.adapters import database
+from src.commons import warmup
+from src.commons.errors import ServiceUnavailableError
+from src.commons.geo import GridIndex, build_grid
+from src.commons.logging import logger
+from src.commons.search import InvertedIndex
+from src.commons.singleflight import SingleFlight
+from src.commons.snapshot import CatalogSnapshot
+from src.models import Property, PropertyFilters
+from src.ports.repositories import PropertiesRepository, SnapshotPropertiesRepository
 
+# auto: MySQL FULLTEXT when the index exists, local index otherwise | mysql | local
+SEARCH_BACKEND = os.getenv('SEARCH_BACKEND', 'auto').lower()
+SEARCH_INDEX_PATH = os.getenv('SEARCH_INDEX_PATH', 'data/properties.idx')
+# Best ranked properties kept by a local text search, the rest is never sent to the id list query
+SEARCH_MAX_RESULTS = int(os.getenv('SEARCH_MAX_RESULTS', '1000'))
 
-def filter_properties(
-    status: Optional[List[PropertyStatus]] = None,
-    city: Optional[AnyStr] = None,
-    year: Optional[int] = None
-) -> Optional[List[Property]]:
+# auto: MySQL SPATIAL index when it exists, in-process grid index otherwise | mysql | local
+GEO_BACKEND = os.getenv('GEO_BACKEND', 'auto').lower()
+# Seconds before the in-process grid index is reloaded from the database in background and its cell size in degrees
+GEO_INDEX_TTL = float(os.getenv('GEO_INDEX_TTL', '300'))
+GEO_CELL_SIZE = float(os.getenv('GEO_CELL_SIZE', '0.02'))
+
+# Catalog snapshot built with `make snapshot`, searches are answered from it instead of MySQL when it is set
+PROPERTIES_SNAPSHOT_PATH = os.getenv('PROPERTIES_SNAPSHOT_PATH', '')
+
+# Max seconds a request waits for an identical in flight query before running its own
+SINGLE_FLIGHT_TIMEOUT = float(os.getenv('SINGLE_FLIGHT_TIMEOUT', '5'))
+
+FILTER_FLIGHT = SingleFlight('properties', timeout=SINGLE_FLIGHT_TIMEOUT)
+GEO_INDEX_FLIGHT = SingleFlight('geo_index', timeout=SINGLE_FLIGHT_TIMEOUT)
+
+_SEARCH_INDEX = None
+_FULLTEXT_AVAILABLE = None
+_GEO_INDEX = None
+_GEO_INDEX_LOADED_AT = 0.0
+_SPATIAL_AVAILABLE = None
+_SNAPSHOT_REPOSITORY = None
+_GEO_INDEX_REFRESH = threading.Lock()
+
+
+def filter_properties(filters: Optional[PropertyFilters] = None) -> Optional[List[Property]]:
     """Filter properties from user entries.
 
-    :param status: Current property status
-    :param year: Property year build
-    :param city: Property city location
+    :param filters: Property search filters
     :return Optional[List[Property]]: List of found properties
     """
 
-    with Mysql() as driver:
-        repo = PropertiesRepository(driver)
-        properties = repo.find_by_filters(status, year, city)
+    properties = FILTER_FLIGHT.do(repr(filters), lambda: _find_properties(filters))
 
     if not properties:
         return []
 
-    return properties
+    # Coalesced requests share the result, every caller gets its own list
+    return list(properties)
+
+
+def _find_properties(filters: Optional[PropertyFilters]) -> Optional[List[Property]]:
+    """Query the properties that match the filters on the catalog snapshot when it is configured, on a read
+    replica otherwise.
+
+    :param filters: Property search filters
+    :return Optional[List[Property]]: List of found properties
+    """
+
+    if PROPERTIES_SNAPSHOT_PATH:
+        return _search(_get_snapshot_repository(), filters, local=True)
+
+    return database.read(lambda driver: _search(PropertiesRepository(driver), filters))
+
+
+def _search(
+    repo: Union[PropertiesRepository, SnapshotPropertiesRepository],
+    filters: Optional[PropertyFilters],
+    local: bool = False,
+) -> Optional[List[Property]]:
+    """Resolve text and proximity searches with the local indexes when the repository can't and run the search.
+
+    :param repo: Properties repository
+    :param filters: Property search filters
+    :param local: Always use the local indexes
+    :return Optional[List[Property]]: List of found properties
+    """
+
+    if filters is not None and filters.q and (local or not _use_fulltext(repo)):
+        filters = _apply_local_search(filters)
+
+    if filters is not None and filters.radius is not None and (local or not _use_spatial(repo)):
+        filters = _apply_local_proximity(repo, filters)
+
+    return repo.find_by_filters(filters)
+
+
+@warmup.register
+def warm_up():
+    """Connect to the database, build a search query and load the search backend ahead of the first request."""
+
+    if PROPERTIES_SNAPSHOT_PATH:
+        _get_geo_index(_get_snapshot_repository())
+        _get_search_index()
+        return
+
+    def prime(driver):
+        repo = PropertiesRepository(driver)
+        repo.build_filters_query(PropertyFilters(cities=['warmup'], year_min=0, price_max=0), [0])
+
+        if SEARCH_BACKEND != 'mysql' and not _use_fulltext(repo):
+            _get_search_index()
+
+        if GEO_BACKEND != 'mysql' and not _use_spatial(repo):
+            _get_geo_index(repo)
+
+    database.read(prime)
+
+
+def _use_fulltext(repo: PropertiesRepository) -> bool:
+    """Decide if text search should be resolved by MySQL FULLTEXT. Index detection is made once per container.
+
+    :param repo: Properties repository
+    :return bool: True for MySQL FULLTEXT search
+    """
+
+    global _FULLTEXT_AVAILABLE
+
+    if SEARCH_BACKEND != 'auto':
+        return SEARCH_BACKEND == 'mysql'
+
+    if _FULLTEXT_AVAILABLE is None:
+        _FULLTEXT_AVAILABLE = repo.has_fulltext_index()
+        logger.field('fulltext', _FULLTEXT_AVAILABLE).debug('search backend detected')
+
+    return _FULLTEXT_AVAILABLE
+
+
+def _use_spatial(repo: PropertiesRepository) -> bool:
+    """Decide if proximity searches should be resolved by the MySQL SPATIAL index. Index detection is made once per
+    container.
+
+    :param repo: Properties repository
+    :return bool: True for MySQL proximity search
+    """
+
+    global _SPATIAL_AVAILABLE
+
+    if GEO_BACKEND != 'auto':
+        return GEO_BACKEND == 'mysql'
+
+    if _SPATIAL_AVAILABLE is None:
+        _SPATIAL_AVAILABLE = repo.has_spatial_index()
+        logger.field('spatial', _SPATIAL_AVAILABLE).debug('geo backend detected')
+
+    return _SPATIAL_AVAILABLE
+
+
+def _apply_local_proximity(repo: PropertiesRepository, filters: PropertyFilters) -> PropertyFilters:
+    """Resolve the proximity search with the grid index and restrict the filters to the ids within the radius,
+    ordered by distance or by the previous ranking when the ids were already restricted.
+
+    :param repo: Properties repository
+    :param filters: Property search filters
+    :return PropertyFilters: Filters restricted to the nearby ids
+    """
+
+    nearby = [item_id for item_id, _ in _get_geo_index(repo).within(filters.lat, filters.lon, filters.radius)]
+
+    filters = copy.copy(filters)
+
+    if filters.ids is not None:
+        allowed = set(nearby)
+        filters.ids = [item_id for item_id in filters.ids if item_id in allowed]
+    else:
+        filters.ids = nearby
+
+    filters.lat = filters.lon = filters.radius = None
+
+    return filters
+
+
+def _get_geo_index(repo: Union[PropertiesRepository, SnapshotPropertiesRepository]) -> GridIndex:
+    """Return the in-process grid index. It is loaded on warm-up, or by the first request sharing the load with the
+    concurrent ones. Every GEO_INDEX_TTL seconds it is reloaded from the database in background while requests keep
+    using the loaded one, the snapshot one never changes.
+
+    :param repo: Properties repository
+    :return GridIndex: Property locations index
+    """
+
+    if _GEO_INDEX is None:
+        return GEO_INDEX_FLIGHT.do('load', lambda: _load_geo_index(repo))
+
+    if not isinstance(repo, SnapshotPropertiesRepository) and time.monotonic() - _GEO_INDEX_LOADED_AT >= GEO_INDEX_TTL:
+        _refresh_geo_index()
+
+    return _GEO_INDEX
+
+
+def _load_geo_index(repo: Union[PropertiesRepository, SnapshotPropertiesRepository]) -> GridIndex:
+    """Build the grid index from every property location.
+
+    :param repo: Properties repository
+    :return GridIndex: Property locations index
+    """
+
+    global _GEO_INDEX, _GEO_INDEX_LOADED_AT
+
+    start = time.monotonic()
+    index = build_grid(repo.iter_locations(), GEO_CELL_SIZE)
+    _GEO_INDEX, _GEO_INDEX_LOADED_AT = index, time.monotonic()
+
+    logger.fields({
+        'locations': len(index),
+        'seconds': round(_GEO_INDEX_LOADED_AT - start, 3),
+    }).debug('geo index loaded')
+
+    return index
+
+
+def _refresh_geo_index():
+    """Reload the grid index on a background thread with its own database connection, one reload at a time."""
+
+    if not _GEO_INDEX_REFRESH.acquire(blocking=False):
+        return
+
+    def run():
+        try:
+            database.read(lambda driver: _load_geo_index(PropertiesRepository(driver)))
+        except Exception as err:
+            # The loaded index keeps being served, next requests retry the reload
+            logger.err(err).warning('geo index refresh failed')
+        finally:
+            _GEO_INDEX_REFRESH.release()
+
+    threading.Thread(target=run, name='geo-index-refresh', daemon=True).start()
+
+
+def _get_snapshot_repository() -> SnapshotPropertiesRepository:
+    """Return the repository over the memory-mapped catalog snapshot, it is loaded once per container.
+
+    :return SnapshotPropertiesRepository: Snapshot repository
+    :raise ServiceUnavailableError: If the snapshot file can't be loaded
+    """
+
+    global _SNAPSHOT_REPOSITORY
+
+    if _SNAPSHOT_REPOSITORY is None:
+        try:
+            _SNAPSHOT_REPOSITORY = SnapshotPropertiesRepository(CatalogSnapshot(PROPERTIES_SNAPSHOT_PATH))
+        except (OSError, ValueError) as err:
+            logger.field('path', PROPERTIES_SNAPSHOT_PATH).err(err).error('catalog snapshot not available')
+            raise ServiceUnavailableError(root_causes=[{'message': 'Catalog snapshot is not available'}]) from err
+
+    return _SNAPSHOT_REPOSITORY
+
+
+def _apply_local_search(filters: PropertyFilters) -> PropertyFilters:
+    """Resolve the text search with the local index and restrict the filters to the SEARCH_MAX_RESULTS best
+    ranked ids.
+
+    :param filters: Property search filters
+    :return PropertyFilters: Filters restricted to the matched ids
+    """
+
+    ranked = _get_search_index().search(filters.q, limit=SEARCH_MAX_RESULTS)
+
+    filters = copy.copy(filters)
+    filters.ids = [doc_id for doc_id, _ in ranked]
+    filters.q = None
+
+    return filters
+
+
+def _get_search_index() -> InvertedIndex:
+    """Return the memory-mapped local search index, it is loaded once per container.
+
+    :return InvertedIndex: Local search index
+    :raise ServiceUnavailableError: If the index file can't be loaded
+    """
+
+    global _SEARCH_INDEX
+
+    if _SEARCH_INDEX is None:
+        try:
+            _SEARCH_INDEX = InvertedIndex(SEARCH_INDEX_PATH)
+        except (OSError, ValueError) as err:
+            logger.field('path', SEARCH_INDEX_PATH).err(err).error('search index not available')
+            raise ServiceUnavailableError(root_causes=[{'message': 'Search index is not available'}]) from err
+
+    return _SEARCH_INDEX
@@ -0,0 +1,3 @@
+"""Export resources."""
+
+from .stats import REFRESH_MAX_BATCHES, find_stats, refresh_stats
@@ -0,0 +1,173 @@
+"""Property stats adapter methods."""
+
+import os
+from datetime import datetime, timezone
+from typing import Any, AnyStr, Callable, Dict, List
+
+from src.adapters import database
+from src.commons.cache import TTLCache
+from src.commons.logging import logger
+from src.helpers.stats import compute_moves, compute_rollup
+from src.models import PropertyFilters
+from src.ports.repositories import StatsRepository
+
+AGGREGATE_NAME = 'property_stats'
+ROLLUP_BATCH_SIZE = int(os.getenv('STATS_ROLLUP_BATCH_SIZE', '5000'))
+REFRESH_MAX_BATCHES = int(os.getenv('STATS_REFRESH_MAX_BATCHES', '100'))
+# Seconds a status change waits before it is rolled up, it has to be longer than the transactions that insert
+# status_history rows so the high-water mark never goes past the id of an uncommitted row
+ROLLUP_SETTLE_SECONDS = float(os.getenv('STATS_SETTLE_SECONDS', '5'))
+
+STATS_CACHE = TTLCache(ttl=float(os.getenv('STATS_CACHE_TTL', '30')))
+
+
+def find_stats(group_by: List[AnyStr], filters: PropertyFilters) -> Dict[AnyStr, Any]:
+    """Return property counts grouped by the given dimensions, served from cache while it is fresh. The aggregates
+    are only written by the scheduled refresh, reads are routed to the replicas.
+
+    :param group_by: Dimensions (city, year, status)
+    :param filters: Filters over the dimensions
+    :return Dict[AnyStr, Any]: Stats rows, high-water mark and generation time
+    """
+
+    key = (tuple(group_by), repr(filters))
+    cached = STATS_CACHE.get(key)
+
+    if cached is not None:
+        return cached
+
+    def query(driver) -> Dict[AnyStr, Any]:
+        repo = StatsRepository(driver)
+
+        return {
+            'stats': repo.find_stats(group_by, filters),
+            'watermark': repo.get_watermark(AGGREGATE_NAME),
+            'generated_at': datetime.now(timezone.utc).isoformat(),
+        }
+
+    result = database.read(query)
+
+    STATS_CACHE.set(key, result)
+
+    return result
+
+
+def refresh_stats(max_batches: int) -> int:
+    """Roll up status history rows newer than the high-water mark into the aggregates.
+
+    Each batch is applied in its own transaction holding the watermark row lock, concurrent refreshes skip the
+    work instead of waiting for it.
+
+    :param max_batches: Max number of batches to roll up
+    :return int: Number of rolled up status history rows
+    """
+
+    total = _run_batches(_rollup_batch, max_batches)
+
+    if total:
+        logger.field('rows', total).info('property stats rolled up')
+
+    return total
+
+
+def move_stats(max_batches: int) -> int:
+    """Move the properties whose city or year changed without a status change to their new aggregate buckets.
+
+    Batches are applied like the roll up ones, holding the watermark row lock.
+
+    :param max_batches: Max number of batches to apply
+    :return int: Number of moved properties
+    """
+
+    total = _run_batches(_move_batch, max_batches)
+
+    if total:
+        logger.field('properties', total).info('property stats moved')
+
+    return total
+
+
+def _run_batches(batch: Callable[[StatsRepository], int], max_batches: int) -> int:
+    """Apply batches on the primary until one is not full.
+
+    :param batch: Batch function, it returns the number of applied rows
+    :param max_batches: Max number of batches
+    :return int: Total applied rows
+    """
+
+    total = 0
+
+    with database.primary(autocommit=False) as driver:
+        repo = StatsRepository(driver)
+
+        for _ in range(max_batches):
+            rows = batch(repo)
+            total += rows
+
+            if rows < ROLLUP_BATCH_SIZE:
+                break
+
+    return total
+
+
+def _rollup_batch(repo: StatsRepository) -> int:
+    """Roll up a single batch of status changes.
+
+    :param repo: Stats repository with a non autocommit driver
+    :return int: Number of rolled up rows
+    """
+
+    try:
+        watermark = repo.lock_watermark(AGGREGATE_NAME)
+
+        if watermark is None:
+            repo.driver.rollback()
+            return 0
+
+        changes = repo.find_status_changes(watermark, ROLLUP_BATCH_SIZE, ROLLUP_SETTLE_SECONDS)
+
+        if not changes:
+            repo.driver.rollback()
+            return 0
+
+        property_ids = list({change[1] for change in changes})
+        deltas, current = compute_rollup(
+            changes,
+            repo.find_current_statuses(property_ids),
+            repo.find_dimensions(property_ids),
+        )
+
+        repo.apply_rollup(AGGREGATE_NAME, changes[-1][0], deltas, current)
+        repo.driver.commit()
+    except Exception:
+        repo.driver.rollback()
+        raise
+
+    return len(changes)
+
+
+def _move_batch(repo: StatsRepository) -> int:
+    """Move a single batch of properties whose city or year changed.
+
+    :param repo: Stats repository with a non autocommit driver
+    :return int: Number of moved properties
+    """
+
+    try:
+        if repo.lock_watermark(AGGREGATE_NAME) is None:
+            repo.driver.rollback()
+            return 0
+
+        moved = repo.find_moved_properties(ROLLUP_BATCH_SIZE)
+
+        if not moved:
+            repo.driver.rollback()
+            return 0
+
+        repo.apply_moves(*compute_moves(moved))
+        repo.driver.commit()
+    except Exception:
+        repo.driver.rollback()
+        raise
+
+    return len(moved)
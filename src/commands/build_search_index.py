@@ -0,0 +1,47 @@
+"""Build the local full text search index from the property table.
+
+Usage: python -m src.commands.build_search_index [--output data/properties.idx]
+"""
+
+import argparse
+import os
+import time
+from typing import List, Optional
+
+from pydbrepo.drivers.mysql import Mysql
+
+from src.adapters.properties.properties import SEARCH_INDEX_PATH
+from src.commons.logging import config_logs, logger
+from src.commons.search import build_index
+from src.ports.repositories import PropertiesRepository
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command entry point.
+
+    :param argv: Command line arguments
+    """
+
+    parser = argparse.ArgumentParser(description='Build the local property search index')
+    parser.add_argument('--output', default=SEARCH_INDEX_PATH, help='Index file path')
+    parser.add_argument('--batch-size', type=int, default=5000, help='Records fetched per query')
+    args = parser.parse_args(argv)
+
+    config_logs()
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+
+    start = time.perf_counter()
+
+    with Mysql() as driver:
+        repo = PropertiesRepository(driver)
+        total = build_index(repo.iter_search_documents(args.batch_size), args.output)
+
+    logger.fields({
+        'path': args.output,
+        'documents': total,
+        'seconds': round(time.perf_counter() - start, 3),
+    }).info('search index built')
+
+
+if __name__ == '__main__':
+    main()
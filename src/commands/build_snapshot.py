@@ -0,0 +1,50 @@
+"""Build the catalog snapshot served by read only deployments (PROPERTIES_SNAPSHOT_PATH).
+
+Usage: python -m src.commands.build_snapshot [--output data/catalog.snap]
+"""
+
+import argparse
+import os
+import time
+from typing import List, Optional
+
+from pydbrepo.drivers.mysql import Mysql
+
+from src.adapters.properties.properties import PROPERTIES_SNAPSHOT_PATH
+from src.commons.logging import config_logs, logger
+from src.commons.snapshot import build_snapshot
+from src.ports.repositories import PropertiesRepository
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command entry point.
+
+    :param argv: Command line arguments
+    """
+
+    parser = argparse.ArgumentParser(description='Build the catalog snapshot')
+    parser.add_argument('--output', default=PROPERTIES_SNAPSHOT_PATH or 'data/catalog.snap', help='Snapshot path')
+    parser.add_argument('--batch-size', type=int, default=5000, help='Records fetched per query')
+    args = parser.parse_args(argv)
+
+    config_logs()
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+
+    start = time.perf_counter()
+
+    with Mysql() as driver:
+        repo = PropertiesRepository(driver)
+        total = build_snapshot(repo.iter_catalog(args.batch_size), args.output)
+
+    logger.fields(
+        {
+            'path': args.output,
+            'properties': total,
+            'bytes': os.path.getsize(args.output),
+            'seconds': round(time.perf_counter() - start, 3),
+        }
+    ).info('catalog snapshot built')
+
+
+if __name__ == '__main__':
+    main()
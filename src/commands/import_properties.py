@@ -0,0 +1,378 @@
+"""Bulk import of properties from CSV or JSON Lines files.
+
+Records are streamed from the input file, validated against PROPERTY_IMPORT_SCHEMA and written to `property` and
+`status_history` in chunks, each chunk is a multi-row upsert committed in its own transaction. After every commit
+a checkpoint with the last imported line is stored so an interrupted import resumes where it stopped. A crash
+between a commit and its checkpoint writes that chunk again on resume, which is harmless: properties are upserted
+and status changes already stored are skipped. Records that fail validation or can't be written are appended to
+the rejected rows file with their error.
+
+Usage: python -m src.commands.import_properties properties.csv [--chunk-size 1000] [--no-resume]
+"""
+
+import argparse
+import csv
+import json
+import os
+import time
+from typing import Any, AnyStr, Callable, Dict, Iterator, List, Optional, Tuple
+
+from pydbrepo.drivers.mysql import Mysql
+
+from src.commons.errors import SchemaError
+from src.commons.logging import config_logs, logger
+from src.commons.utils import validate_json_schema
+from src.ports.repositories import PropertiesRepository
+from src.schemas import PROPERTY_IMPORT_SCHEMA
+
+INTEGER_FIELDS = {
+    name
+    for name, definition in PROPERTY_IMPORT_SCHEMA['properties'].items() if 'integer' in definition['type']
+}
+NUMBER_FIELDS = {
+    name
+    for name, definition in PROPERTY_IMPORT_SCHEMA['properties'].items() if 'number' in definition['type']
+}
+
+PROGRESS_INTERVAL = 5.0
+
+
+class PropertiesImporter:
+    """Chunked and resumable properties import.
+
+    :param path: Input file path
+    :param file_format: csv or jsonl
+    :param chunk_size: Number of records written per transaction
+    :param checkpoint_path: Checkpoint file path
+    :param rejected_path: Rejected rows file path
+    :param resume: Continue from the stored checkpoint
+    :param connect: Driver factory, it receives the driver parameters
+    """
+
+    # pylint: disable=too-many-instance-attributes,too-many-arguments
+
+    def __init__(
+        self,
+        path: AnyStr,
+        file_format: AnyStr,
+        chunk_size: int,
+        checkpoint_path: AnyStr,
+        rejected_path: AnyStr,
+        resume: bool = True,
+        connect: Callable[..., Any] = Mysql,
+    ):
+        self.path = path
+        self.file_format = file_format
+        self.chunk_size = chunk_size
+        self.checkpoint_path = checkpoint_path
+        self.rejected_path = rejected_path
+        self.resume = resume
+        self.connect = connect
+
+        self.imported = 0
+        self.rejected = 0
+
+        self._driver = None
+        self._repo = None
+        self._rejected_file = None
+        self._started_at = None
+        self._reported_at = None
+
+    def run(self) -> Dict[AnyStr, Any]:
+        """Execute the import.
+
+        :return Dict[AnyStr, Any]: Import summary
+        """
+
+        checkpoint = self._load_checkpoint()
+        self.imported = checkpoint['imported']
+        self.rejected = checkpoint['rejected']
+        self._started_at = self._reported_at = time.perf_counter()
+
+        with self.connect(autocommit=False) as driver, self._open_rejected(checkpoint['rejected_offset']) as rejected:
+            self._driver = driver
+            self._repo = PropertiesRepository(driver)
+            self._rejected_file = rejected
+
+            last_line = self._import(checkpoint['line'])
+
+        summary = self._summary(last_line, self._started_at)
+        logger.fields(summary).info('properties import finished')
+
+        return summary
+
+    def _import(self, start_line: int) -> int:
+        """Stream, validate and write the input records after the given line.
+
+        :param start_line: Last imported line of a previous run
+        :return int: Last processed line
+        """
+
+        chunk = []
+        last_line = start_line
+
+        for line, record, error in self._read():
+            if line <= start_line:
+                continue
+
+            last_line = line
+
+            if error is None:
+                record, error = self._validate(record)
+
+            if error is not None:
+                self._reject(line, record, error)
+                continue
+
+            chunk.append((line, record))
+
+            if len(chunk) >= self.chunk_size:
+                self._write_chunk(chunk, last_line)
+                chunk = []
+
+        self._write_chunk(chunk, last_line)
+
+        return last_line
+
+    def _write_chunk(self, chunk: List[Tuple[int, Dict[AnyStr, Any]]], last_line: int):
+        """Write a chunk of records and store the checkpoint.
+
+        :param chunk: List of (line, record) tuples
+        :param last_line: Last processed input line
+        """
+
+        self._write_records(chunk)
+        self._rejected_file.flush()
+        self._save_checkpoint(last_line)
+        self._report_progress(last_line)
+
+    def _write_records(self, chunk: List[Tuple[int, Dict[AnyStr, Any]]]):
+        """Upsert records in one transaction. When the transaction fails the chunk is split in halves to isolate the
+        failing records, which end up in the rejected rows file.
+
+        :param chunk: List of (line, record) tuples
+        """
+
+        if not chunk:
+            return
+
+        records = [record for _, record in chunk]
+
+        try:
+            self._repo.upsert_many(records)
+            self._repo.insert_status_history(
+                [
+                    {
+                        'property_id': record['id'],
+                        'status_id': record['status_id'],
+                        'update_date': record.get('update_date', None),
+                    } for record in records if record.get('status_id', None) is not None
+                ]
+            )
+            self._driver.commit()
+        except Exception as err:
+            self._driver.rollback()
+
+            if len(chunk) == 1:
+                self._reject(chunk[0][0], chunk[0][1], str(err))
+                return
+
+            middle = len(chunk) // 2
+            self._write_records(chunk[:middle])
+            self._write_records(chunk[middle:])
+            return
+
+        self.imported += len(records)
+
+    def _read(self) -> Iterator[Tuple[int, Any, Optional[AnyStr]]]:
+        """Stream input records.
+
+        :return Iterator[Tuple[int, Any, Optional[AnyStr]]]: (line, record, parse_error) tuples
+        """
+
+        with open(self.path, newline='', encoding='utf-8') as file:
+            if self.file_format == 'csv':
+                reader = csv.DictReader(file)
+
+                for record in reader:
+                    yield reader.line_num, _coerce_csv_record(record), None
+
+                return
+
+            for line, raw in enumerate(file, 1):
+                if not raw.strip():
+                    continue
+
+                try:
+                    yield line, json.loads(raw), None
+                except ValueError as err:
+                    yield line, raw.rstrip('\n'), f'invalid json: {err}'
+
+    @staticmethod
+    def _validate(record: Any) -> Tuple[Any, Optional[AnyStr]]:
+        """Validate a record against the import schema.
+
+        :param record: Parsed record
+        :return Tuple[Any, Optional[AnyStr]]: (record, validation_error)
+        """
+
+        try:
+            record = validate_json_schema(record, PROPERTY_IMPORT_SCHEMA)
+        except SchemaError as err:
+            return record, err.root_causes[0]['error']
+
+        return record, None
+
+    def _reject(self, line: int, record: Any, error: AnyStr):
+        """Append a record to the rejected rows file.
+
+        :param line: Input line of the record
+        :param record: Rejected record
+        :param error: Rejection reason
+        """
+
+        self.rejected += 1
+        self._rejected_file.write(json.dumps({'line': line, 'error': error, 'record': record}, default=str) + '\n')
+
+    def _open_rejected(self, offset: int):
+        """Open the rejected rows file dropping rows written after the checkpoint.
+
+        :param offset: Rejected file size at the last checkpoint
+        :return: Writable file
+        """
+
+        if not os.path.exists(self.rejected_path) or not offset:
+            return open(self.rejected_path, 'w', encoding='utf-8')
+
+        file = open(self.rejected_path, 'r+', encoding='utf-8')  # pylint: disable=consider-using-with
+        file.seek(offset)
+        file.truncate()
+
+        return file
+
+    def _load_checkpoint(self) -> Dict[AnyStr, int]:
+        """Load the stored checkpoint if the import should resume.
+
+        :return Dict[AnyStr, int]: Checkpoint data
+        """
+
+        checkpoint = {'line': 0, 'imported': 0, 'rejected': 0, 'rejected_offset': 0}
+
+        if self.resume and os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path, encoding='utf-8') as file:
+                checkpoint.update(json.load(file))
+
+            logger.fields(checkpoint).info('resuming properties import')
+
+        return checkpoint
+
+    def _save_checkpoint(self, line: int):
+        """Atomically store the import checkpoint.
+
+        :param line: Last processed input line
+        """
+
+        tmp_path = f'{self.checkpoint_path}.tmp'
+
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(
+                {
+                    'line': line,
+                    'imported': self.imported,
+                    'rejected': self.rejected,
+                    'rejected_offset': self._rejected_file.tell(),
+                },
+                file,
+            )
+
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _report_progress(self, line: int):
+        """Log throughput every PROGRESS_INTERVAL seconds.
+
+        :param line: Last processed input line
+        """
+
+        now = time.perf_counter()
+
+        if now - self._reported_at < PROGRESS_INTERVAL:
+            return
+
+        self._reported_at = now
+        logger.fields(self._summary(line, self._started_at)).info('properties import progress')
+
+    def _summary(self, line: int, started_at: float) -> Dict[AnyStr, Any]:
+        elapsed = max(time.perf_counter() - started_at, 1e-9)
+
+        return {
+            'line': line,
+            'imported': self.imported,
+            'rejected': self.rejected,
+            'seconds': round(elapsed, 3),
+            'rows_per_second': round((self.imported + self.rejected) / elapsed, 1),
+        }
+
+
+def _coerce_csv_record(record: Dict[AnyStr, AnyStr]) -> Dict[AnyStr, Any]:
+    """Cast CSV string values to the schema types, empty values are treated as missing.
+
+    :param record: CSV row
+    :return Dict[AnyStr, Any]: Casted record
+    """
+
+    data = {}
+
+    for key, value in record.items():
+        if value is None or value == '':
+            continue
+
+        if key in INTEGER_FIELDS:
+            try:
+                value = int(value)
+            except ValueError:
+                pass
+        elif key in NUMBER_FIELDS:
+            try:
+                value = float(value)
+            except ValueError:
+                pass
+
+        data[key] = value
+
+    return data
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[AnyStr, Any]:
+    """Command entry point.
+
+    :param argv: Command line arguments
+    :return Dict[AnyStr, Any]: Import summary
+    """
+
+    parser = argparse.ArgumentParser(description='Bulk import properties from CSV or JSON Lines files')
+    parser.add_argument('path', help='Input file')
+    parser.add_argument('--format', choices=['csv', 'jsonl'], default=None, help='Defaults to the file extension')
+    parser.add_argument('--chunk-size', type=int, default=1000, help='Records written per transaction')
+    parser.add_argument('--checkpoint', default=None, help='Defaults to <path>.checkpoint')
+    parser.add_argument('--rejected', default=None, help='Defaults to <path>.rejected.jsonl')
+    parser.add_argument('--no-resume', action='store_true', help='Ignore the stored checkpoint')
+    args = parser.parse_args(argv)
+
+    config_logs()
+
+    file_format = args.format or ('csv' if args.path.lower().endswith('.csv') else 'jsonl')
+
+    importer = PropertiesImporter(
+        path=args.path,
+        file_format=file_format,
+        chunk_size=max(args.chunk_size, 1),
+        checkpoint_path=args.checkpoint or f'{args.path}.checkpoint',
+        rejected_path=args.rejected or f'{args.path}.rejected.jsonl',
+        resume=not args.no_resume,
+    )
+
+    return importer.run()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,3 @@
+"""Export resources."""
+
+from .batching import FLUSH_ON_RETURN, BatchBuffer, flush_all, register
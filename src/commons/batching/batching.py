@@ -0,0 +1,156 @@
+"""Write buffers flushed in batches.
+
+Items are accumulated in memory and handed to a flush function as a single list when the buffer reaches
+`max_size` items or its oldest item is older than `max_wait` seconds. On Lambda the execution environment is
+frozen as soon as the handler returns, so `request.validate` flushes every registered buffer before returning
+(BATCH_FLUSH_ON_RETURN=true, the default). Long running container deployments can disable it and rely on the
+background flusher thread instead.
+"""
+
+# pylint: disable=global-statement
+
+import os
+import threading
+import time
+from typing import Any, AnyStr, Callable, List, NoReturn
+
+from src.commons.logging import logger
+
+FLUSH_ON_RETURN = os.getenv('BATCH_FLUSH_ON_RETURN', 'true') == 'true'
+FLUSH_INTERVAL = float(os.getenv('BATCH_FLUSH_INTERVAL', '1'))
+
+_BUFFERS = []
+_FLUSHER = None
+
+
+class BatchBuffer:
+    """Thread safe buffer that flushes its items in batches.
+
+    :param name: Buffer name used on logs
+    :param flush_fn: Function that receives the list of buffered items
+    :param max_size: Number of items that triggers a flush
+    :param max_wait: Max age in seconds of the oldest buffered item before flushing
+    """
+
+    def __init__(self, name: AnyStr, flush_fn: Callable[[List[Any]], Any], max_size: int = 500, max_wait: float = 1.0):
+        self.name = name
+        self.max_size = max_size
+        self.max_wait = max_wait
+
+        self._flush_fn = flush_fn
+        self._items = []
+        self._first_at = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+        register(self)
+
+    def add(self, item: Any) -> NoReturn:
+        """Add an item to the buffer flushing it if any of the triggers is reached.
+
+        :param item: Item to buffer
+        """
+
+        with self._lock:
+            if not self._items:
+                self._first_at = time.monotonic()
+
+            self._items.append(item)
+            should_flush = len(self._items) >= self.max_size or self._expired()
+
+        if not should_flush:
+            return
+
+        try:
+            self.flush()
+        except Exception:
+            # Items are kept on the buffer and retried on the next flush
+            return
+
+    def flush(self) -> int:
+        """Flush all buffered items. On flush errors items are put back on the buffer.
+
+        :return int: Number of flushed items
+        """
+
+        with self._flush_lock:
+            with self._lock:
+                items, self._items, self._first_at = self._items, [], None
+
+            if not items:
+                return 0
+
+            try:
+                self._flush_fn(items)
+            except Exception as err:
+                with self._lock:
+                    self._items = items + self._items
+                    self._first_at = time.monotonic()
+
+                logger.fields({'buffer': self.name, 'items': len(items)}).err(err).error('batch flush error')
+                raise
+
+        logger.fields({'buffer': self.name, 'items': len(items)}).debug('batch flushed')
+
+        return len(items)
+
+    def flush_expired(self) -> int:
+        """Flush the buffer only if its oldest item reached the max wait.
+
+        :return int: Number of flushed items
+        """
+
+        with self._lock:
+            expired = self._expired()
+
+        return self.flush() if expired else 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def _expired(self) -> bool:
+        return self._first_at is not None and time.monotonic() - self._first_at >= self.max_wait
+
+
+def register(buffer: BatchBuffer) -> NoReturn:
+    """Register a buffer to be flushed by flush_all and the background flusher.
+
+    :param buffer: Buffer instance
+    """
+
+    _BUFFERS.append(buffer)
+
+    if not FLUSH_ON_RETURN:
+        _start_flusher()
+
+
+def flush_all() -> NoReturn:
+    """Flush every registered buffer, errors are logged so one buffer can't block the others."""
+
+    for buffer in _BUFFERS:
+        try:
+            buffer.flush()
+        except Exception:
+            continue
+
+
+def _start_flusher() -> NoReturn:
+    """Start the background thread that flushes expired buffers."""
+
+    global _FLUSHER
+
+    if _FLUSHER is not None:
+        return
+
+    def run():
+        while True:
+            time.sleep(FLUSH_INTERVAL)
+
+            for buffer in _BUFFERS:
+                try:
+                    buffer.flush_expired()
+                except Exception:
+                    continue
+
+    _FLUSHER = threading.Thread(target=run, name='batch-flusher', daemon=True)
+    _FLUSHER.start()
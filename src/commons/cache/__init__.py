@@ -0,0 +1,3 @@
+"""Export resources."""
+
+from .cache import CounterCache, TTLCache
@@ -0,0 +1,130 @@
+"""In memory caches shared by the invocations of the same container."""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, NoReturn, Optional, Tuple
+
+
+class CounterCache:
+    """Counters loaded from the database on the first read and kept up to date in memory.
+
+    Values expire after `ttl` seconds so counters modified by other containers converge to the stored value.
+
+    :param ttl: Seconds a loaded counter is considered fresh
+    """
+
+    def __init__(self, ttl: float = 60.0):
+        self.ttl = ttl
+        self._values: Dict[Hashable, Tuple[int, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, loader: Callable[[], int]) -> int:
+        """Return a counter value loading it when it is missing or expired.
+
+        :param key: Counter key
+        :param loader: Function that returns the stored counter value
+        :return int: Counter value
+        """
+
+        with self._lock:
+            cached = self._values.get(key, None)
+
+        if cached is not None and time.monotonic() - cached[1] < self.ttl:
+            return cached[0]
+
+        value = int(loader() or 0)
+
+        with self._lock:
+            self._values[key] = (value, time.monotonic())
+
+        return value
+
+    def incr(self, key: Hashable, delta: int = 1) -> Optional[int]:
+        """Increment a loaded counter, missing counters are left to be loaded on the next read.
+
+        :param key: Counter key
+        :param delta: Value to add
+        :return Optional[int]: Updated value
+        """
+
+        with self._lock:
+            cached = self._values.get(key, None)
+
+            if cached is None:
+                return None
+
+            value = max(cached[0] + delta, 0)
+            self._values[key] = (value, cached[1])
+
+        return value
+
+    def invalidate(self, key: Hashable) -> NoReturn:
+        """Remove a counter from the cache.
+
+        :param key: Counter key
+        """
+
+        with self._lock:
+            self._values.pop(key, None)
+
+    def clear(self) -> NoReturn:
+        """Remove all counters."""
+
+        with self._lock:
+            self._values.clear()
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._values
+
+
+class TTLCache:
+    """Key value cache where entries expire `ttl` seconds after being stored.
+
+    :param ttl: Seconds an entry is considered fresh
+    :param max_size: Max number of entries, the oldest entry is evicted when it is reached
+    """
+
+    def __init__(self, ttl: float = 60.0, max_size: int = 1024):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._values: Dict[Hashable, Tuple[Any, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return a fresh cached value.
+
+        :param key: Entry key
+        :return Optional[Any]: Cached value or None if it is missing or expired
+        """
+
+        with self._lock:
+            cached = self._values.get(key, None)
+
+            if cached is None:
+                return None
+
+            if time.monotonic() - cached[1] >= self.ttl:
+                del self._values[key]
+                return None
+
+        return cached[0]
+
+    def set(self, key: Hashable, value: Any) -> NoReturn:
+        """Store a value.
+
+        :param key: Entry key
+        :param value: Value to cache
+        """
+
+        with self._lock:
+            if key not in self._values and len(self._values) >= self.max_size:
+                oldest = min(self._values, key=lambda item: self._values[item][1])
+                del self._values[oldest]
+
+            self._values[key] = (value, time.monotonic())
+
+    def clear(self) -> NoReturn:
+        """Remove all entries."""
+
+        with self._lock:
+            self._values.clear()
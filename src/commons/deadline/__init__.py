@@ -0,0 +1,3 @@
+"""Export resources."""
+
+from .deadline import clear, elapsed, exceeded, remaining, start, timeout
@@ -0,0 +1,114 @@
+"""Request deadline.
+
+`request.validate` starts the deadline from the Lambda remaining time minus DEADLINE_MARGIN seconds, kept to
+build the error response and flush logs. Database queries and outbound calls take their timeouts from the
+remaining time, so a slow dependency ends in a DeadlineExceededError instead of a platform timeout. Outside
+Lambda the deadline is REQUEST_TIMEOUT seconds, 0 means no deadline.
+
+The deadline is kept in a context variable instead of the global context, requests served concurrently by other
+threads never see each other's deadline.
+"""
+
+import os
+import time
+from contextvars import ContextVar
+from typing import Any, AnyStr, NoReturn, Optional
+
+from src.commons.errors import DeadlineExceededError
+
+DEADLINE_MARGIN = float(os.getenv('DEADLINE_MARGIN', '0.5'))
+REQUEST_TIMEOUT = float(os.getenv('REQUEST_TIMEOUT', '0'))
+
+# (started_at, deadline) monotonic times of the current request
+_REQUEST = ContextVar('deadline', default=(None, None))
+
+
+def start(lambda_context: Any = None) -> NoReturn:
+    """Start the request deadline.
+
+    :param lambda_context: Lambda invocation context
+    """
+
+    now = time.monotonic()
+    budget = REQUEST_TIMEOUT or None
+
+    if hasattr(lambda_context, 'get_remaining_time_in_millis'):
+        budget = lambda_context.get_remaining_time_in_millis() / 1000 - DEADLINE_MARGIN
+
+    _REQUEST.set((now, None if budget is None else now + max(budget, 0.0)))
+
+
+def clear() -> NoReturn:
+    """Forget the deadline of the current request."""
+
+    _REQUEST.set((None, None))
+
+
+def remaining() -> Optional[float]:
+    """Get the seconds left before the deadline.
+
+    :return Optional[float]: Remaining seconds, None without deadline
+    """
+
+    _, deadline = _REQUEST.get()
+
+    if deadline is None:
+        return None
+
+    return deadline - time.monotonic()
+
+
+def elapsed() -> float:
+    """Get the seconds since the request started.
+
+    :return float: Elapsed seconds
+    """
+
+    started_at, _ = _REQUEST.get()
+
+    if started_at is None:
+        return 0.0
+
+    return time.monotonic() - started_at
+
+
+def timeout(operation: AnyStr, limit: Optional[float] = None) -> Optional[float]:
+    """Get the timeout for an operation, bounded by the remaining time.
+
+    :param operation: Operation name for the error details
+    :param limit: Max timeout of the operation
+    :return Optional[float]: Timeout in seconds, None if there's no deadline nor limit
+    :raise DeadlineExceededError: If the deadline already passed
+    """
+
+    left = remaining()
+
+    if left is None:
+        return limit
+
+    if left <= 0:
+        raise exceeded(operation)
+
+    return left if limit is None else min(left, limit)
+
+
+def exceeded(operation: AnyStr) -> DeadlineExceededError:
+    """Build the error of an operation interrupted by the deadline.
+
+    :param operation: Operation name
+    :return DeadlineExceededError: Error with timing details
+    """
+
+    started_at, deadline = _REQUEST.get()
+    budget = None if deadline is None or started_at is None else round((deadline - started_at) * 1000)
+
+    return DeadlineExceededError(
+        root_causes=[
+            {
+                'message': f'Deadline exceeded on {operation}',
+                'operation': operation,
+                'elapsed_ms': round(elapsed() * 1000),
+                'budget_ms': budget,
+            }
+        ]
+    )
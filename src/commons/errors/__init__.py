@@ -2,11 +2,13 @@
 
 from .bad_request_error import BadRequestError
 from .data_conflict_error import DataConflictError
+from .deadline_exceeded_error import DeadlineExceededError
 from .forbidden_error import ForbiddenError
 from .handler_error import HandlerError
 from .internal_error import InternalError
 from .not_found_error import NotFoundError
 from .schema_error import SchemaError
 from .service_unavailable import ServiceUnavailableError
+from .too_many_requests_error import TooManyRequestsError
 from .unauthorized_error import UnauthorizedError
 from .unprocessable_entity_error import UnprocessableEntityError
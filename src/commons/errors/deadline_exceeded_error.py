@@ -0,0 +1,18 @@
+"""Deadline exceeded custom error."""
+
+from typing import Any, List
+
+from .handler_error import HandlerError
+
+
+class DeadlineExceededError(HandlerError):
+    """Deadline exceeded error class."""
+
+    def __init__(self, errors: Any = None, root_causes: List[Any] = None):
+        super().__init__(
+            code=503,
+            message='deadline-exceeded',
+            description='The request could not be completed in time',
+            errors=errors,
+            root_causes=root_causes,
+        )
@@ -0,0 +1,18 @@
+"""Too many requests custom error."""
+
+from typing import Any, List
+
+from .handler_error import HandlerError
+
+
+class TooManyRequestsError(HandlerError):
+    """Too many requests error class."""
+
+    def __init__(self, errors: Any = None, root_causes: List[Any] = None):
+        super().__init__(
+            code=429,
+            message='too-many-requests',
+            description='Request rate limit exceeded',
+            errors=errors,
+            root_causes=root_causes,
+        )
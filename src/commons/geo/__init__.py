@@ -0,0 +1,3 @@
+"""Export resources."""
+
+from .geo import GridIndex, bounding_box, build_grid, haversine_km
@@ -0,0 +1,158 @@
+"""In-process geospatial index.
+
+Points are bucketed on a regular latitude/longitude grid of `cell_size` degrees. A radius query only visits the
+cells overlapping the bounding box of the searched circle and computes the great-circle distance for the points
+inside them, so its cost depends on the density around the searched point instead of the total number of points.
+"""
+
+import math
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Kilometers per degree of latitude
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two points.
+
+    :param lat1: Latitude of the first point
+    :param lon1: Longitude of the first point
+    :param lat2: Latitude of the second point
+    :param lon2: Longitude of the second point
+    :return float: Distance in kilometers
+    """
+
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    half = math.sin((lat2 - lat1) / 2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2)**2
+
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(half)))
+
+
+def bounding_box(lat: float, lon: float, radius_km: float) -> Tuple[float, float, float, float]:
+    """Latitude/longitude box that contains every point within the radius. Longitudes are not wrapped, boxes that
+    cross the antimeridian go below -180 or over 180.
+
+    :param lat: Center latitude
+    :param lon: Center longitude
+    :param radius_km: Radius in kilometers
+    :return Tuple[float, float, float, float]: (lat_min, lat_max, lon_min, lon_max)
+    """
+
+    delta_lat = radius_km / KM_PER_DEGREE
+    lat_min, lat_max = max(lat - delta_lat, -90.0), min(lat + delta_lat, 90.0)
+
+    # Near the poles the circle covers every longitude
+    cos_lat = min(math.cos(math.radians(lat_min)), math.cos(math.radians(lat_max)))
+
+    if cos_lat <= 1e-9 or radius_km / (KM_PER_DEGREE * cos_lat) >= 180:
+        return lat_min, lat_max, -180.0, 180.0
+
+    delta_lon = radius_km / (KM_PER_DEGREE * cos_lat)
+
+    return lat_min, lat_max, lon - delta_lon, lon + delta_lon
+
+
+class GridIndex:
+    """Grid bucketed point index answering radius queries.
+
+    :param cell_size: Cell size in degrees, around the usual search radius works best
+    """
+
+    def __init__(self, cell_size: float = 0.02):
+        self.cell_size = cell_size
+
+        self._cells: Dict[Tuple[int, int], List[Tuple[int, float, float]]] = defaultdict(list)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, item_id: int, lat: float, lon: float):
+        """Add a point to the index.
+
+        :param item_id: Point identifier
+        :param lat: Latitude
+        :param lon: Longitude
+        """
+
+        self._cells[self._cell(lat, lon)].append((item_id, lat, lon))
+        self._size += 1
+
+    def within(self, lat: float, lon: float, radius_km: float, limit: Optional[int] = None) -> List[Tuple[int, float]]:
+        """Find the points within a radius.
+
+        :param lat: Center latitude
+        :param lon: Center longitude
+        :param radius_km: Radius in kilometers
+        :param limit: Max number of points
+        :return List[Tuple[int, float]]: (item_id, distance_km) tuples from the nearest to the farthest point
+        """
+
+        lat_min, lat_max, lon_min, lon_max = bounding_box(lat, lon, radius_km)
+        rows = range(self._row(lat_min), self._row(lat_max) + 1)
+
+        found = []
+
+        for columns in self._column_ranges(lon_min, lon_max):
+            for row in rows:
+                for column in columns:
+                    for item_id, item_lat, item_lon in self._cells.get((row, column), ()):
+                        # Border cells are mostly outside the circle, the latitude check is much cheaper
+                        if not lat_min <= item_lat <= lat_max:
+                            continue
+
+                        distance = haversine_km(lat, lon, item_lat, item_lon)
+
+                        if distance <= radius_km:
+                            found.append((item_id, distance))
+
+        found.sort(key=lambda item: item[1])
+
+        return found[:limit] if limit is not None else found
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return self._row(lat), self._column(lon)
+
+    def _row(self, lat: float) -> int:
+        return math.floor(lat / self.cell_size)
+
+    def _column(self, lon: float) -> int:
+        return math.floor(lon / self.cell_size)
+
+    def _column_ranges(self, lon_min: float, lon_max: float) -> List[range]:
+        """Grid columns covered by a longitude range, split in two when it crosses the antimeridian.
+
+        :param lon_min: Min longitude, can be below -180
+        :param lon_max: Max longitude, can be over 180
+        :return List[range]: Column ranges
+        """
+
+        if lon_min < -180:
+            return [self._columns(-180.0, lon_max), self._columns(lon_min + 360, 180.0)]
+
+        if lon_max > 180:
+            return [self._columns(lon_min, 180.0), self._columns(-180.0, lon_max - 360)]
+
+        return [self._columns(lon_min, lon_max)]
+
+    def _columns(self, lon_min: float, lon_max: float) -> range:
+        return range(self._column(lon_min), self._column(lon_max) + 1)
+
+
+def build_grid(points: Iterable[Tuple[int, float, float]], cell_size: float = 0.02) -> GridIndex:
+    """Build a grid index.
+
+    :param points: (item_id, latitude, longitude) tuples
+    :param cell_size: Cell size in degrees
+    :return GridIndex: Loaded index
+    """
+
+    index = GridIndex(cell_size)
+
+    for item_id, lat, lon in points:
+        index.add(item_id, lat, lon)
+
+    return index
@@ -1,3 +1,14 @@
 """Export resources."""
 
-from .http import csv, json, json_error, response
+from .http import (
+    COLUMNAR_JSON,
+    JSON,
+    MSGPACK,
+    content,
+    csv,
+    json,
+    json_error,
+    negotiate,
+    response,
+    to_columns,
+)
@@ -1,15 +1,39 @@
 """Http common functions."""
 
+import base64
 import decimal
 import http.client
 import json as json_parser
 import os
-from typing import Any, AnyStr, Dict, List, NoReturn, Optional, Tuple, Union
+from typing import Any, AnyStr, Dict, List, NoReturn, Optional, Tuple
 
-from src.commons import context
+import msgpack
+
+from src.commons import context, masking
 from src.commons.errors import HandlerError
 from src.commons.logging import logger
 
+JSON = 'application/json'
+COLUMNAR_JSON = 'application/vnd.columnar+json'
+MSGPACK = 'application/msgpack'
+
+# Error codes by http status (`not-found`, `too-many-requests`...)
+ERROR_CODES = {code: phrase.lower().replace(' ', '-') for code, phrase in http.client.responses.items()}
+
+# Serialized client error bodies by error shape, bounded so unique root causes can't grow it without limit
+ERROR_BODY_CACHE_SIZE = int(os.getenv('ERROR_BODY_CACHE_SIZE', '1024'))
+_ERROR_BODIES: Dict[Tuple, Tuple[Dict[AnyStr, Any], AnyStr]] = {}
+
+# Accept header aliases of the supported media types
+MEDIA_TYPES = {
+    JSON: JSON,
+    'application/*': JSON,
+    '*/*': JSON,
+    COLUMNAR_JSON: COLUMNAR_JSON,
+    MSGPACK: MSGPACK,
+    'application/x-msgpack': MSGPACK,
+}
+
 
 def json(
     code: Optional[int] = 200,
@@ -31,7 +55,7 @@ def json(
     if not headers:
         headers = {}
 
-    _log_request_data(_mask_protected_data(body))
+    _log_request_data(masking.mask(body))
 
     body = _validate_error(body, code, error)
     body = json_parser.dumps(body, default=_handle_extra_types)
@@ -39,6 +63,99 @@ def json(
     return response(code=code, body=body, headers=headers)
 
 
+def content(
+    code: Optional[int] = 200,
+    body: Optional[Dict[AnyStr, Any]] = None,
+    headers: Optional[Dict[AnyStr, AnyStr]] = None,
+    table: Optional[AnyStr] = None,
+) -> Dict[AnyStr, Any]:
+    """Http lambda response encoded as JSON, columnar JSON or MessagePack according to the request Accept header.
+
+    :param code: Http response code
+    :param body: Response body
+    :param headers: Response headers
+    :param table: Body key holding a list of rows, columnar JSON and MessagePack send it as columns and rows
+    :return Dict: Response payload
+    """
+
+    headers = {'Vary': 'Accept', **(headers or {})}
+    media_type = negotiate(context.get_value('request').get('headers', {}).get('Accept', None))
+
+    if media_type == JSON:
+        return json(code=code, body=body, headers=headers)
+
+    if not body:
+        body = {}
+
+    _log_request_data(masking.mask(body))
+
+    body = _validate_error(body, code, None)
+
+    if table is not None and isinstance(body.get(table, None), list):
+        body = {**body, table: to_columns(body[table])}
+
+    headers['Content-Type'] = media_type
+
+    if media_type == MSGPACK:
+        payload = msgpack.packb(body, default=_handle_extra_types, use_bin_type=True)
+        return response(code=code, body=base64.b64encode(payload).decode('ascii'), headers=headers, binary=True)
+
+    return response(code=code, body=json_parser.dumps(body, default=_handle_extra_types), headers=headers)
+
+
+def negotiate(accept: Optional[AnyStr]) -> AnyStr:
+    """Choose the response media type from an Accept header, JSON when none of the accepted types is supported.
+
+    :param accept: Accept header value
+    :return AnyStr: Media type
+    """
+
+    if not accept:
+        return JSON
+
+    accepted = []
+
+    for position, item in enumerate(accept.split(',')):
+        media_type, *params = [part.strip() for part in item.split(';')]
+        quality = 1.0
+
+        for param in params:
+            if param.startswith('q='):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+
+        if quality > 0:
+            accepted.append((-quality, position, media_type.lower()))
+
+    for _, _, media_type in sorted(accepted):
+        supported = MEDIA_TYPES.get(media_type, None)
+
+        if supported is not None:
+            return supported
+
+    return JSON
+
+
+def to_columns(rows: List[Dict[AnyStr, Any]]) -> Dict[AnyStr, List[Any]]:
+    """Turn a list of objects into a column oriented table, missing keys are sent as null.
+
+    :param rows: List of objects
+    :return Dict[AnyStr, List[Any]]: Columns and rows of values
+    """
+
+    columns = {}
+
+    for row in rows:
+        for key in row:
+            columns.setdefault(key, len(columns))
+
+    names = list(columns)
+
+    return {'columns': names, 'rows': [[row.get(name, None) for name in names] for row in rows]}
+
+
 def json_error(error: Any, headers: Optional[Dict[AnyStr, AnyStr]] = None) -> Dict[AnyStr, Any]:
     """Respond with an standard XML error description.
     :param error: Possible error to handle
@@ -50,6 +167,9 @@ def json_error(error: Any, headers: Optional[Dict[AnyStr, AnyStr]] = None) -> Di
         headers = {}
 
     if isinstance(error, HandlerError):
+        if error.code < 500:
+            return _client_error(error, headers)
+
         return json(code=error.code, error=error, headers=headers)
 
     return json(code=500, error=error, headers=headers)
@@ -59,11 +179,13 @@ def response(
     code: Optional[int] = 200,
     body: Optional[AnyStr] = None,
     headers: Optional[Dict[AnyStr, AnyStr]] = None,
+    binary: bool = False,
 ) -> Dict[AnyStr, Any]:
     """Http lambda response formatting.
     :param code: Http response code
     :param body: Response json body
     :param headers: Response headers
+    :param binary: The body is base64 encoded binary data
     :return: Response
     """
 
@@ -73,12 +195,17 @@ def response(
     if os.getenv('CORS', 'false') == 'true':
         headers.update(_cors_headers())
 
-    return {
+    payload = {
         'statusCode': code,
         'body': body,
         'headers': headers,
     }
 
+    if binary:
+        payload['isBase64Encoded'] = True
+
+    return payload
+
 
 def csv(
     code: Optional[int] = 200,
@@ -142,14 +269,63 @@ def _validate_error(body: Dict[AnyStr, Any], code: int, error: Any) -> Dict[AnyS
     return body
 
 
+def _client_error(error: HandlerError, headers: Dict[AnyStr, AnyStr]) -> Dict[AnyStr, Any]:
+    """Fast path of 4xx responses: bodies are serialized once per error shape and logged masked, like every other
+    response, without traceback.
+
+    :param error: Client error
+    :param headers: Response headers
+    :return Dict: Response payload
+    """
+
+    key = _error_shape(error)
+    cached = _ERROR_BODIES.get(key, None) if key is not None else None
+
+    if cached is None:
+        body = {'error': error.message, 'message': error.description, 'root_causes': error.root_causes}
+        cached = (body, json_parser.dumps(body, default=_handle_extra_types))
+
+        if key is not None and len(_ERROR_BODIES) < ERROR_BODY_CACHE_SIZE:
+            _ERROR_BODIES[key] = cached
+
+    body, payload = cached
+
+    _log_request_data(masking.mask(body))
+    logger.field('error', error.message).error('handled request')
+
+    return response(code=error.code, body=payload, headers=headers)
+
+
+def _error_shape(error: HandlerError) -> Optional[Tuple]:
+    """Hashable identity of an error response body.
+
+    :param error: Handler error
+    :return Optional[Tuple]: Error shape, None if root causes hold nested values
+    """
+
+    root_causes = ()
+
+    if error.root_causes is not None:
+        try:
+            root_causes = tuple(tuple(cause.items()) for cause in error.root_causes)
+            hash(root_causes)
+        except (AttributeError, TypeError):
+            return None
+
+    return error.code, error.message, error.description, error.root_causes is None, root_causes
+
+
 def _get_error_from_code(code: int) -> AnyStr:
     """Transform http status code into a standard error message.
     :param code: HTTP status code
     :return AnyStr: Associated status code message
     """
 
-    error = http.client.responses[code]
-    error = error.lower().replace(' ', '-')
+    error = ERROR_CODES.get(code, None)
+
+    if error is None:
+        error = http.client.responses[code].lower().replace(' ', '-')
+
     return error
 
 
@@ -213,52 +389,9 @@ def _get_request() -> Dict[AnyStr, Any]:
     body = context.get_value('request').get('body')
 
     if isinstance(body, dict):
-        return _mask_protected_data(body)
+        return masking.mask(body)
 
     if 'to_dict' in dir(body):
-        return _mask_protected_data(body.to_dict())
+        return masking.mask(body.to_dict())
 
     return body
-
-
-def _mask_protected_data(data: Union[Dict[AnyStr, Any], List[Any]]) -> Dict[AnyStr, Any]:
-    """Mask values of protected data for logging.
-
-    :param data: Data to mask protected params
-    :return Dict[AnyStr, Any]: Masked data
-    """
-
-    if isinstance(data, list):
-        data = _mask_list_data(data)
-
-    if isinstance(data, dict):
-        data = _mask_dict_data(data)
-
-    return data
-
-
-def _mask_list_data(data: List[Any]) -> List[Any]:
-    """Mask list data."""
-
-    for index, value in enumerate(data):
-        data[index] = _mask_protected_data(value)
-
-    return data
-
-
-def _mask_dict_data(data: Dict[AnyStr, Any]) -> Dict[AnyStr, Any]:
-    """Mask dict data."""
-
-    protected = {
-        'password',
-        'password_confirmation',
-    }
-
-    for key in data.keys():
-        if key in protected:
-            data[key] = '******'
-            continue
-
-        data[key] = _mask_protected_data(data[key])
-
-    return data
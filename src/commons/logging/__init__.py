@@ -1,4 +1,4 @@
 """Export resources."""
 
 from .logging import LOGGER as logger
-from .logging import config_logs
+from .logging import config_logs, flush_logs
@@ -5,9 +5,17 @@ import os
 
 from elasticlogger import Logger
 
+from .pipeline import AsyncBatchHandler
+
 LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
 APP_NAME = os.getenv('APP_NAME', 'service')
 
+LOG_ASYNC = os.getenv('LOG_ASYNC', 'true') == 'true'
+LOG_BUFFER_SIZE = int(os.getenv('LOG_BUFFER_SIZE', '10000'))
+LOG_BATCH_SIZE = int(os.getenv('LOG_BATCH_SIZE', '100'))
+LOG_FLUSH_INTERVAL = float(os.getenv('LOG_FLUSH_INTERVAL', '0.5'))
+LOG_FLUSH_TIMEOUT = float(os.getenv('LOG_FLUSH_TIMEOUT', '2'))
+
 
 def _get_logger_level() -> int:
     """Return the log level value to build logger instance.
@@ -36,3 +44,35 @@ def config_logs():
     """Bootstrap logger configuration options."""
     logging.getLogger('urllib3').setLevel(logging.WARNING)
     LOGGER.logger.propagate = False
+
+    if LOG_ASYNC:
+        _enable_async_pipeline()
+
+
+def flush_logs():
+    """Write all buffered log records, it should be called before the Lambda handler returns."""
+
+    for handler in LOGGER.logger.handlers:
+        if isinstance(handler, AsyncBatchHandler):
+            handler.flush(timeout=LOG_FLUSH_TIMEOUT)
+
+
+def _enable_async_pipeline():
+    """Move the logger handlers behind an AsyncBatchHandler, it is safe to call it many times."""
+
+    handlers = LOGGER.logger.handlers
+
+    if any(isinstance(handler, AsyncBatchHandler) for handler in handlers):
+        return
+
+    pipeline = AsyncBatchHandler(
+        targets=list(handlers),
+        capacity=LOG_BUFFER_SIZE,
+        batch_size=LOG_BATCH_SIZE,
+        flush_interval=LOG_FLUSH_INTERVAL,
+    )
+
+    for handler in list(handlers):
+        LOGGER.logger.removeHandler(handler)
+
+    LOGGER.logger.addHandler(pipeline)
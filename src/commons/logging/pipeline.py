@@ -0,0 +1,187 @@
+"""Non-blocking log pipeline.
+
+Log records are appended to a bounded in-memory buffer and a background thread formats and writes them in batches
+to the original handlers, so the request path only pays for creating the record. When the buffer is full new
+records are dropped and counted instead of blocking the caller, the number of dropped records is logged on the
+next flush.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import List, NoReturn
+
+
+class AsyncBatchHandler(logging.Handler):
+    """Logging handler that forwards records to other handlers from a background thread.
+
+    :param targets: Handlers that format and write the records
+    :param capacity: Max number of buffered records
+    :param batch_size: Number of records that wakes up the writer before the flush interval
+    :param flush_interval: Max seconds a record waits on the buffer
+    """
+
+    def __init__(
+        self,
+        targets: List[logging.Handler],
+        capacity: int = 10000,
+        batch_size: int = 100,
+        flush_interval: float = 0.5,
+    ):
+        super().__init__()
+
+        self.targets = targets
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self.dropped = 0
+        self.written = 0
+
+        self._records = deque()
+        self._in_flight = 0
+        self._flushing = 0
+        self._reported_drops = 0
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def emit(self, record: logging.LogRecord) -> NoReturn:
+        """Buffer a record, it is dropped if the buffer is full.
+
+        :param record: Log record
+        """
+
+        with self._condition:
+            if len(self._records) >= self.capacity:
+                self.dropped += 1
+                return
+
+            self._records.append(record)
+
+            if len(self._records) >= self.batch_size:
+                self._condition.notify_all()
+
+        self._ensure_writer()
+
+    def flush(self, timeout: float = 2.0) -> bool:
+        """Wait until every buffered record has been written.
+
+        :param timeout: Max seconds to wait
+        :return bool: True if the buffer was drained
+        """
+
+        deadline = time.monotonic() + timeout
+
+        with self._condition:
+            self._flushing += 1
+            self._condition.notify_all()
+
+            try:
+                while self._records or self._in_flight:
+                    remaining = deadline - time.monotonic()
+
+                    if remaining <= 0:
+                        return False
+
+                    self._condition.wait(remaining)
+            finally:
+                self._flushing -= 1
+
+        self._report_drops()
+
+        return True
+
+    def close(self) -> NoReturn:
+        self.flush()
+        super().close()
+
+    def _ensure_writer(self) -> NoReturn:
+        """Start the writer thread on the first record."""
+
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        with self._condition:
+            if self._thread is not None and self._thread.is_alive():
+                return
+
+            self._thread = threading.Thread(target=self._run, name='log-writer', daemon=True)
+            self._thread.start()
+
+    def _run(self) -> NoReturn:
+        """Writer loop."""
+
+        while True:
+            with self._condition:
+                if not self._records or (len(self._records) < self.batch_size and not self._flushing):
+                    self._condition.wait(self.flush_interval)
+
+                batch = list(self._records)
+                self._records.clear()
+                self._in_flight = len(batch)
+
+            try:
+                self._write(batch)
+            finally:
+                with self._condition:
+                    self._in_flight = 0
+                    self.written += len(batch)
+                    self._condition.notify_all()
+
+    def _write(self, batch: List[logging.LogRecord]) -> NoReturn:
+        """Format and write a batch of records, stream handlers receive the whole batch in a single write.
+
+        :param batch: Log records
+        """
+
+        if not batch:
+            return
+
+        for target in self.targets:
+            if isinstance(target, logging.StreamHandler):
+                self._write_stream(target, batch)
+                continue
+
+            for record in batch:
+                if record.levelno >= target.level:
+                    target.handle(record)
+
+    def _write_stream(self, target: logging.StreamHandler, batch: List[logging.LogRecord]) -> NoReturn:
+        """Write a batch of records to a stream handler in one call.
+
+        :param target: Stream handler
+        :param batch: Log records
+        """
+
+        lines = []
+
+        for record in batch:
+            if record.levelno < target.level:
+                continue
+
+            try:
+                lines.append(target.format(record))
+            except Exception:
+                self.handleError(record)
+
+        if not lines:
+            return
+
+        with target.lock:
+            target.stream.write(target.terminator.join(lines) + target.terminator)
+            target.flush()
+
+    def _report_drops(self) -> NoReturn:
+        """Log how many records were dropped since the last report."""
+
+        dropped = self.dropped - self._reported_drops
+
+        if dropped <= 0:
+            return
+
+        self._reported_drops = self.dropped
+
+        record = logging.LogRecord('log-pipeline', logging.WARNING, __file__, 0, 'log records dropped', None, None)
+        record.dropped = dropped
+        self._write([record])
@@ -0,0 +1,3 @@
+"""Export resources."""
+
+from .masking import MASK, PROTECTED_KEYS, Masker, mask, register_safe_shape
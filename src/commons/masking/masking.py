@@ -0,0 +1,125 @@
+"""Protected data masking for logs.
+
+Masking never mutates the given data. Subtrees without protected keys are returned as they are and only the
+containers on the path to a protected key are copied, so the common case of a payload without protected data
+doesn't allocate anything. Dicts whose keys are a subset of a registered safe shape (e.g. the fields of a model)
+and whose values are all scalars are returned without looking up their keys.
+"""
+
+from typing import Any, AnyStr, Dict, Iterable, List, NoReturn
+
+MASK = '******'
+PROTECTED_KEYS = frozenset({'password', 'password_confirmation'})
+
+# Exact value types of the dicts that can skip masking, subclasses of these are not listed on purpose
+SCALAR_TYPES = frozenset({str, int, float, bool, type(None)})
+
+
+class Masker:
+    """Protected keys masking engine.
+
+    :param protected_keys: Keys whose values are masked at any depth
+    :param safe_shapes: Key sets of dicts without protected keys
+    """
+
+    def __init__(self, protected_keys: Iterable[AnyStr], safe_shapes: Iterable[Iterable[AnyStr]] = ()):
+        self.protected_keys = frozenset(protected_keys)
+        self.safe_shapes = []
+
+        for shape in safe_shapes:
+            self.add_safe_shape(shape)
+
+    def add_safe_shape(self, keys: Iterable[AnyStr]) -> NoReturn:
+        """Register the key set of dicts without protected keys, shapes with protected keys are ignored. Only dicts
+        with scalar values are skipped, nested values are still masked.
+
+        :param keys: Dict keys
+        """
+
+        shape = frozenset(keys)
+
+        if shape and self.protected_keys.isdisjoint(shape) and shape not in self.safe_shapes:
+            self.safe_shapes.append(shape)
+
+    def mask(self, data: Any) -> Any:
+        """Get a masked view of the given data.
+
+        :param data: Data to mask
+        :return Any: The same object if nothing was masked, otherwise a partial copy with masked values
+        """
+
+        if isinstance(data, dict):
+            return self._mask_dict(data)
+
+        if isinstance(data, list):
+            return self._mask_list(data)
+
+        return data
+
+    def _mask_dict(self, data: Dict[AnyStr, Any]) -> Dict[AnyStr, Any]:
+        keys = data.keys()
+
+        for shape in self.safe_shapes:
+            if keys <= shape and set(map(type, data.values())) <= SCALAR_TYPES:
+                return data
+
+        masked = None
+
+        for key, value in data.items():
+            if key in self.protected_keys:
+                new_value = MASK
+            elif isinstance(value, (dict, list)):
+                new_value = self.mask(value)
+            else:
+                continue
+
+            if new_value is value:
+                continue
+
+            if masked is None:
+                masked = dict(data)
+
+            masked[key] = new_value
+
+        return data if masked is None else masked
+
+    def _mask_list(self, data: List[Any]) -> List[Any]:
+        masked = None
+
+        for index, value in enumerate(data):
+            if not isinstance(value, (dict, list)):
+                continue
+
+            new_value = self.mask(value)
+
+            if new_value is value:
+                continue
+
+            if masked is None:
+                masked = list(data)
+
+            masked[index] = new_value
+
+        return data if masked is None else masked
+
+
+_MASKER = Masker(PROTECTED_KEYS)
+
+
+def mask(data: Any) -> Any:
+    """Mask protected values with the default masker.
+
+    :param data: Data to mask
+    :return Any: Masked view of the data
+    """
+
+    return _MASKER.mask(data)
+
+
+def register_safe_shape(keys: Iterable[AnyStr]) -> NoReturn:
+    """Register a safe shape on the default masker.
+
+    :param keys: Keys of dicts without protected keys
+    """
+
+    _MASKER.add_safe_shape(keys)
@@ -0,0 +1,3 @@
+"""Export resources."""
+
+from .metrics import gauge, get, incr, observe, reset, snapshot
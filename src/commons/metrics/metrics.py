@@ -0,0 +1,78 @@
+"""In process counters and gauges.
+
+Metrics live as long as the container and are reported with `snapshot()`, names are dotted strings like
+`singleflight.properties.coalesced`. Gauges keep an exponentially weighted moving average of the observed values.
+"""
+
+import threading
+from typing import AnyStr, Dict, NoReturn
+
+_COUNTERS: Dict[AnyStr, int] = {}
+_GAUGES: Dict[AnyStr, float] = {}
+_LOCK = threading.Lock()
+
+
+def incr(name: AnyStr, value: int = 1) -> int:
+    """Increment a counter.
+
+    :param name: Counter name
+    :param value: Value to add
+    :return int: Updated counter value
+    """
+
+    with _LOCK:
+        _COUNTERS[name] = _COUNTERS.get(name, 0) + value
+        return _COUNTERS[name]
+
+
+def get(name: AnyStr) -> int:
+    """Get a counter value.
+
+    :param name: Counter name
+    :return int: Counter value, 0 if it was never incremented
+    """
+
+    return _COUNTERS.get(name, 0)
+
+
+def observe(name: AnyStr, value: float, alpha: float = 0.2) -> float:
+    """Add an observation to a gauge moving average.
+
+    :param name: Gauge name
+    :param value: Observed value
+    :param alpha: Weight of the new observation
+    :return float: Updated gauge value
+    """
+
+    with _LOCK:
+        previous = _GAUGES.get(name, None)
+        _GAUGES[name] = value if previous is None else previous + alpha * (value - previous)
+        return _GAUGES[name]
+
+
+def gauge(name: AnyStr) -> float:
+    """Get a gauge value.
+
+    :param name: Gauge name
+    :return float: Gauge value, 0 if it was never observed
+    """
+
+    return _GAUGES.get(name, 0.0)
+
+
+def snapshot() -> Dict[AnyStr, float]:
+    """Get a copy of all the counters and gauges.
+
+    :return Dict[AnyStr, float]: Metric values by name
+    """
+
+    with _LOCK:
+        return {**_COUNTERS, **_GAUGES}
+
+
+def reset() -> NoReturn:
+    """Remove all the metrics."""
+
+    with _LOCK:
+        _COUNTERS.clear()
+        _GAUGES.clear()
@@ -0,0 +1,3 @@
+"""Export resources."""
+
+from .limits import LoadShedder, RateLimiter, protect
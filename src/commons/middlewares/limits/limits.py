@@ -0,0 +1,207 @@
+"""Rate limiting and load shedding middlewares.
+
+Requests are rejected before the handler runs, so they never reach the database:
+
+- Rate limit: token bucket per client keyed by the `x-user-id` header or the source IP, `RATE_LIMIT_RPS` tokens
+  per second up to `RATE_LIMIT_BURST`. Rejected requests get a 429 with a Retry-After header.
+- Load shedding: 503 when the requests in flight in the container reach `SHED_MAX_IN_FLIGHT` or the average
+  database connection time is over `SHED_MAX_DB_WAIT` seconds. While the database is saturated one probe request
+  every `SHED_PROBE_INTERVAL` seconds is still admitted, its connection updates the average so the shedder recovers
+  once the database does.
+
+A value of 0 disables the limit.
+"""
+
+import functools
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, AnyStr, Callable, Dict, Optional
+
+from src.commons import http, metrics
+from src.commons.errors import ServiceUnavailableError, TooManyRequestsError
+from src.commons.logging import logger
+from src.commons.types import CaseInsensitiveMapping
+
+RATE_LIMIT_RPS = float(os.getenv('RATE_LIMIT_RPS', '20'))
+RATE_LIMIT_BURST = float(os.getenv('RATE_LIMIT_BURST', '40'))
+RATE_LIMIT_MAX_CLIENTS = int(os.getenv('RATE_LIMIT_MAX_CLIENTS', '10000'))
+SHED_MAX_IN_FLIGHT = int(os.getenv('SHED_MAX_IN_FLIGHT', '64'))
+SHED_MAX_DB_WAIT = float(os.getenv('SHED_MAX_DB_WAIT', '1'))
+SHED_PROBE_INTERVAL = float(os.getenv('SHED_PROBE_INTERVAL', '1'))
+
+
+class RateLimiter:
+    """Token buckets by client.
+
+    :param rate: Tokens added per second
+    :param burst: Bucket capacity
+    :param max_clients: Number of buckets kept, the least recently used are discarded
+    """
+
+    def __init__(self, rate: float, burst: float, max_clients: int = 10000):
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self.max_clients = max_clients
+
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, client: AnyStr) -> float:
+        """Take a token from the client bucket.
+
+        :param client: Client key
+        :return float: 0 if the request is allowed, otherwise seconds until the next token
+        """
+
+        if not self.rate:
+            return 0.0
+
+        now = time.monotonic()
+
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(client, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated_at) * self.rate)
+
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0.0
+            else:
+                wait = (1 - tokens) / self.rate
+
+            self._buckets[client] = (tokens, now)
+
+            if len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+
+        return wait
+
+
+class LoadShedder:
+    """Concurrency and database pressure based admission.
+
+    :param max_in_flight: Max requests handled at the same time
+    :param max_db_wait: Max average database connection time in seconds
+    :param probe_interval: Seconds between the requests admitted while the database is saturated
+    """
+
+    def __init__(self, max_in_flight: int, max_db_wait: float, probe_interval: float = 1.0):
+        self.max_in_flight = max_in_flight
+        self.max_db_wait = max_db_wait
+        self.probe_interval = probe_interval
+        self.in_flight = 0
+
+        self._next_probe = 0.0
+        self._lock = threading.Lock()
+
+    def enter(self) -> Optional[AnyStr]:
+        """Admit a request.
+
+        :return Optional[AnyStr]: None if admitted, otherwise the rejection reason
+        """
+
+        with self._lock:
+            if self.max_in_flight and self.in_flight >= self.max_in_flight:
+                return 'too many requests in flight'
+
+            if self._is_saturated():
+                return 'database saturated'
+
+            self.in_flight += 1
+
+        return None
+
+    def leave(self):
+        """Release an admitted request."""
+
+        with self._lock:
+            self.in_flight -= 1
+
+    def _is_saturated(self) -> bool:
+        """Check the database connection time, letting a probe request through every probe interval. Otherwise the
+        gauge, only updated when a connection is opened, would never recover once every request is shed.
+
+        :return bool: True if the request has to be shed
+        """
+
+        if not self.max_db_wait or metrics.gauge('database.connect_seconds') <= self.max_db_wait:
+            return False
+
+        now = time.monotonic()
+
+        if now < self._next_probe:
+            return True
+
+        self._next_probe = now + self.probe_interval
+        metrics.incr('limits.probes')
+
+        return False
+
+
+RATE_LIMITED_ERROR = TooManyRequestsError(root_causes=[{'message': 'Request rate limit exceeded'}])
+
+RATE_LIMITER = RateLimiter(RATE_LIMIT_RPS, RATE_LIMIT_BURST, RATE_LIMIT_MAX_CLIENTS)
+LOAD_SHEDDER = LoadShedder(SHED_MAX_IN_FLIGHT, SHED_MAX_DB_WAIT, SHED_PROBE_INTERVAL)
+
+
+def protect(limiter: Optional[RateLimiter] = None, shedder: Optional[LoadShedder] = None) -> Callable:
+    """Reject requests over the client rate limit or while the service is overloaded.
+
+    :param limiter: Rate limiter, defaults to the one configured from the environment
+    :param shedder: Load shedder, defaults to the one configured from the environment
+    """
+
+    def inner(func: Callable) -> Callable:
+        """Middleware function."""
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs) -> Any:
+            """Middleware logic."""
+
+            event, _ = args
+            client = _client_key(event)
+
+            wait = (limiter or RATE_LIMITER).acquire(client)
+
+            if wait:
+                metrics.incr('limits.rate_limited')
+                logger.fields({'client': client, 'retry_after': wait}).warning('request rate limited')
+                return http.json_error(RATE_LIMITED_ERROR, headers={'Retry-After': str(math.ceil(wait))})
+
+            load_shedder = shedder or LOAD_SHEDDER
+            reason = load_shedder.enter()
+
+            if reason is not None:
+                metrics.incr('limits.shed')
+                logger.field('reason', reason).warning('request shed')
+                error = ServiceUnavailableError(root_causes=[{'message': f'Service overloaded: {reason}'}])
+
+                return http.json_error(error, headers={'Retry-After': '1'})
+
+            try:
+                return func(*args, **kwargs)
+            finally:
+                load_shedder.leave()
+
+        return wrapper
+
+    return inner
+
+
+def _client_key(event: Dict[AnyStr, Any]) -> AnyStr:
+    """Identify the client by user id or source IP.
+
+    :param event: Lambda http event
+    :return AnyStr: Client key
+    """
+
+    user_id = CaseInsensitiveMapping(event.get('headers', None)).get('x-user-id', None)
+
+    if user_id:
+        return f'user:{user_id}'
+
+    identity = (event.get('requestContext', None) or {}).get('identity', None) or {}
+
+    return f"ip:{identity.get('sourceIp', None) or 'unknown'}"
@@ -5,8 +5,8 @@ import json
 import uuid
 from typing import Any, AnyStr, Callable, Dict, Type
 
-from src.commons import context, http, utils
-from src.commons.logging import logger
+from src.commons import batching, context, deadline, http, profiling, utils, warmup
+from src.commons.logging import flush_logs, logger
 from src.commons.types import CaseInsensitiveMapping
 
 
@@ -24,7 +24,18 @@ def validate(schema: Dict[AnyStr, Any] = None, bind_type: Type = None) -> Callab
         def wrapper(*args, **kwargs) -> Any:
             """Middleware logic."""
 
-            event, _ = args
+            event, lambda_context = args
+
+            if warmup.is_warmup(event):
+                if schema is not None:
+                    utils.compile_json_schema(schema)
+
+                try:
+                    return warmup.run()
+                finally:
+                    _flush_pending_writes()
+
+            deadline.start(lambda_context)
 
             body = {}
             headers = CaseInsensitiveMapping(event['headers'])
@@ -34,6 +45,7 @@ def validate(schema: Dict[AnyStr, Any] = None, bind_type: Type = None) -> Callab
                 trace_id = headers.get('Trace-Id')
 
             logger.context.field('trace_id', trace_id)
+            logger.context.field('invocation', warmup.record_invocation())
             context.set_value('trace_id', trace_id)
 
             request_data = {
@@ -54,7 +66,9 @@ def validate(schema: Dict[AnyStr, Any] = None, bind_type: Type = None) -> Callab
                 try:
                     body = utils.validate_json_schema(body, schema)
                 except Exception as err:
-                    return http.json_error(err)
+                    response = http.json_error(err)
+                    _flush_pending_writes()
+                    return response
 
             if bind_type is not None and 'from_dict' in dir(bind_type):
                 body = bind_type.from_dict(body)
@@ -62,8 +76,27 @@ def validate(schema: Dict[AnyStr, Any] = None, bind_type: Type = None) -> Callab
             request_data['body'] = body
             context.set_value('request', request_data)
 
-            return func(*args, **kwargs)
+            try:
+                mode = profiling.requested_mode(headers)
+
+                if mode is None:
+                    return func(*args, **kwargs)
+
+                return profiling.profile(mode, trace_id, func, *args, **kwargs)
+            finally:
+                _flush_pending_writes()
 
         return wrapper
 
     return inner
+
+
+def _flush_pending_writes():
+    """Lambda freezes the container after the handler returns, buffered writes and logs must be stored before.
+    Logs are always flushed, BATCH_FLUSH_ON_RETURN only applies to the write buffers.
+    """
+
+    if batching.FLUSH_ON_RETURN:
+        batching.flush_all()
+
+    flush_logs()
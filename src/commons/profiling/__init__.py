@@ -0,0 +1,3 @@
+"""Export resources."""
+
+from .profiling import SamplingProfiler, profile, profile_id_of, requested_mode, store
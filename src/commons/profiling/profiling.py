@@ -0,0 +1,207 @@
+"""On demand request profiling.
+
+With PROFILING_ENABLED=true, requests with the `x-profile` header sent by one of the users in PROFILING_USERS
+(comma separated `x-user-id` values) are profiled with cProfile (`x-profile: cprofile`, pstats output) or the
+sampling profiler (`x-profile: sampling`, collapsed stacks output for flame graphs). The profile is stored in
+PROFILING_STORE by trace id, `file:///tmp/profiles` by default or `s3://bucket/prefix` (PROFILING_S3_ENDPOINT for
+S3 compatible stores), and its key is returned on the `X-Profile-Key` response header. Trace ids come from the
+client `Trace-Id` header, the ones that aren't safe file names or keys are replaced by a generated id.
+"""
+
+import cProfile
+import io
+import marshal
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Any, AnyStr, Callable, Mapping, NoReturn, Optional, Tuple
+from urllib.parse import urlparse
+
+from src.commons.logging import logger
+
+PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', 'false') == 'true'
+PROFILING_USERS = {user.strip() for user in os.getenv('PROFILING_USERS', '').split(',') if user.strip()}
+PROFILING_STORE = os.getenv('PROFILING_STORE', 'file:///tmp/profiles')
+PROFILING_S3_ENDPOINT = os.getenv('PROFILING_S3_ENDPOINT', None)
+PROFILING_SAMPLE_INTERVAL = float(os.getenv('PROFILING_SAMPLE_INTERVAL', '0.005'))
+
+CPROFILE = 'cprofile'
+SAMPLING = 'sampling'
+
+SAFE_PROFILE_ID = re.compile(r'^[A-Za-z0-9-]{1,64}$')
+
+
+class SamplingProfiler:
+    """Low overhead profiler that samples the stack of a thread from a background thread.
+
+    :param interval: Seconds between samples
+    :param thread_id: Profiled thread, the current one by default
+    """
+
+    def __init__(self, interval: float = 0.005, thread_id: Optional[int] = None):
+        self.interval = interval
+        self.thread_id = thread_id or threading.get_ident()
+        self.samples = Counter()
+
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> NoReturn:
+        """Start sampling."""
+
+        self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> NoReturn:
+        """Stop sampling."""
+
+        self._stop.set()
+        self._thread.join()
+
+    def collapsed(self) -> AnyStr:
+        """Render the samples as collapsed stacks (`frame;frame;frame count` lines).
+
+        :return AnyStr: Collapsed stacks
+        """
+
+        return ''.join(f'{stack} {count}\n' for stack, count in self.samples.most_common())
+
+    def _run(self) -> NoReturn:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id, None)  # pylint: disable=protected-access
+
+            if frame is None:
+                continue
+
+            stack = []
+
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+                frame = frame.f_back
+
+            self.samples[';'.join(reversed(stack))] += 1
+
+
+def requested_mode(headers: Mapping[AnyStr, Any]) -> Optional[AnyStr]:
+    """Get the profiling mode requested by an allowed user.
+
+    :param headers: Request headers
+    :return Optional[AnyStr]: cprofile, sampling or None when the request must not be profiled
+    """
+
+    if not PROFILING_ENABLED:
+        return None
+
+    mode = (headers.get('x-profile', None) or '').strip().lower()
+
+    if not mode or headers.get('x-user-id', None) not in PROFILING_USERS:
+        return None
+
+    return SAMPLING if mode == SAMPLING else CPROFILE
+
+
+def profile(mode: AnyStr, trace_id: AnyStr, function: Callable, *args, **kwargs) -> Any:
+    """Run a function under the profiler and store the profile.
+
+    :param mode: cprofile or sampling
+    :param trace_id: Request trace id used as profile key
+    :param function: Profiled function
+    :return Any: Function result, http responses get the X-Profile-Key header
+    """
+
+    start = time.perf_counter()
+    profile_id = profile_id_of(trace_id)
+
+    if mode == SAMPLING:
+        profiler = SamplingProfiler(PROFILING_SAMPLE_INTERVAL)
+        profiler.start()
+
+        try:
+            result = function(*args, **kwargs)
+        finally:
+            profiler.stop()
+
+        name, data = f'{profile_id}.collapsed', profiler.collapsed().encode('utf-8')
+    else:
+        profiler = cProfile.Profile()
+
+        try:
+            result = profiler.runcall(function, *args, **kwargs)
+        finally:
+            profiler.create_stats()
+
+        name, data = f'{profile_id}.pstats', marshal.dumps(profiler.stats)
+
+    elapsed = time.perf_counter() - start
+
+    try:
+        key = store(name, data)
+    except Exception as err:
+        logger.field('profile', name).err(err).error('profile could not be stored')
+        return result
+
+    logger.fields({'profile': key, 'mode': mode, 'seconds': round(elapsed, 3)}).info('request profiled')
+
+    if isinstance(result, dict) and isinstance(result.get('headers', None), dict):
+        result['headers']['X-Profile-Key'] = key
+
+    return result
+
+
+def profile_id_of(trace_id: Optional[AnyStr]) -> AnyStr:
+    """Get the profile file name and key stem of a trace id.
+
+    :param trace_id: Request trace id
+    :return AnyStr: The trace id if it only has letters, digits and dashes, otherwise a generated id
+    """
+
+    if trace_id and SAFE_PROFILE_ID.match(trace_id):
+        return trace_id
+
+    return str(uuid.uuid4())
+
+
+def store(name: AnyStr, data: bytes) -> AnyStr:
+    """Write a profile to the configured store.
+
+    :param name: Profile file name
+    :param data: Profile content
+    :return AnyStr: Stored profile location
+    """
+
+    if os.path.basename(name) != name or name.startswith('.'):
+        raise ValueError(f'invalid profile name: {name}')
+
+    location = urlparse(PROFILING_STORE)
+
+    if location.scheme == 's3':
+        bucket, key = _s3_location(location, name)
+        _s3_client().upload_fileobj(io.BytesIO(data), bucket, key)
+        return f's3://{bucket}/{key}'
+
+    directory = location.path or PROFILING_STORE
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, name)
+
+    with open(path, 'wb') as file:
+        file.write(data)
+
+    return path
+
+
+def _s3_location(location: Any, name: AnyStr) -> Tuple[AnyStr, AnyStr]:
+    prefix = location.path.strip('/')
+    return location.netloc, f'{prefix}/{name}' if prefix else name
+
+
+def _s3_client() -> Any:
+    """S3 client, boto3 is provided by the Lambda runtime so it is only imported when profiles go to S3."""
+
+    import boto3  # pylint: disable=import-outside-toplevel
+
+    return boto3.client('s3', endpoint_url=PROFILING_S3_ENDPOINT)
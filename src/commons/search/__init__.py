@@ -0,0 +1,3 @@
+"""Export resources."""
+
+from .search import InvertedIndex, build_index, tokenize
@@ -0,0 +1,249 @@
+"""Local inverted index with BM25 ranking.
+
+Index file layout (little endian):
+
+    header      magic(4s) version(I) doc_count(I) term_count(I) avg_doc_len(d)
+    doc ids     doc_count * q
+    doc lengths doc_count * I
+    term table  term_count * (term_offset(I) term_len(I) postings_offset(Q) doc_freq(I)), sorted by term
+    terms       utf-8 term bytes referenced by the term table
+    postings    doc_freq * (doc_index(I) term_freq(I)) per term
+
+Every section is fixed width so the reader answers queries straight from the memory-mapped file, terms are
+found with a binary search over the term table and nothing is parsed at startup.
+"""
+
+import heapq
+import math
+import mmap
+import os
+import re
+import struct
+import unicodedata
+from collections import Counter, defaultdict
+from typing import Any, AnyStr, Dict, Iterable, List, Optional, Tuple
+
+MAGIC = b'HSIX'
+VERSION = 1
+
+_HEADER = struct.Struct('<4sIIId')
+_TERM_ENTRY = struct.Struct('<IIQI')
+_POSTING = struct.Struct('<II')
+
+_TOKEN_RE = re.compile(r'\w+')
+
+STOP_WORDS = frozenset(
+    {
+        'a', 'al', 'and', 'con', 'de', 'del', 'el', 'en', 'es', 'la', 'las', 'los', 'of', 'or', 'para', 'por', 'the',
+        'un', 'una', 'y'
+    }
+)
+
+# BM25 tuning parameters
+K1 = 1.2
+B = 0.75
+
+
+def tokenize(text: Optional[AnyStr]) -> List[AnyStr]:
+    """Split a text into normalized search tokens (lower case, no accents, no stop words).
+
+    :param text: Text to tokenize
+    :return List[AnyStr]: Tokens
+    """
+
+    if not text:
+        return []
+
+    text = unicodedata.normalize('NFKD', str(text).lower())
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+
+    return [token for token in _TOKEN_RE.findall(text) if len(token) > 1 and token not in STOP_WORDS]
+
+
+def build_index(documents: Iterable[Tuple[int, AnyStr]], path: AnyStr) -> int:
+    """Build an index file from (doc_id, text) tuples. The file is written next to the destination
+    and renamed at the end so readers never see a partial index.
+
+    :param documents: Iterable of (doc_id, text) tuples
+    :param path: Destination file path
+    :return int: Number of indexed documents
+    """
+
+    doc_ids = []
+    doc_lens = []
+    postings = defaultdict(list)
+
+    for doc_id, text in documents:
+        tokens = tokenize(text)
+        doc_index = len(doc_ids)
+
+        doc_ids.append(int(doc_id))
+        doc_lens.append(len(tokens))
+
+        for term, freq in Counter(tokens).items():
+            postings[term].append((doc_index, freq))
+
+    _write_index(path, doc_ids, doc_lens, postings)
+
+    return len(doc_ids)
+
+
+def _write_index(path: AnyStr, doc_ids: List[int], doc_lens: List[int], postings: Dict[AnyStr, List]):
+    """Serialize index sections into the given path.
+
+    :param path: Destination file path
+    :param doc_ids: Document ids by doc index
+    :param doc_lens: Document lengths (tokens) by doc index
+    :param postings: Postings list by term
+    """
+
+    terms = sorted(postings.keys(), key=lambda item: item.encode('utf-8'))
+    avg_len = sum(doc_lens) / len(doc_lens) if doc_lens else 0.0
+
+    term_blob = bytearray()
+    term_table = bytearray()
+    posting_blob = bytearray()
+
+    for term in terms:
+        encoded = term.encode('utf-8')
+        term_table += _TERM_ENTRY.pack(len(term_blob), len(encoded), len(posting_blob), len(postings[term]))
+        term_blob += encoded
+
+        for doc_index, freq in postings[term]:
+            posting_blob += _POSTING.pack(doc_index, freq)
+
+    tmp_path = f'{path}.tmp'
+
+    with open(tmp_path, 'wb') as file:
+        file.write(_HEADER.pack(MAGIC, VERSION, len(doc_ids), len(terms), avg_len))
+        file.write(struct.pack(f'<{len(doc_ids)}q', *doc_ids))
+        file.write(struct.pack(f'<{len(doc_lens)}I', *doc_lens))
+        file.write(term_table)
+        file.write(term_blob)
+        file.write(posting_blob)
+
+    os.replace(tmp_path, path)
+
+
+class InvertedIndex:
+    """Read only inverted index backed by a memory-mapped file.
+
+    :param path: Index file path
+    """
+
+    def __init__(self, path: AnyStr):
+        with open(path, 'rb') as file:
+            self._buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.doc_count, self.term_count, self.avg_doc_len = _HEADER.unpack_from(self._buffer, 0)
+
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f'invalid search index file: {path}')
+
+        self._ids_offset = _HEADER.size
+        self._lens_offset = self._ids_offset + self.doc_count * 8
+        self._terms_table_offset = self._lens_offset + self.doc_count * 4
+        self._terms_offset = self._terms_table_offset + self.term_count * _TERM_ENTRY.size
+        self._postings_offset = self._terms_offset + self._terms_blob_size()
+
+        # Typed zero-copy views over the mapped sections (the file is written little endian)
+        self._view = memoryview(self._buffer)
+        self._doc_ids = self._view[self._ids_offset:self._lens_offset].cast('q')
+        self._doc_lens = self._view[self._lens_offset:self._terms_table_offset].cast('I')
+
+    def search(self, query: AnyStr, limit: Optional[int] = None) -> List[Tuple[int, float]]:
+        """Search documents matching any of the query terms ranked by BM25.
+
+        :param query: Free text query
+        :param limit: Max number of results
+        :return List[Tuple[int, float]]: List of (doc_id, score) sorted by score
+        """
+
+        scores = defaultdict(float)
+
+        for term in set(tokenize(query)):
+            entry = self._find_term(term.encode('utf-8'))
+
+            if entry is not None:
+                self._score_term(entry, scores)
+
+        if limit is not None:
+            ranked = heapq.nsmallest(limit, scores.items(), key=lambda item: (-item[1], item[0]))
+        else:
+            ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+
+        return [(self._doc_ids[doc_index], score) for doc_index, score in ranked]
+
+    def close(self):
+        """Release the memory map."""
+
+        self._doc_ids.release()
+        self._doc_lens.release()
+        self._view.release()
+        self._buffer.close()
+
+    def _score_term(self, entry: Tuple[int, int, int, int], scores: Dict[int, float]):
+        """Add the BM25 contribution of a term to the documents scores.
+
+        :param entry: Term table entry
+        :param scores: Accumulated scores by doc index
+        """
+
+        _, _, postings_offset, doc_freq = entry
+        idf = math.log(1 + (self.doc_count - doc_freq + 0.5) / (doc_freq + 0.5))
+        offset = self._postings_offset + postings_offset
+        postings = self._view[offset:offset + doc_freq * _POSTING.size].cast('I')
+
+        weight = idf * (K1 + 1)
+        norm_base = K1 * (1 - B)
+        norm_scale = K1 * B / (self.avg_doc_len or 1)
+        doc_lens = self._doc_lens
+
+        for doc_index, freq in zip(postings[0::2], postings[1::2]):
+            scores[doc_index] += weight * freq / (freq + norm_base + norm_scale * doc_lens[doc_index])
+
+        postings.release()
+
+    def _find_term(self, term: bytes) -> Optional[Tuple[int, int, int, int]]:
+        """Binary search a term over the sorted term table.
+
+        :param term: Encoded term
+        :return Optional[Tuple]: Term table entry
+        """
+
+        low, high = 0, self.term_count - 1
+
+        while low <= high:
+            middle = (low + high) // 2
+            entry = self._term_entry(middle)
+            current = self._term_bytes(entry)
+
+            if current == term:
+                return entry
+
+            if current < term:
+                low = middle + 1
+            else:
+                high = middle - 1
+
+        return None
+
+    def _term_entry(self, position: int) -> Tuple[int, int, int, int]:
+        return _TERM_ENTRY.unpack_from(self._buffer, self._terms_table_offset + position * _TERM_ENTRY.size)
+
+    def _term_bytes(self, entry: Tuple[int, int, int, int]) -> bytes:
+        start = self._terms_offset + entry[0]
+        return bytes(self._buffer[start:start + entry[1]])
+
+    def _terms_blob_size(self) -> int:
+        if not self.term_count:
+            return 0
+
+        offset, length, _, _ = self._term_entry(self.term_count - 1)
+        return offset + length
+
+    def __enter__(self) -> Any:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
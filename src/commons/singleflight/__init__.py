@@ -0,0 +1,3 @@
+"""Export resources."""
+
+from .singleflight import SingleFlight
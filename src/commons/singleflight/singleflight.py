@@ -0,0 +1,103 @@
+"""Request coalescing.
+
+Concurrent calls with the same key inside one process share a single execution: the first caller runs the
+function and the rest wait for its result or error. Waiters give up after `timeout` seconds, or when the request
+deadline is reached if it comes first, and run the function by themselves, so a stuck call doesn't hold every
+request with the same key. Waiters that ran out of request time raise a DeadlineExceededError instead. A leader
+that ran out of its own request time (queries interrupted by MAX_EXECUTION_TIME included) doesn't fail the
+waiters, they run the function under their own deadline.
+
+Metrics: `singleflight.<name>.executed`, `singleflight.<name>.coalesced`, `singleflight.<name>.timeouts` and
+`singleflight.<name>.retries`.
+"""
+
+import threading
+from typing import Any, AnyStr, Callable, Dict, Hashable
+
+from src.commons import deadline, metrics
+from src.commons.errors import DeadlineExceededError
+
+
+class _Call:
+    """In flight call shared by the callers of the same key."""
+
+    __slots__ = ('done', 'result', 'error', 'waiters')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesce concurrent calls with the same key.
+
+    :param name: Name used on metrics
+    :param timeout: Max seconds a caller waits for an in flight call
+    """
+
+    def __init__(self, name: AnyStr, timeout: float = 5.0):
+        self.name = name
+        self.timeout = timeout
+
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, function: Callable[[], Any]) -> Any:
+        """Run the function or wait for the in flight call with the same key.
+
+        :param key: Call key, calls with equal keys must return the same result
+        :param function: Function to execute
+        :return Any: Function result, shared by every coalesced caller
+        :raise DeadlineExceededError: If the request deadline is reached
+        :raise Exception: The error raised by the function
+        """
+
+        with self._lock:
+            call = self._calls.get(key, None)
+            leader = call is None
+
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.waiters += 1
+
+        if leader:
+            return self._execute(key, call, function)
+
+        operation = f'{self.name} coalesced call'
+
+        if not call.done.wait(deadline.timeout(operation, self.timeout)):
+            metrics.incr(f'singleflight.{self.name}.timeouts')
+            deadline.timeout(operation)
+            return function()
+
+        metrics.incr(f'singleflight.{self.name}.coalesced')
+
+        # The leader deadline is not the waiter's one
+        if isinstance(call.error, DeadlineExceededError):
+            metrics.incr(f'singleflight.{self.name}.retries')
+            deadline.timeout(operation)
+            return function()
+
+        if call.error is not None:
+            raise call.error
+
+        return call.result
+
+    def _execute(self, key: Hashable, call: _Call, function: Callable[[], Any]) -> Any:
+        metrics.incr(f'singleflight.{self.name}.executed')
+
+        try:
+            call.result = function()
+        except Exception as err:
+            call.error = err
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+            call.done.set()
+
+        return call.result
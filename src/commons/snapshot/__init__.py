@@ -0,0 +1,3 @@
+"""Export resources."""
+
+from .snapshot import COLUMNS, NULL_INT, CatalogSnapshot, build_snapshot
@@ -0,0 +1,347 @@
+"""Memory-mapped property catalog snapshot.
+
+Snapshot file layout (little endian, every section starts 8 bytes aligned):
+
+    header          magic(4s) version(I) row_count(I) string_count(I) city_count(I) built_at(d) padding(4x)
+    columns         row_count values per column of COLUMNS, in that order
+    id index        row_count * q ids sorted ascending followed by row_count * I rows of those ids
+    city directory  city_count * (string_id(I) start_row(I) end_row(I) padding(4x)), sorted by city
+    string table    string_count * (offset(Q) length(I) padding(4x))
+    strings         utf-8 bytes referenced by the string table
+
+Rows are sorted by (city, year, price, id) so a city is a contiguous range of rows in which years are ordered,
+like the leftmost columns of idx_property_city_year_price. Strings are deduplicated in the string table and
+referenced by id, null values are stored as NULL_INT, NaN or NULL_STRING.
+
+Every section is fixed width, the reader computes the offsets from the header and answers from typed views over
+the memory-mapped file, so nothing is parsed at startup and every process on a host shares the page cache copy.
+"""
+
+import bisect
+import math
+import mmap
+import os
+import struct
+import time
+from typing import (
+    Any,
+    AnyStr,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+MAGIC = b'HSNP'
+VERSION = 1
+
+NULL_INT = -2**63
+NULL_STRING = 2**32 - 1
+
+# Column name and memoryview format: q int64, d float64, I string id, B uint8
+COLUMNS = (
+    ('id', 'q'),
+    ('address', 'I'),
+    ('city', 'I'),
+    ('price', 'q'),
+    ('description', 'I'),
+    ('year', 'q'),
+    ('latitude', 'd'),
+    ('longitude', 'd'),
+    ('status_id', 'B'),
+)
+
+_POSITIONS = {name: position for position, (name, _) in enumerate(COLUMNS)}
+
+_HEADER = struct.Struct('<4sIIIId4x')
+_CITY_ENTRY = struct.Struct('<III4x')
+_STRING_ENTRY = struct.Struct('<QI4x')
+
+_WIDTHS = {'q': 8, 'd': 8, 'I': 4, 'B': 1}
+_NULLS = {'q': NULL_INT, 'd': math.nan, 'I': NULL_STRING, 'B': 0}
+
+
+def _aligned(size: int) -> int:
+    return (size + 7) // 8 * 8
+
+
+def build_snapshot(records: Iterable[Dict[AnyStr, Any]], path: AnyStr) -> int:
+    """Build a snapshot file from catalog records. The file is written next to the destination and renamed at the
+    end, processes that already mapped the previous snapshot keep reading it.
+
+    :param records: Dicts with the COLUMNS keys
+    :param path: Destination file path
+    :return int: Number of rows
+    """
+
+    strings = {}
+
+    def string_id(value: Optional[AnyStr]) -> int:
+        if value is None:
+            return NULL_STRING
+
+        return strings.setdefault(value, len(strings))
+
+    rows = []
+
+    for record in records:
+        rows.append(
+            tuple(
+                string_id(record.get(name, None)) if kind == 'I' else _or_null(record.get(name, None), kind)
+                for name, kind in COLUMNS
+            )
+        )
+
+    names = sorted(strings, key=lambda item: item.encode('utf-8'))
+    ranks = {strings[name]: rank for rank, name in enumerate(names)}
+    city, year, price, item_id = (_POSITIONS[name] for name in ('city', 'year', 'price', 'id'))
+
+    # (city, year, price, id) order, rows without city go last
+    rows.sort(key=lambda row: (ranks.get(row[city], len(ranks)), row[year], row[price], row[item_id]))
+
+    _write_snapshot(path, rows, strings)
+
+    return len(rows)
+
+
+def _or_null(value: Any, kind: AnyStr) -> Any:
+    if value is None:
+        return _NULLS[kind]
+
+    return float(value) if kind == 'd' else int(value)
+
+
+def _write_snapshot(path: AnyStr, rows: List[Tuple], strings: Dict[AnyStr, int]):
+    """Serialize the snapshot sections into the given path.
+
+    :param path: Destination file path
+    :param rows: Rows with the COLUMNS values sorted by city
+    :param strings: String ids by string
+    """
+
+    city_position = _POSITIONS['city']
+    cities = []
+
+    for row_index, row in enumerate(rows):
+        if row[city_position] == NULL_STRING:
+            continue
+
+        if cities and cities[-1][0] == row[city_position]:
+            cities[-1][2] = row_index + 1
+        else:
+            cities.append([row[city_position], row_index, row_index + 1])
+
+    string_blob = bytearray()
+    string_table = bytearray()
+
+    for value, _ in sorted(strings.items(), key=lambda item: item[1]):
+        encoded = value.encode('utf-8')
+        string_table += _STRING_ENTRY.pack(len(string_blob), len(encoded))
+        string_blob += encoded
+
+    id_order = sorted(range(len(rows)), key=lambda row_index: rows[row_index][0])
+
+    tmp_path = f'{path}.tmp'
+
+    with open(tmp_path, 'wb') as file:
+        file.write(_HEADER.pack(MAGIC, VERSION, len(rows), len(strings), len(cities), time.time()))
+
+        for position, (_, kind) in enumerate(COLUMNS):
+            _write_aligned(file, struct.pack(f'<{len(rows)}{kind}', *(row[position] for row in rows)))
+
+        file.write(struct.pack(f'<{len(rows)}q', *(rows[row_index][0] for row_index in id_order)))
+        _write_aligned(file, struct.pack(f'<{len(rows)}I', *id_order))
+
+        for city in cities:
+            file.write(_CITY_ENTRY.pack(*city))
+
+        file.write(string_table)
+        file.write(string_blob)
+
+    os.replace(tmp_path, path)
+
+
+def _write_aligned(file: Any, data: bytes):
+    file.write(data)
+    file.write(b'\0' * (_aligned(len(data)) - len(data)))
+
+
+class CatalogSnapshot:
+    """Read only catalog snapshot backed by a memory-mapped file.
+
+    :param path: Snapshot file path
+    """
+
+    def __init__(self, path: AnyStr):
+        with open(path, 'rb') as file:
+            self._buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.row_count, self.string_count, self.city_count, self.built_at = _HEADER.unpack_from(
+            self._buffer, 0
+        )
+
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f'invalid catalog snapshot file: {path}')
+
+        # Typed zero-copy views over the mapped sections
+        self._view = memoryview(self._buffer)
+        self._columns = {}
+
+        offset = _HEADER.size
+
+        for name, kind in COLUMNS:
+            size = self.row_count * _WIDTHS[kind]
+            self._columns[name] = self._view[offset:offset + size].cast(kind)
+            offset += _aligned(size)
+
+        self._sorted_ids = self._view[offset:offset + self.row_count * 8].cast('q')
+        offset += self.row_count * 8
+        self._id_rows = self._view[offset:offset + self.row_count * 4].cast('I')
+        offset += _aligned(self.row_count * 4)
+
+        self._cities_offset = offset
+        self._strings_table_offset = self._cities_offset + self.city_count * _CITY_ENTRY.size
+        self._strings_offset = self._strings_table_offset + self.string_count * _STRING_ENTRY.size
+
+    def column(self, name: AnyStr) -> memoryview:
+        """Typed view over a column, string columns hold string ids.
+
+        :param name: Column name
+        :return memoryview: Column values by row
+        """
+
+        return self._columns[name]
+
+    def value(self, name: AnyStr, row: int) -> Any:
+        """Decoded value of a cell, None for null values.
+
+        :param name: Column name
+        :param row: Row number
+        :return Any: Cell value
+        """
+
+        value = self._columns[name][row]
+        kind = self._columns[name].format
+
+        if kind == 'I':
+            return self.string(value)
+
+        if value == _NULLS[kind] or (kind == 'd' and math.isnan(value)):
+            return None
+
+        return value
+
+    def string(self, string_id: int) -> Optional[AnyStr]:
+        """Decode a string of the string table.
+
+        :param string_id: String id
+        :return Optional[AnyStr]: String value, None for NULL_STRING
+        """
+
+        if string_id == NULL_STRING:
+            return None
+
+        offset, length = _STRING_ENTRY.unpack_from(
+            self._buffer, self._strings_table_offset + string_id * _STRING_ENTRY.size
+        )
+        start = self._strings_offset + offset
+
+        return self._buffer[start:start + length].decode('utf-8')
+
+    def city_ranges(self, cities: Optional[Sequence[AnyStr]] = None) -> List[Tuple[int, int]]:
+        """Row ranges of the given cities, every city when it is not set (rows without city included).
+
+        :param cities: City names
+        :return List[Tuple[int, int]]: (start_row, end_row) ranges
+        """
+
+        if cities is None:
+            ranges = [self._city_entry(index)[1:] for index in range(self.city_count)]
+            last = ranges[-1][1] if ranges else 0
+
+            return ranges + ([(last, self.row_count)] if last < self.row_count else [])
+
+        ranges = []
+
+        for city in cities:
+            index = self._find_city(city.encode('utf-8'))
+
+            if index is not None:
+                ranges.append(self._city_entry(index)[1:])
+
+        return ranges
+
+    def city_id(self, city: AnyStr) -> Optional[int]:
+        """String id of a city.
+
+        :param city: City name
+        :return Optional[int]: String id or None if the city is not on the snapshot
+        """
+
+        index = self._find_city(city.encode('utf-8'))
+
+        return self._city_entry(index)[0] if index is not None else None
+
+    def find_row(self, item_id: int) -> Optional[int]:
+        """Row of an id.
+
+        :param item_id: Property id
+        :return Optional[int]: Row number or None if the id is not on the snapshot
+        """
+
+        index = bisect.bisect_left(self._sorted_ids, item_id)
+
+        if index < self.row_count and self._sorted_ids[index] == item_id:
+            return self._id_rows[index]
+
+        return None
+
+    def rows(self) -> Iterator[int]:
+        """Rows in id order."""
+
+        return iter(self._id_rows)
+
+    def close(self):
+        """Release the memory map."""
+
+        for view in self._columns.values():
+            view.release()
+
+        self._sorted_ids.release()
+        self._id_rows.release()
+        self._view.release()
+        self._buffer.close()
+
+    def _city_entry(self, index: int) -> Tuple[int, int, int]:
+        return _CITY_ENTRY.unpack_from(self._buffer, self._cities_offset + index * _CITY_ENTRY.size)
+
+    def _find_city(self, city: bytes) -> Optional[int]:
+        """Binary search over the city directory.
+
+        :param city: utf-8 encoded city
+        :return Optional[int]: Directory index or None if the city is not on the snapshot
+        """
+
+        low, high = 0, self.city_count
+
+        while low < high:
+            middle = (low + high) // 2
+            string_id = self._city_entry(middle)[0]
+            offset, length = _STRING_ENTRY.unpack_from(
+                self._buffer, self._strings_table_offset + string_id * _STRING_ENTRY.size
+            )
+            start = self._strings_offset + offset
+            current = self._buffer[start:start + length]
+
+            if current == city:
+                return middle
+
+            if current < city:
+                low = middle + 1
+            else:
+                high = middle
+
+        return None
@@ -1,3 +1,3 @@
 """Export resources."""
 
-from .utils import call_service, short_id, validate_json_schema
+from .utils import call_service, compile_json_schema, short_id, validate_json_schema
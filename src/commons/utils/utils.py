@@ -2,15 +2,21 @@
 
 import os
 from base64 import urlsafe_b64encode
-from typing import Any, AnyStr, Dict, NoReturn, Tuple
+from typing import Any, AnyStr, Callable, Dict, NoReturn, Tuple
 
 import fastjsonschema
 import requests
 
-from src.commons import context
+from src.commons import context, deadline
 from src.commons.errors import HandlerError, SchemaError
 from src.commons.logging import logger
 
+# Max seconds of an outbound call, lower when the request deadline is closer
+CALL_SERVICE_TIMEOUT = float(os.getenv('CALL_SERVICE_TIMEOUT', '10'))
+
+# Compiled validators by schema identity, schemas are module level constants so they are compiled once
+_VALIDATORS = {}
+
 
 def short_id(length: int = 6) -> AnyStr:
     """Generate and return a short ID of N chars between 6 and 50.
@@ -34,13 +40,37 @@ def validate_json_schema(data: Dict[AnyStr, Any], schema: Dict[AnyStr, Any]) ->
     :raise SchemaError: On validation error
     """
 
+    validate = compile_json_schema(schema)
+
     try:
-        validate = fastjsonschema.compile(schema)
         return validate(data)
     except Exception as err:
         raise SchemaError(err) from err
 
 
+def compile_json_schema(schema: Dict[AnyStr, Any]) -> Callable[[Dict[AnyStr, Any]], Dict[AnyStr, Any]]:
+    """Return the compiled validation function of a JSON schema, compiling it only on the first call.
+
+    :param schema: JSON schema definition
+    :return Callable: Validation function
+    :raise SchemaError: If the schema definition is invalid
+    """
+
+    cached = _VALIDATORS.get(id(schema), None)
+
+    if cached is not None and cached[0] is schema:
+        return cached[1]
+
+    try:
+        validate = fastjsonschema.compile(schema)
+    except Exception as err:
+        raise SchemaError(err) from err
+
+    _VALIDATORS[id(schema)] = (schema, validate)
+
+    return validate
+
+
 def call_service(
     method: AnyStr,
     resource: AnyStr,
@@ -58,13 +88,20 @@ def call_service(
     :param service_name: Name of the service that will be called
     :return Tuple: Status code and json response
     :raise HandlerError: On status code is not 200, 201 or 202
+    :raise DeadlineExceededError: If the call times out
     """
 
+    operation = f'call service {service_name}'
     options = _build_request_options(method, resource, headers, json, params)
+    options['timeout'] = deadline.timeout(operation, CALL_SERVICE_TIMEOUT)
 
     logger.field('service', service_name).fields(options, ).debug('calling service')
 
-    res = _execute_request(method, options)
+    try:
+        res = _execute_request(method, options)
+    except requests.exceptions.Timeout as err:
+        logger.field('service', service_name).err(err).error('service call timeout')
+        raise deadline.exceeded(operation) from err
 
     try:
         json_res = res.json()
@@ -0,0 +1,3 @@
+"""Export resources."""
+
+from .warmup import WARMUP_ON_INIT, is_warmup, on_init, record_invocation, register, run
@@ -0,0 +1,107 @@
+"""Container warm-up.
+
+Adapters register warmers that open database connections, load indexes and fill caches. They run on warm-up
+invocations (`{"warmup": true}` scheduled events or the serverless-plugin-warmup source), which
+`request.validate` answers without running the handler, and during the Lambda init phase when
+WARMUP_ON_INIT=true, which also covers provisioned concurrency.
+
+Every request is counted as `invocations.cold` (first one of a container that was not warmed up),
+`invocations.warmed` (first one after a warm-up) or `invocations.warm`, warm-ups as `invocations.warmup`.
+"""
+
+# pylint: disable=global-statement
+
+import os
+import threading
+import time
+from typing import Any, AnyStr, Callable, Dict, NoReturn
+
+from src.commons import metrics
+from src.commons.logging import logger
+
+WARMUP_ON_INIT = os.getenv('WARMUP_ON_INIT', 'false') == 'true'
+WARMUP_SOURCE = 'serverless-plugin-warmup'
+
+_WARMERS = []
+_WARMED = False
+_INVOCATIONS = 0
+_LOCK = threading.Lock()
+
+
+def register(warmer: Callable[[], Any]) -> Callable[[], Any]:
+    """Register a warmer, it can be used as decorator.
+
+    :param warmer: Function that prepares a resource
+    :return Callable[[], Any]: The same warmer
+    """
+
+    if warmer not in _WARMERS:
+        _WARMERS.append(warmer)
+
+    return warmer
+
+
+def is_warmup(event: Any) -> bool:
+    """Check if an event is a warm-up invocation.
+
+    :param event: Lambda event
+    :return bool: True for warm-up events
+    """
+
+    return isinstance(event, dict) and (event.get('warmup', None) is True or event.get('source', None) == WARMUP_SOURCE)
+
+
+def run() -> Dict[AnyStr, Any]:
+    """Execute every registered warmer, failing warmers are logged and skipped.
+
+    :return Dict[AnyStr, Any]: Warm-up summary
+    """
+
+    global _WARMED
+
+    start = time.perf_counter()
+    failed = 0
+
+    for warmer in list(_WARMERS):
+        try:
+            warmer()
+        except Exception as err:
+            failed += 1
+            logger.field('warmer', getattr(warmer, '__qualname__', repr(warmer))).err(err).warning('warmer failed')
+
+    _WARMED = True
+    metrics.incr('invocations.warmup')
+
+    summary = {
+        'warmup': True,
+        'warmers': len(_WARMERS),
+        'failed': failed,
+        'duration_ms': round((time.perf_counter() - start) * 1000, 3),
+    }
+    logger.fields(summary).info('container warmed up')
+
+    return summary
+
+
+def on_init() -> NoReturn:
+    """Warm up the container while the route module is imported if WARMUP_ON_INIT is enabled."""
+
+    if WARMUP_ON_INIT and not _WARMED:
+        run()
+
+
+def record_invocation() -> AnyStr:
+    """Count a request invocation by container state.
+
+    :return AnyStr: cold, warmed or warm
+    """
+
+    global _INVOCATIONS
+
+    with _LOCK:
+        kind = 'warm' if _INVOCATIONS else ('warmed' if _WARMED else 'cold')
+        _INVOCATIONS += 1
+
+    metrics.incr(f'invocations.{kind}')
+
+    return kind
@@ -0,0 +1,36 @@
+"""Property changes feed handler methods."""
+
+from typing import Any, AnyStr, Dict
+
+from src.adapters import changes
+from src.commons import context
+from src.helpers import changes as helpers
+from src.models.types import PropertyStatus
+
+
+def find() -> Dict[AnyStr, Any]:
+    """Page of properties whose status changed after the since cursor."""
+
+    query_params = context.get_value('request').get('query_params', {})
+
+    since = helpers.decode_cursor(query_params.get('since', None))
+    limit = helpers.transform_limit_from_params(query_params.get('limit', None))
+
+    rows, has_more = changes.find_changes(since, limit)
+
+    if rows:
+        cursor = helpers.encode_cursor(rows[-1][0])
+    else:
+        cursor = query_params.get('since', None)
+
+    return {
+        'changes': [
+            {
+                'property': item.to_dict(),
+                'status': PropertyStatus(status_id).name,
+                'changed_at': update_date.isoformat(),
+            } for _, status_id, update_date, item in helpers.latest_changes(rows)
+        ],
+        'cursor': cursor,
+        'has_more': has_more,
+    }
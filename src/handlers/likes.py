@@ -0,0 +1,41 @@
+"""Likes handler methods."""
+
+from typing import Any, AnyStr, Dict
+
+from src.adapters import likes
+from src.commons import context
+from src.commons.errors import UnauthorizedError
+from src.helpers import properties as helpers
+
+
+def like() -> Dict[AnyStr, Any]:
+    """Like a property."""
+
+    user_id, property_id = _get_like_params()
+    return likes.like_property(user_id, property_id)
+
+
+def unlike() -> Dict[AnyStr, Any]:
+    """Remove a property like."""
+
+    user_id, property_id = _get_like_params()
+    return likes.unlike_property(user_id, property_id)
+
+
+def _get_like_params():
+    """Get the requesting user id and the property id from the request.
+
+    :return Tuple[int, int]: (user_id, property_id)
+    :raise UnauthorizedError: If the x-user-id header is missing
+    """
+
+    request = context.get_value('request')
+    user_id = request.get('headers', {}).get('x-user-id', None)
+
+    if not user_id:
+        raise UnauthorizedError(root_causes=[{'message': 'missing x-user-id header'}])
+
+    user_id = helpers.transform_int_from_params('x-user-id', user_id)
+    property_id = helpers.transform_int_from_params('id', request.get('path_params', {}).get('id', None))
+
+    return user_id, property_id
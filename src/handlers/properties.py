@@ -3,22 +3,53 @@
 from typing import Any, AnyStr, Dict
 
 from src.adapters import properties
-from src.commons import context
+from src.commons import context, masking
 from src.helpers import properties as helpers
+from src.models import Property, PropertyFilters
+
+
+def setup():
+    """Register the property fields as a safe masking shape, the listing rows are logged without key lookups."""
+
+    masking.register_safe_shape(vars(Property()))
 
 
 def find() -> Dict[AnyStr, Any]:
     """Filter properties."""
 
     query_params = context.get_value('request').get('query_params', {})
-    status_ids = query_params.get('status', None)
-    city = query_params.get('city', None)
-    year = query_params.get('year', None)
-
-    if year is not None:
-        year = int(year)
-
-    status_ids = helpers.transform_status_from_params(status_ids)
-    filtered_properties = properties.filter_properties(status_ids, city, year)
 
-    return {'properties': [item.to_dict() for item in filtered_properties]}
+    lat, lon, radius = helpers.transform_location_from_params(
+        query_params.get('lat', None),
+        query_params.get('lon', None),
+        query_params.get('radius', None),
+    )
+
+    year, year_min, year_max = helpers.transform_year_from_params(
+        query_params.get('year', None),
+        query_params.get('year_min', None),
+        query_params.get('year_max', None),
+    )
+
+    filters = PropertyFilters(
+        statuses=helpers.transform_status_from_params(query_params.get('status', None)),
+        cities=helpers.transform_list_from_params(query_params.get('city', None)),
+        year=year,
+        year_min=year_min,
+        year_max=year_max,
+        price_min=helpers.transform_int_from_params('price_min', query_params.get('price_min', None)),
+        price_max=helpers.transform_int_from_params('price_max', query_params.get('price_max', None)),
+        sort=helpers.transform_sort_from_params(query_params.get('sort', None)),
+        q=helpers.transform_search_from_params(query_params.get('q', None)),
+        fields=helpers.transform_fields_from_params(query_params.get('fields', None)),
+        lat=lat,
+        lon=lon,
+        radius=radius,
+    )
+
+    filtered_properties = properties.filter_properties(filters)
+
+    if filters.fields is None:
+        return {'properties': [item.to_dict() for item in filtered_properties]}
+
+    return {'properties': [{field: getattr(item, field) for field in filters.fields} for item in filtered_properties]}
@@ -0,0 +1,42 @@
+"""Property stats handler methods."""
+
+from typing import Any, AnyStr, Dict
+
+from src.adapters import stats
+from src.commons import context
+from src.helpers import properties as helpers
+from src.helpers.stats import transform_group_by_from_params
+from src.models import PropertyFilters
+
+
+def find() -> Dict[AnyStr, Any]:
+    """Count properties grouped by city, year and current status."""
+
+    query_params = context.get_value('request').get('query_params', {})
+
+    year, year_min, year_max = helpers.transform_year_from_params(
+        query_params.get('year', None),
+        query_params.get('year_min', None),
+        query_params.get('year_max', None),
+    )
+
+    filters = PropertyFilters(
+        statuses=helpers.transform_status_from_params(query_params.get('status', None)),
+        cities=helpers.transform_list_from_params(query_params.get('city', None)),
+        year=year,
+        year_min=year_min,
+        year_max=year_max,
+    )
+
+    group_by = transform_group_by_from_params(query_params.get('group_by', None))
+
+    return stats.find_stats(group_by, filters)
+
+
+def refresh() -> Dict[AnyStr, Any]:
+    """Roll up pending status changes and city or year changes into the stats aggregates."""
+
+    return {
+        'rows': stats.refresh_stats(max_batches=stats.REFRESH_MAX_BATCHES),
+        'moved': stats.move_stats(max_batches=stats.REFRESH_MAX_BATCHES),
+    }
@@ -0,0 +1,8 @@
+"""Export resources."""
+
+from .changes import (
+    decode_cursor,
+    encode_cursor,
+    latest_changes,
+    transform_limit_from_params,
+)
@@ -0,0 +1,82 @@
+"""Property changes feed helper functions."""
+
+import base64
+import binascii
+from datetime import datetime
+from typing import Any, AnyStr, List, Optional, Tuple
+
+from src.commons.errors import BadRequestError
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def encode_cursor(history_id: int) -> AnyStr:
+    """Build the opaque cursor that points right after a status history row.
+
+    :param history_id: Status history id
+    :return AnyStr: URL safe cursor
+    """
+
+    return base64.urlsafe_b64encode(str(history_id).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: Optional[AnyStr] = None) -> Optional[int]:
+    """Decode the since query param. Cursors of the former `update_date|id` format are still accepted.
+
+    :param cursor: Value of the since query param
+    :return Optional[int]: Status history id or None to start from the first change
+    :raise BadRequestError: If the cursor is malformed
+    """
+
+    if not cursor:
+        return None
+
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        return int(raw.rsplit('|', 1)[-1])
+    except (binascii.Error, UnicodeDecodeError, ValueError) as err:
+        raise BadRequestError(root_causes=[{'param': 'since', 'message': 'invalid cursor'}]) from err
+
+
+def transform_limit_from_params(limit: Optional[AnyStr] = None) -> int:
+    """Cast the page size query param.
+
+    :param limit: Value of the limit query param
+    :return int: Page size, DEFAULT_PAGE_SIZE when it is missing
+    :raise BadRequestError: If the value is not an integer between 1 and MAX_PAGE_SIZE
+    """
+
+    if limit is None:
+        return DEFAULT_PAGE_SIZE
+
+    try:
+        value = int(limit)
+    except ValueError:
+        value = 0
+
+    if not 1 <= value <= MAX_PAGE_SIZE:
+        raise BadRequestError(
+            root_causes=[{
+                'param': 'limit',
+                'message': f'should be an integer between 1 and {MAX_PAGE_SIZE}'
+            }]
+        )
+
+    return value
+
+
+def latest_changes(rows: List[Tuple[int, int, datetime, Any]]) -> List[Tuple[int, int, datetime, Any]]:
+    """Keep the last change of every property in a page, earlier ones are superseded by it.
+
+    :param rows: (history_id, status_id, update_date, property) rows in cursor order
+    :return List[Tuple[int, int, datetime, Any]]: Rows of distinct properties in cursor order
+    """
+
+    latest = {}
+
+    for row in rows:
+        latest.pop(row[3].id, None)
+        latest[row[3].id] = row
+
+    return list(latest.values())
@@ -1,3 +1,12 @@
 """Export resources."""
 
-from .properties import transform_status_from_params
+from .properties import (
+    transform_fields_from_params,
+    transform_int_from_params,
+    transform_list_from_params,
+    transform_location_from_params,
+    transform_search_from_params,
+    transform_sort_from_params,
+    transform_status_from_params,
+    transform_year_from_params,
+)
@@ -1,10 +1,20 @@
 """Properties helper functions."""
 
-from typing import AnyStr, List, Optional
+import math
+from typing import AnyStr, List, Optional, Tuple
 
+from pypika import Order
+
+from src.commons.errors import BadRequestError
 from src.commons.logging import logger
+from src.models import Property
 from src.models.types import PropertyStatus
 
+SORTABLE_FIELDS = {'id', 'price', 'year', 'city'}
+PROJECTABLE_FIELDS = frozenset(vars(Property()))
+MAX_SEARCH_LENGTH = 200
+MAX_RADIUS_KM = 100
+
 
 def transform_status_from_params(statuses: Optional[AnyStr] = None) -> Optional[List[PropertyStatus]]:
     """Transform and cast status from query params to valid PropertyStatus codes.
@@ -28,3 +38,205 @@ def transform_status_from_params(statuses: Optional[AnyStr] = None) -> Optional[
         return None
 
     return aux
+
+
+def transform_list_from_params(values: Optional[AnyStr] = None) -> Optional[List[AnyStr]]:
+    """Split a comma separated query param into a list of unique non empty values.
+
+    :param values: Value of the query param (comma separated string)
+    :return Optional[List[AnyStr]]: List of values
+    """
+
+    if values is None:
+        return None
+
+    aux = []
+
+    for value in values.split(','):
+        value = value.strip()
+
+        if value and value not in aux:
+            aux.append(value)
+
+    if not aux:
+        return None
+
+    return aux
+
+
+def transform_int_from_params(name: AnyStr, value: Optional[AnyStr] = None) -> Optional[int]:
+    """Cast a numeric query param to int.
+
+    :param name: Name of the query param
+    :param value: Value of the query param
+    :return Optional[int]: Casted value
+    :raise BadRequestError: If the value is not a valid integer
+    """
+
+    if value is None:
+        return None
+
+    try:
+        return int(value)
+    except ValueError as err:
+        raise BadRequestError(root_causes=[{'param': name, 'message': 'should be an integer'}]) from err
+
+
+def transform_year_from_params(
+    year: Optional[AnyStr] = None,
+    year_min: Optional[AnyStr] = None,
+    year_max: Optional[AnyStr] = None,
+) -> Tuple[Optional[int], Optional[int], Optional[int]]:
+    """Cast the build year query params, an exact year can't be combined with a year range.
+
+    :param year: Value of the year query param
+    :param year_min: Value of the year_min query param
+    :param year_max: Value of the year_max query param
+    :return Tuple[Optional[int], Optional[int], Optional[int]]: (year, year_min, year_max)
+    :raise BadRequestError: If any of the values is not a valid integer or year is given with a range
+    """
+
+    values = (
+        transform_int_from_params('year', year),
+        transform_int_from_params('year_min', year_min),
+        transform_int_from_params('year_max', year_max),
+    )
+
+    if values[0] is not None and (values[1] is not None or values[2] is not None):
+        raise BadRequestError(
+            root_causes=[{
+                'param': 'year',
+                'message': 'year can not be combined with year_min or year_max'
+            }]
+        )
+
+    return values
+
+
+def transform_location_from_params(
+    lat: Optional[AnyStr] = None,
+    lon: Optional[AnyStr] = None,
+    radius: Optional[AnyStr] = None,
+) -> Tuple[Optional[float], Optional[float], Optional[float]]:
+    """Cast the proximity search query params, they must be given together.
+
+    :param lat: Value of the lat query param
+    :param lon: Value of the lon query param
+    :param radius: Value of the radius query param (kilometers)
+    :return Tuple[Optional[float], Optional[float], Optional[float]]: (lat, lon, radius) or three None values
+    :raise BadRequestError: If any of the values is missing or out of range
+    """
+
+    params = {'lat': lat, 'lon': lon, 'radius': radius}
+
+    if all(value is None for value in params.values()):
+        return None, None, None
+
+    missing = [name for name, value in params.items() if value is None]
+
+    if missing:
+        raise BadRequestError(root_causes=[{'param': ','.join(missing), 'message': 'lat, lon and radius are required'}])
+
+    limits = {'lat': (-90, 90), 'lon': (-180, 180), 'radius': (0, MAX_RADIUS_KM)}
+    values = []
+
+    for name, value in params.items():
+        minimum, maximum = limits[name]
+
+        try:
+            value = float(value)
+        except ValueError as err:
+            raise BadRequestError(root_causes=[{'param': name, 'message': 'should be a number'}]) from err
+
+        if not math.isfinite(value) or not minimum <= value <= maximum or (name == 'radius' and value == 0):
+            raise BadRequestError(
+                root_causes=[{
+                    'param': name,
+                    'message': f'should be between {minimum} and {maximum}'
+                }]
+            )
+
+        values.append(value)
+
+    return tuple(values)
+
+
+def transform_sort_from_params(sort: Optional[AnyStr] = None) -> Optional[List[Tuple[AnyStr, Order]]]:
+    """Transform the sort query param (`price,-year`) into a list of ordering tuples.
+
+    :param sort: Value of the sort query param (comma separated string, `-` prefix for descending order)
+    :return Optional[List[Tuple[AnyStr, Order]]]: List of (field, order) tuples
+    """
+
+    fields = transform_list_from_params(sort)
+
+    if fields is None:
+        return None
+
+    aux = []
+
+    for field in fields:
+        order = Order.asc
+
+        if field.startswith('-'):
+            field = field[1:]
+            order = Order.desc
+
+        if field not in SORTABLE_FIELDS:
+            logger.field('sort', field).warning('skipping wrong sort field')
+            continue
+
+        aux.append((field, order))
+
+    if not aux:
+        return None
+
+    return aux
+
+
+def transform_search_from_params(query: Optional[AnyStr] = None) -> Optional[AnyStr]:
+    """Normalize the free text search query param.
+
+    :param query: Value of the q query param
+    :return Optional[AnyStr]: Search text or None if it is empty
+    """
+
+    if query is None:
+        return None
+
+    query = ' '.join(query.split())[:MAX_SEARCH_LENGTH]
+
+    if not query:
+        return None
+
+    return query
+
+
+def transform_fields_from_params(fields: Optional[AnyStr] = None) -> Optional[List[AnyStr]]:
+    """Transform the fields query param (`id,city,price`) into the list of property columns to read. The id is
+    always included.
+
+    :param fields: Value of the fields query param (comma separated string)
+    :return Optional[List[AnyStr]]: Unique property fields in the requested order, None for all of them
+    :raise BadRequestError: If any of the fields is not a property field
+    """
+
+    fields = transform_list_from_params(fields)
+
+    if fields is None:
+        return None
+
+    invalid = [field for field in fields if field not in PROJECTABLE_FIELDS]
+
+    if invalid:
+        raise BadRequestError(
+            root_causes=[
+                {
+                    'param': 'fields',
+                    'message': f'invalid fields: {",".join(invalid)}',
+                    'allowed': sorted(PROJECTABLE_FIELDS),
+                }
+            ]
+        )
+
+    return list(dict.fromkeys(['id', *fields]))
@@ -0,0 +1,8 @@
+"""Export resources."""
+
+from .stats import (
+    GROUP_BY_DIMENSIONS,
+    compute_moves,
+    compute_rollup,
+    transform_group_by_from_params,
+)
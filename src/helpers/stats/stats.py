@@ -0,0 +1,102 @@
+"""Property stats helper functions."""
+
+from collections import defaultdict
+from datetime import datetime
+from typing import AnyStr, Dict, Iterable, List, Optional, Tuple
+
+from src.commons.logging import logger
+
+GROUP_BY_DIMENSIONS = ('city', 'year', 'status')
+
+
+def transform_group_by_from_params(group_by: Optional[AnyStr] = None) -> List[AnyStr]:
+    """Transform the group_by query param into the list of stats dimensions.
+
+    :param group_by: Value of the group_by query param (comma separated string)
+    :return List[AnyStr]: Dimensions in canonical order, all of them when the param is missing
+    """
+
+    if group_by is None:
+        return list(GROUP_BY_DIMENSIONS)
+
+    requested = {item.strip() for item in group_by.split(',') if item.strip()}
+
+    for dimension in requested.difference(GROUP_BY_DIMENSIONS):
+        logger.field('group_by', dimension).warning('skipping wrong group by dimension')
+
+    return [dimension for dimension in GROUP_BY_DIMENSIONS if dimension in requested]
+
+
+def compute_rollup(
+    changes: Iterable[Tuple[int, int, int, datetime]],
+    current: Dict[int, Tuple[int, datetime, Optional[AnyStr], Optional[int]]],
+    dimensions: Dict[int, Tuple[AnyStr, int]],
+) -> Tuple[Dict[Tuple[AnyStr, int, int], int], Dict[int, Tuple[int, datetime, AnyStr, int]]]:
+    """Compute aggregate deltas from a batch of status changes.
+
+    Only the latest change (by update date) of each property counts, it moves the property from the bucket it is
+    counted under (city and year included, they may have changed since) to the bucket of its current city, year
+    and new status.
+
+    :param changes: Status history rows as (history_id, property_id, status_id, update_date) ordered by id
+    :param current: Rolled up state of the changed properties as {property_id: (status_id, update_date, city, year)}
+    :param dimensions: Group by values of the changed properties as {property_id: (city, year)}
+    :return Tuple: ({(city, year, status_id): delta}, {property_id: (status_id, update_date, city, year)})
+    """
+
+    latest = {}
+
+    for _, property_id, status_id, update_date in changes:
+        previous = latest.get(property_id, None) or current.get(property_id, None)
+
+        if previous is not None and previous[1] is not None and update_date < previous[1]:
+            continue
+
+        latest[property_id] = (status_id, update_date)
+
+    deltas = defaultdict(int)
+    rolled = {}
+
+    for property_id, (status_id, update_date) in latest.items():
+        if property_id not in dimensions:
+            continue
+
+        city, year = dimensions[property_id]
+        rolled[property_id] = (status_id, update_date, city, year)
+        previous = current.get(property_id, None)
+
+        if previous is not None:
+            counted = (previous[2], previous[3], previous[0])
+
+            if counted == (city, year, status_id):
+                continue
+
+            deltas[counted] -= 1
+
+        deltas[(city, year, status_id)] += 1
+
+    return {key: value for key, value in deltas.items() if value}, rolled
+
+
+def compute_moves(
+    moved: Iterable[Tuple[int, int, Optional[AnyStr], Optional[int], AnyStr, int]]
+) -> Tuple[Dict[Tuple[AnyStr, int, int], int], Dict[int, Tuple[AnyStr, int]]]:
+    """Compute aggregate deltas of properties whose city or year changed without a status change.
+
+    :param moved: Rows as (property_id, status_id, counted_city, counted_year, city, year)
+    :return Tuple: ({(city, year, status_id): delta}, {property_id: (city, year)})
+    """
+
+    deltas = defaultdict(int)
+    dimensions = {}
+
+    for property_id, status_id, counted_city, counted_year, city, year in moved:
+        counted = (counted_city, counted_year, status_id)
+
+        if counted != (city, year, status_id):
+            deltas[counted] -= 1
+            deltas[(city, year, status_id)] += 1
+
+        dimensions[property_id] = (city, year)
+
+    return {key: value for key, value in deltas.items() if value}, dimensions
@@ -1,3 +1,7 @@
 """Export resources."""
 
+from .liked import Liked
+from .liked_history import LikedHistory
 from .property import Property
+from .property_filters import PropertyFilters
+from .property_stats import PropertyStats
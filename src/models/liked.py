@@ -0,0 +1,17 @@
+"""Liked property model definition."""
+
+# pylint: disable=C0103
+
+from datetime import datetime
+
+from pydbrepo import Entity, Field
+
+
+class Liked(Entity):
+    """Current liked property of a user."""
+
+    def __init__(self):
+        self.id = Field(name='id', type_=int)
+        self.property_id = Field(name='property_id', type_=int)
+        self.user_id = Field(name='user_id', type_=int)
+        self.create_date = Field(name='create_date', type_=(datetime, str), cast_to=datetime, cast_if=str)
@@ -0,0 +1,18 @@
+"""Liked history model definition."""
+
+# pylint: disable=C0103
+
+from datetime import datetime
+
+from pydbrepo import Entity, Field
+
+
+class LikedHistory(Entity):
+    """Like or unlike movement of a user over a property."""
+
+    def __init__(self):
+        self.id = Field(name='id', type_=int)
+        self.property_id = Field(name='property_id', type_=int)
+        self.user_id = Field(name='user_id', type_=int)
+        self.liked = Field(name='liked', type_=bool)
+        self.update_date = Field(name='update_date', type_=(datetime, str), cast_to=datetime, cast_if=str)
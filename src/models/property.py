@@ -15,3 +15,5 @@ class Property(Entity):
         self.price = Field(name='price', type_=int)
         self.description = Field(name='description', type_=str)
         self.year = Field(name='year', type_=str)
+        self.latitude = Field(name='latitude', type_=float)
+        self.longitude = Field(name='longitude', type_=float)
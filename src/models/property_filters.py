@@ -0,0 +1,78 @@
+"""Property filters definition."""
+
+from typing import AnyStr, List, Optional, Tuple
+
+from pypika import Order
+
+from src.models.types import PropertyStatus
+
+
+class PropertyFilters:
+    """Set of filters that can be applied to a property search.
+
+    :param statuses: Current property statuses
+    :param cities: Property city locations
+    :param year: Exact property build year
+    :param year_min: Minimum property build year (inclusive)
+    :param year_max: Maximum property build year (inclusive)
+    :param price_min: Minimum property price (inclusive)
+    :param price_max: Maximum property price (inclusive)
+    :param sort: List of (field, order) tuples used to sort results
+    :param q: Free text search over description and address
+    :param ids: Restrict results to these property ids (kept in the given order when no sort is set)
+    :param fields: Property columns to read, all of them when it is not set
+    :param lat: Latitude of the proximity search center
+    :param lon: Longitude of the proximity search center
+    :param radius: Proximity search radius in kilometers
+    """
+
+    # pylint: disable=too-many-arguments,invalid-name
+
+    def __init__(
+        self,
+        statuses: Optional[List[PropertyStatus]] = None,
+        cities: Optional[List[AnyStr]] = None,
+        year: Optional[int] = None,
+        year_min: Optional[int] = None,
+        year_max: Optional[int] = None,
+        price_min: Optional[int] = None,
+        price_max: Optional[int] = None,
+        sort: Optional[List[Tuple[AnyStr, Order]]] = None,
+        q: Optional[AnyStr] = None,
+        ids: Optional[List[int]] = None,
+        fields: Optional[List[AnyStr]] = None,
+        lat: Optional[float] = None,
+        lon: Optional[float] = None,
+        radius: Optional[float] = None,
+    ):
+        self.statuses = statuses
+        self.cities = cities
+        self.year = year
+        self.year_min = year_min
+        self.year_max = year_max
+        self.price_min = price_min
+        self.price_max = price_max
+        self.sort = sort
+        self.q = q
+        self.ids = ids
+        self.fields = fields
+        self.lat = lat
+        self.lon = lon
+        self.radius = radius
+
+    def year_bounds(self) -> Tuple[Optional[int], Optional[int]]:
+        """Inclusive build year range matched by the year filters, an exact year is intersected with the range.
+
+        :return Tuple[Optional[int], Optional[int]]: (year_min, year_max), None for an open bound
+        """
+
+        if self.year is None:
+            return self.year_min, self.year_max
+
+        year_min = self.year if self.year_min is None else max(self.year, self.year_min)
+        year_max = self.year if self.year_max is None else min(self.year, self.year_max)
+
+        return year_min, year_max
+
+    def __repr__(self):
+        return f'PropertyFilters({self.__dict__})'
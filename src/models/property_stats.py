@@ -0,0 +1,15 @@
+"""Property stats model definition."""
+
+# pylint: disable=C0103
+
+from pydbrepo import Entity, Field
+
+
+class PropertyStats(Entity):
+    """Number of properties of a city and build year in a given status."""
+
+    def __init__(self):
+        self.city = Field(name='city', type_=str)
+        self.year = Field(name='year', type_=int)
+        self.status = Field(name='status', type_=int)
+        self.total = Field(name='total', type_=int)
@@ -1,3 +1,6 @@
 """Export resources."""
 
+from .likes_repository import LikesRepository
 from .properties_repository import PropertiesRepository
+from .snapshot_repository import SnapshotPropertiesRepository
+from .stats_repository import StatsRepository
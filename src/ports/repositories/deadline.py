@@ -0,0 +1,53 @@
+"""Deadline bounded read queries.
+
+SELECT statements get a MAX_EXECUTION_TIME optimizer hint with the request remaining time, MySQL interrupts
+them when it is reached and the error is turned into a DeadlineExceededError.
+"""
+
+import re
+from typing import Any, AnyStr, List, Optional, Tuple
+
+from mysql.connector import Error as MysqlError
+
+from src.commons import deadline
+
+# Query execution was interrupted, maximum statement execution time exceeded
+ER_QUERY_TIMEOUT = 3024
+
+_SELECT = re.compile(r'^\s*SELECT\b', re.IGNORECASE)
+
+
+def with_max_execution_time(sql: AnyStr, timeout: float) -> AnyStr:
+    """Add the MAX_EXECUTION_TIME hint to a SELECT statement.
+
+    :param sql: SQL statement
+    :param timeout: Max execution time in seconds
+    :return AnyStr: Statement with the hint, other statements are returned as they are
+    """
+
+    return _SELECT.sub(f'SELECT /*+ MAX_EXECUTION_TIME({max(int(timeout * 1000), 1)}) */', sql, count=1)
+
+
+def query(driver: Any, sql: AnyStr, args: Optional[List[Any]], operation: AnyStr) -> List[Tuple]:
+    """Execute a read query bounded by the request deadline.
+
+    :param driver: Database driver
+    :param sql: SELECT statement
+    :param args: Query values
+    :param operation: Operation name for the error details
+    :return List[Tuple]: Found records
+    :raise DeadlineExceededError: If the deadline passed before or during the query
+    """
+
+    timeout = deadline.timeout(operation)
+
+    if timeout is not None:
+        sql = with_max_execution_time(sql, timeout)
+
+    try:
+        return driver.query(sql=sql, args=args or [])
+    except MysqlError as err:
+        if err.errno == ER_QUERY_TIMEOUT:
+            raise deadline.exceeded(operation) from err
+
+        raise
@@ -0,0 +1,108 @@
+"""Likes repository implementation."""
+
+# pylint: disable=E1101
+
+from typing import List, NoReturn
+
+from mysql.connector import Error as MysqlError
+from pydbrepo.drivers.mysql import Mysql
+from pydbrepo.repository.mysql_repository import MysqlRepository
+from pypika import MySQLQuery as Query
+from pypika import Parameter
+
+from src.commons.errors import NotFoundError
+from src.models import Liked, LikedHistory
+
+# Duplicate entry for key and foreign key constraint fails
+ER_DUP_ENTRY = 1062
+ER_NO_REFERENCED_ROW_2 = 1452
+
+HISTORY_COLUMNS = ('property_id', 'user_id', 'liked', 'update_date')
+
+
+class LikesRepository(MysqlRepository):
+    """Liked properties class repository."""
+
+    def __init__(self, driver: Mysql):
+        super().__init__(driver=driver, table='liked', entity=Liked)
+
+    def like(self, user_id: int, property_id: int) -> bool:
+        """Mark a property as liked by a user.
+
+        :param user_id: User id
+        :param property_id: Property id
+        :return bool: False if the property was already liked by the user
+        :raise NotFoundError: If the property doesn't exist
+        """
+
+        sql = "INSERT INTO liked (property_id, user_id, create_date) VALUES (%s, %s, NOW())"
+
+        try:
+            self.driver.query_none(sql=sql, args=[property_id, user_id])
+        except MysqlError as err:
+            if err.errno == ER_DUP_ENTRY:
+                return False
+
+            if err.errno == ER_NO_REFERENCED_ROW_2:
+                raise NotFoundError(root_causes=[{'param': 'property_id', 'message': 'property not found'}]) from err
+
+            raise
+
+        return True
+
+    def unlike(self, user_id: int, property_id: int) -> bool:
+        """Remove a liked property of a user.
+
+        :param user_id: User id
+        :param property_id: Property id
+        :return bool: False if the property was not liked by the user
+        """
+
+        sql = "DELETE FROM liked WHERE property_id = %s AND user_id = %s"
+
+        # query_none discards the cursor, its rowcount saves a SELECT ROW_COUNT() round trip
+        cursor = self.driver.get_real_driver().cursor()
+
+        try:
+            cursor.execute(sql, (property_id, user_id))
+            return cursor.rowcount > 0
+        finally:
+            cursor.close()
+
+    def count_by_property(self, property_id: int) -> int:
+        """Count the users that currently like a property.
+
+        :param property_id: Property id
+        :return int: Total likes
+        """
+
+        record = self.driver.query_one(sql="SELECT COUNT(*) FROM liked WHERE property_id = %s", args=[property_id])
+        return record[0] if record else 0
+
+    def count_by_user(self, user_id: int) -> int:
+        """Count the properties currently liked by a user.
+
+        :param user_id: User id
+        :return int: Total liked properties
+        """
+
+        record = self.driver.query_one(sql="SELECT COUNT(*) FROM liked WHERE user_id = %s", args=[user_id])
+        return record[0] if record else 0
+
+    def insert_history(self, records: List[LikedHistory]) -> NoReturn:
+        """Insert many like movements with a single multi-row INSERT.
+
+        :param records: Like movements
+        """
+
+        if not records:
+            return
+
+        sql_query = Query.into('liked_history').columns(*HISTORY_COLUMNS)
+        values = []
+
+        for record in records:
+            sql_query = sql_query.insert(*[Parameter(self.driver.placeholder()) for _ in HISTORY_COLUMNS])
+            values.extend([record.property_id, record.user_id, record.liked, record.update_date])
+
+        self.driver.query_none(sql=str(sql_query), args=values)
@@ -2,16 +2,114 @@
 
 # pylint: disable=E1101
 
-from typing import Any, AnyStr, List, Optional, Tuple
+from datetime import datetime
+from typing import Any, AnyStr, Dict, Iterator, List, NoReturn, Optional, Tuple
 
 from pydbrepo.drivers.mysql import Mysql
 from pydbrepo.repository.mysql_repository import MysqlRepository
-from pypika import Field
+from pypika import Criterion, Field
 from pypika import MySQLQuery as Query
-from pypika import Parameter
+from pypika import Order, Parameter
+from pypika.terms import Term
 
-from src.models import Property
+from src.commons.geo import bounding_box
+from src.models import Property, PropertyFilters
 from src.models.types import PropertyStatus
+from src.ports.repositories import deadline
+
+# Composite indexes declared on the property table (see migrations/0001_property_filter_indexes.sql),
+# ordered by preference. Equality predicates should cover the leftmost columns and at most one range
+# predicate can be resolved by the index after them.
+FILTER_INDEXES = (
+    ('idx_property_city_year_price', ('city', 'year', 'price')),
+    ('idx_property_year_price', ('year', 'price')),
+    ('idx_property_price', ('price', )),
+)
+
+# Status id lists up to this size are resolved with PRIMARY lookups, the composite index hint is only added for
+# larger lists, where the id predicate stops being the most selective one.
+INDEX_HINT_MAX_IDS = 1000
+
+# Columns written by the bulk upsert, `id` is the conflict key
+UPSERT_COLUMNS = ('id', 'address', 'city', 'price', 'description', 'year', 'latitude', 'longitude')
+STATUS_HISTORY_COLUMNS = ('property_id', 'status_id', 'update_date')
+
+# Columns covered by the FULLTEXT index (see migrations/0002_property_fulltext_index.sql)
+FULLTEXT_COLUMNS = ('description', 'address')
+
+# POINT(longitude, latitude) column covered by the SPATIAL index (see migrations/0006_property_spatial_index.sql)
+LOCATION_COLUMN = 'location'
+
+# Estimated selectivity rank by predicate kind, lower is more selective.
+_FULLTEXT_RANK = -1
+_SPATIAL_RANK = -1
+_EQUALITY_RANK = 0
+_IN_RANK = 1
+_BOUNDED_RANGE_RANK = 2
+_OPEN_RANGE_RANK = 3
+_ID_LIST_RANK = 4
+_COMPUTED_RANK = 5
+
+
+class MatchAgainst(Criterion):
+    """MySQL natural language full text search criterion.
+
+    :param columns: Columns covered by the FULLTEXT index
+    :param placeholder: Query placeholder for the searched text
+    """
+
+    def __init__(self, columns: Tuple[AnyStr, ...], placeholder: AnyStr):
+        super().__init__()
+        self.columns = columns
+        self.placeholder = placeholder
+
+    def get_sql(self, **kwargs) -> AnyStr:
+        columns = ','.join(f'`{column}`' for column in self.columns)
+        return f'MATCH({columns}) AGAINST ({self.placeholder} IN NATURAL LANGUAGE MODE)'
+
+
+class WithinBox(Criterion):
+    """MySQL minimum bounding rectangle containment criterion, it can be resolved by a SPATIAL index. Several boxes
+    (e.g. both sides of the antimeridian) are OR'ed.
+
+    :param column: Geometry column
+    :param placeholders: Query placeholders for every box WKT polygon
+    """
+
+    def __init__(self, column: AnyStr, placeholders: List[AnyStr]):
+        super().__init__()
+        self.column = column
+        self.placeholders = placeholders
+
+    def get_sql(self, **kwargs) -> AnyStr:
+        boxes = [f'MBRContains(ST_GeomFromText({placeholder}),`{self.column}`)' for placeholder in self.placeholders]
+        return boxes[0] if len(boxes) == 1 else f"({' OR '.join(boxes)})"
+
+
+def _box_polygon(lon_min: float, lat_min: float, lon_max: float, lat_max: float) -> AnyStr:
+    """WKT polygon of a longitude/latitude box.
+
+    :return AnyStr: POLYGON((...)) text
+    """
+
+    corners = [(lon_min, lat_min), (lon_max, lat_min), (lon_max, lat_max), (lon_min, lat_max), (lon_min, lat_min)]
+    return f"POLYGON(({','.join(f'{x!r} {y!r}' for x, y in corners)}))"
+
+
+class SphereDistance(Term):
+    """MySQL spherical distance in meters between a POINT column and a point.
+
+    :param column: POINT(longitude, latitude) column
+    :param placeholder: Query placeholder used for the point longitude and latitude
+    """
+
+    def __init__(self, column: AnyStr, placeholder: AnyStr):
+        super().__init__()
+        self.column = column
+        self.placeholder = placeholder
+
+    def get_sql(self, **kwargs) -> AnyStr:
+        return f'ST_Distance_Sphere(`{self.column}`,POINT({self.placeholder},{self.placeholder}))'
 
 
 class PropertiesRepository(MysqlRepository):
@@ -20,44 +118,444 @@ class PropertiesRepository(MysqlRepository):
     def __init__(self, driver: Mysql):
         super().__init__(driver=driver, table='property', entity=Property)
 
-    def find_by_filters(
-        self,
-        statuses: Optional[List[PropertyStatus]] = None,
-        year: Optional[int] = None,
-        city: Optional[AnyStr] = None,
-    ) -> Optional[List[Property]]:
+    def find_by_filters(self, filters: Optional[PropertyFilters] = None) -> Optional[List[Property]]:
         """Find all available properties by the given filters.
 
-        :param statuses: Current property status
-        :param year: Property year build
-        :param city: Property city location
+        :param filters: Property search filters
         :return Optional[List[Property]]: List of found properties
         """
 
-        values = self._get_property_ids_by_status(statuses)
+        if filters is None:
+            filters = PropertyFilters()
+
+        ids = self._get_property_ids_by_status(filters.statuses)
+
+        if ids is not None and filters.ids is not None:
+            allowed = set(ids)
+            ids = [item for item in filters.ids if item in allowed]
 
-        if values is None:
+        if not ids:
             return None
 
-        args = [Parameter(self.driver.placeholder()) for _ in range(len(values))]
+        sql_query, values = self.build_filters_query(filters, ids)
+        records = deadline.query(self.driver, str(sql_query), values, 'find properties')
+
+        if not records:
+            return None
+
+        columns = self._select_columns(filters)
+        properties = [self.entity.from_record(columns, record) for record in records]
+
+        if filters.ids is not None and not filters.sort:
+            positions = {item: position for position, item in enumerate(ids)}
+            properties.sort(key=lambda item: positions.get(item.id, len(positions)))
+
+        return properties
+
+    def has_fulltext_index(self) -> bool:
+        """Check if the property table has a FULLTEXT index over the searchable columns.
+
+        :return bool: True if MATCH ... AGAINST queries can be used
+        """
+
+        sql = (
+            "SELECT INDEX_NAME FROM information_schema.STATISTICS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_TYPE = 'FULLTEXT' "
+            "GROUP BY INDEX_NAME "
+            "HAVING GROUP_CONCAT(COLUMN_NAME ORDER BY SEQ_IN_INDEX) = %s"
+        )
+
+        return bool(self.driver.query(sql=sql, args=[self._table, ','.join(FULLTEXT_COLUMNS)]))
+
+    def has_spatial_index(self) -> bool:
+        """Check if the property table has a SPATIAL index over the location column.
+
+        :return bool: True if proximity searches can be resolved by MySQL
+        """
 
-        sql_query = Query.from_(self._table).select(*self.entity_properties)
-        sql_query = sql_query.where(Field('id').isin(args))
+        sql = (
+            "SELECT INDEX_NAME FROM information_schema.STATISTICS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_TYPE = 'SPATIAL' AND COLUMN_NAME = %s"
+        )
 
-        if year is not None:
-            values.append(year)
-            sql_query = sql_query.where(Field('year') == Parameter(self.driver.placeholder()))
+        return bool(self.driver.query(sql=sql, args=[self._table, LOCATION_COLUMN]))
 
-        if city is not None:
-            values.append(city)
-            sql_query = sql_query.where(Field('city') == Parameter(self.driver.placeholder()))
+    def upsert_many(self, records: List[Dict[AnyStr, Any]]) -> NoReturn:
+        """Insert or update many properties with a single multi-row INSERT ... ON DUPLICATE KEY UPDATE.
 
-        records = self.driver.query(sql=str(sql_query), args=values)
+        :param records: Property records with the UPSERT_COLUMNS keys
+        """
 
         if not records:
-            return None
+            return
+
+        rows = ','.join([f"({','.join(['%s'] * len(UPSERT_COLUMNS))})"] * len(records))
+        updates = ','.join(f'`{column}`=VALUES(`{column}`)' for column in UPSERT_COLUMNS[1:])
+        columns = ','.join(f'`{column}`' for column in UPSERT_COLUMNS)
+
+        sql = f"INSERT INTO property ({columns}) VALUES {rows} ON DUPLICATE KEY UPDATE {updates}"
+        values = [record.get(column, None) for record in records for column in UPSERT_COLUMNS]
+
+        self.driver.query_none(sql=sql, args=values)
+
+    def insert_status_history(self, records: List[Dict[AnyStr, Any]]) -> NoReturn:
+        """Insert many status changes with a single multi-row INSERT ... SELECT skipping the ones already stored, so
+        writing the same records twice (e.g. an import resumed after a crash) doesn't duplicate history rows. A
+        change with update_date is stored when the same property, status and date is not, one without update_date
+        when it is not the current status of the property.
+
+        :param records: Status history records with the STATUS_HISTORY_COLUMNS keys
+        """
+
+        if not records:
+            return
+
+        aliases = ','.join(f'%s AS `{column}`' for column in STATUS_HISTORY_COLUMNS)
+        rows = ' UNION ALL '.join([f'SELECT {aliases}'] + ['SELECT %s,%s,%s'] * (len(records) - 1))
+        columns = ','.join(f'`{column}`' for column in STATUS_HISTORY_COLUMNS)
+
+        sql = (
+            f"INSERT INTO status_history ({columns}) "
+            "SELECT n.property_id, n.status_id, COALESCE(n.update_date, NOW()) "
+            f"FROM ({rows}) n "
+            "WHERE NOT EXISTS ("
+            "SELECT 1 FROM status_history sh WHERE sh.property_id = n.property_id AND sh.status_id = n.status_id "
+            "AND sh.update_date = n.update_date"
+            ") AND (n.update_date IS NOT NULL OR NOT (("
+            "SELECT sh.status_id FROM status_history sh WHERE sh.property_id = n.property_id "
+            "ORDER BY sh.update_date DESC, sh.id DESC LIMIT 1"
+            ") <=> n.status_id))"
+        )
+        values = [record.get(column, None) for record in records for column in STATUS_HISTORY_COLUMNS]
+
+        self.driver.query_none(sql=sql, args=values)
+
+    def iter_search_documents(self, batch_size: int = 5000) -> Iterator[Tuple[int, AnyStr]]:
+        """Iterate over all properties searchable text using keyset pagination.
+
+        :param batch_size: Number of records fetched per query
+        :return Iterator[Tuple[int, AnyStr]]: (property_id, text) tuples
+        """
+
+        last_id = 0
+        sql = "SELECT id, description, address FROM property WHERE id > %s ORDER BY id LIMIT %s"
+
+        while True:
+            records = self.driver.query(sql=sql, args=[last_id, batch_size])
+
+            for property_id, description, address in records:
+                yield property_id, f'{description or ""} {address or ""}'
+
+            if len(records) < batch_size:
+                return
+
+            last_id = records[-1][0]
+
+    def iter_catalog(self, batch_size: int = 5000) -> Iterator[Dict[AnyStr, Any]]:
+        """Iterate over every listed property with its latest status using keyset pagination.
+
+        :param batch_size: Number of records fetched per query
+        :return Iterator[Dict[AnyStr, Any]]: Property columns plus status_id
+        """
+
+        last_id = 0
+        columns = tuple(self.entity_properties)
+        statuses = [item.value for item in PropertyStatus]
+        place_holders = ','.join(['%s'] * len(statuses))
+
+        sql = (
+            f"SELECT {','.join(f'p.`{column}`' for column in columns)}, ("
+            "SELECT sh.status_id FROM status_history sh "
+            f"WHERE sh.property_id = p.id AND sh.status_id IN ({place_holders}) "
+            "ORDER BY sh.update_date DESC, sh.id DESC LIMIT 1"
+            ") AS status_id "
+            "FROM property p WHERE p.id > %s ORDER BY p.id LIMIT %s"
+        )
+
+        id_position = columns.index('id')
+
+        while True:
+            records = self.driver.query(sql=sql, args=[*statuses, last_id, batch_size])
+
+            for record in records:
+                if record[-1] is not None:
+                    yield {**dict(zip(columns, record)), 'status_id': record[-1]}
+
+            if len(records) < batch_size:
+                return
+
+            last_id = records[-1][id_position]
+
+    def iter_locations(self, batch_size: int = 5000) -> Iterator[Tuple[int, float, float]]:
+        """Iterate over the coordinates of every located property using keyset pagination.
+
+        :param batch_size: Number of records fetched per query
+        :return Iterator[Tuple[int, float, float]]: (property_id, latitude, longitude) tuples
+        """
+
+        last_id = 0
+        sql = (
+            "SELECT id, latitude, longitude FROM property "
+            "WHERE id > %s AND latitude IS NOT NULL AND longitude IS NOT NULL ORDER BY id LIMIT %s"
+        )
+
+        while True:
+            records = self.driver.query(sql=sql, args=[last_id, batch_size])
+
+            for property_id, latitude, longitude in records:
+                yield property_id, float(latitude), float(longitude)
+
+            if len(records) < batch_size:
+                return
+
+            last_id = records[-1][0]
+
+    def find_status_changes(
+        self,
+        after_id: Optional[int],
+        limit: int,
+        settle_seconds: float = 0,
+    ) -> List[Tuple[int, int, datetime, Property]]:
+        """Status changes after a status_history id with the changed property, using keyset pagination over the
+        primary key. Ids are assigned on insert but only visible on commit, so the page stops at the first change
+        recorded less than settle_seconds ago, transactions still writing lower ids get that long to commit.
+
+        :param after_id: Id of the last read change, None to start from the first one
+        :param limit: Max number of changes
+        :param settle_seconds: Age a change needs before it is returned
+        :return List[Tuple[int, int, datetime, Property]]: (history_id, status_id, update_date, property) rows
+        """
+
+        columns = tuple(self.entity_properties)
+        statuses = [item.value for item in PropertyStatus]
+
+        sql = (
+            "SELECT sh.id, sh.status_id, sh.update_date, sh.recorded_at <= NOW(6) - INTERVAL %s SECOND, "
+            f"{','.join(f'p.`{column}`' for column in columns)} "
+            "FROM status_history sh JOIN property p ON p.id = sh.property_id "
+            f"WHERE sh.id > %s AND sh.status_id IN ({','.join(['%s'] * len(statuses))}) "
+            "ORDER BY sh.id LIMIT %s"
+        )
+        values = [settle_seconds, after_id or 0, *statuses, limit]
+
+        changes = []
+
+        for record in deadline.query(self.driver, sql, values, 'find status changes'):
+            if not record[3]:
+                break
+
+            changes.append((record[0], record[1], record[2], self.entity.from_record(columns, record[4:])))
+
+        return changes
+
+    def build_filters_query(self, filters: PropertyFilters, ids: List[int]) -> Tuple[Query, List[Any]]:
+        """Build the property search query choosing the composite index that better matches the
+        given filters and ordering predicates from the most to the least selective one.
+
+        :param filters: Property search filters
+        :param ids: Property ids that match the status filter
+        :return Tuple[Query, List[Any]]: Query and its ordered placeholder values
+        """
+
+        predicates = self._build_predicates(filters, ids)
+
+        # FULLTEXT and SPATIAL lookups must be left to the optimizer, an index hint would exclude those indexes
+        index = self._choose_index(predicates) if not filters.q and not self._is_proximity(filters) else None
+
+        sql_query = Query.from_(self._table).select(*self._select_columns(filters))
+
+        # A hint would also exclude PRIMARY, short id lists are cheaper to resolve with it
+        if index is not None and len(ids) > INDEX_HINT_MAX_IDS:
+            sql_query = sql_query.use_index(index[0])
+
+        values = []
+
+        for _, _, criterion, args in self._sort_predicates(predicates, index):
+            sql_query = sql_query.where(criterion)
+            values.extend(args)
+
+        for field, order in filters.sort or []:
+            sql_query = sql_query.orderby(Field(field), order=order)
+
+        if filters.q and not filters.sort:
+            sql_query = sql_query.orderby(MatchAgainst(FULLTEXT_COLUMNS, self.driver.placeholder()), order=Order.desc)
+            values.append(filters.q)
+
+        if self._is_proximity(filters) and not filters.sort:
+            sql_query = sql_query.orderby(SphereDistance(LOCATION_COLUMN, self.driver.placeholder()), order=Order.asc)
+            values.extend([filters.lon, filters.lat])
+
+        return sql_query, values
+
+    def _select_columns(self, filters: PropertyFilters) -> Tuple[AnyStr, ...]:
+        """Columns read by the search query, unrequested columns are never read from MySQL.
+
+        :param filters: Property search filters
+        :return Tuple[AnyStr, ...]: Selected columns in query order
+        """
+
+        if not filters.fields:
+            return tuple(self.entity_properties)
+
+        return tuple(field for field in filters.fields if field in self.entity_properties)
+
+    def _build_predicates(self, filters: PropertyFilters, ids: List[int]) -> List[Tuple[AnyStr, int, Any, List[Any]]]:
+        """Build the list of query predicates as (column, rank, criterion, values) tuples.
+
+        :param filters: Property search filters
+        :param ids: Property ids that match the status filter
+        :return List[Tuple[AnyStr, int, Any, List[Any]]]: Query predicates
+        """
+
+        predicates = [('id', _ID_LIST_RANK, Field('id').isin(self._placeholders(len(ids))), list(ids))]
+
+        if filters.q:
+            criterion = MatchAgainst(FULLTEXT_COLUMNS, self.driver.placeholder())
+            predicates.append(('fulltext', _FULLTEXT_RANK, criterion, [filters.q]))
+
+        if filters.cities:
+            rank = _EQUALITY_RANK if len(filters.cities) == 1 else _IN_RANK
+            criterion = Field('city').isin(self._placeholders(len(filters.cities)))
+            predicates.append(('city', rank, criterion, list(filters.cities)))
+
+        year_min, year_max = filters.year_bounds()
+
+        if year_min is not None and year_min == year_max:
+            criterion = Field('year') == Parameter(self.driver.placeholder())
+            predicates.append(('year', _EQUALITY_RANK, criterion, [year_min]))
+        else:
+            predicates.extend(self._build_range_predicates('year', year_min, year_max))
+
+        predicates.extend(self._build_range_predicates('price', filters.price_min, filters.price_max))
+
+        if self._is_proximity(filters):
+            predicates.extend(self._build_proximity_predicates(filters.lat, filters.lon, filters.radius))
+
+        return predicates
+
+    def _build_proximity_predicates(self, lat: float, lon: float,
+                                    radius: float) -> List[Tuple[AnyStr, int, Any, List[Any]]]:
+        """Build the proximity search predicates, a bounding box that the SPATIAL index resolves followed by the
+        exact spherical distance over the rows inside it.
+
+        :param lat: Center latitude
+        :param lon: Center longitude
+        :param radius: Radius in kilometers
+        :return List[Tuple[AnyStr, int, Any, List[Any]]]: Proximity predicates
+        """
+
+        lat_min, lat_max, lon_min, lon_max = bounding_box(lat, lon, radius)
+
+        # Boxes crossing the antimeridian are split in two, like GridIndex does with its columns
+        if lon_min < -180:
+            ranges = [(-180.0, lon_max), (lon_min + 360, 180.0)]
+        elif lon_max > 180:
+            ranges = [(lon_min, 180.0), (-180.0, lon_max - 360)]
+        else:
+            ranges = [(lon_min, lon_max)]
+
+        polygons = [_box_polygon(west, lat_min, east, lat_max) for west, east in ranges]
+        within = WithinBox(LOCATION_COLUMN, [self.driver.placeholder() for _ in polygons])
+        distance = SphereDistance(LOCATION_COLUMN, self.driver.placeholder())
+
+        return [
+            (LOCATION_COLUMN, _SPATIAL_RANK, within, polygons),
+            ('latitude', _COMPUTED_RANK, Field('latitude').notnull(), []),
+            ('distance', _COMPUTED_RANK, distance <= Parameter(self.driver.placeholder()), [lon, lat, radius * 1000]),
+        ]
+
+    @staticmethod
+    def _is_proximity(filters: PropertyFilters) -> bool:
+        return filters.lat is not None and filters.lon is not None and filters.radius is not None
+
+    def _build_range_predicates(
+        self,
+        column: AnyStr,
+        minimum: Optional[int] = None,
+        maximum: Optional[int] = None,
+    ) -> List[Tuple[AnyStr, int, Any, List[Any]]]:
+        """Build a range predicate over a column.
+
+        :param column: Column name
+        :param minimum: Inclusive lower bound
+        :param maximum: Inclusive upper bound
+        :return List[Tuple[AnyStr, int, Any, List[Any]]]: Empty list or a single range predicate
+        """
+
+        if minimum is not None and maximum is not None:
+            criterion = Field(column)[Parameter(self.driver.placeholder()):Parameter(self.driver.placeholder())]
+            return [(column, _BOUNDED_RANGE_RANK, criterion, [minimum, maximum])]
+
+        if minimum is not None:
+            criterion = Field(column) >= Parameter(self.driver.placeholder())
+            return [(column, _OPEN_RANGE_RANK, criterion, [minimum])]
+
+        if maximum is not None:
+            criterion = Field(column) <= Parameter(self.driver.placeholder())
+            return [(column, _OPEN_RANGE_RANK, criterion, [maximum])]
+
+        return []
+
+    @staticmethod
+    def _choose_index(predicates: List[Tuple[AnyStr, int, Any, List[Any]]]) -> Optional[Tuple[AnyStr, Tuple]]:
+        """Choose the composite index that covers the longest prefix of the given predicates.
+
+        Equality and IN predicates can be consumed one after another, the first range predicate
+        consumes its column and stops the index prefix.
+
+        :param predicates: Query predicates
+        :return Optional[Tuple[AnyStr, Tuple]]: Chosen (index_name, columns) or None
+        """
+
+        ranks = {column: rank for column, rank, _, _ in predicates if column != 'id'}
+        best, best_score = None, 0
+
+        for index in FILTER_INDEXES:
+            score = 0
+
+            for column in index[1]:
+                if column not in ranks:
+                    break
+
+                score += 1
+
+                if ranks[column] >= _BOUNDED_RANGE_RANK:
+                    break
+
+            if score > best_score:
+                best, best_score = index, score
+
+        return best
+
+    @staticmethod
+    def _sort_predicates(
+        predicates: List[Tuple[AnyStr, int, Any, List[Any]]],
+        index: Optional[Tuple[AnyStr, Tuple]] = None,
+    ) -> List[Tuple[AnyStr, int, Any, List[Any]]]:
+        """Sort predicates following the chosen index column order first and then by selectivity.
+
+        :param predicates: Query predicates
+        :param index: Chosen (index_name, columns)
+        :return List[Tuple[AnyStr, int, Any, List[Any]]]: Sorted predicates
+        """
+
+        columns = index[1] if index is not None else ()
+
+        def sort_key(predicate):
+            column, rank = predicate[0], predicate[1]
+            position = columns.index(column) if column in columns else len(columns)
+            return position, rank
+
+        return sorted(predicates, key=sort_key)
+
+    def _placeholders(self, total: int) -> List[Parameter]:
+        """Build a list of query placeholders.
+
+        :param total: Number of placeholders
+        :return List[Parameter]: Placeholders
+        """
 
-        return [self.entity.from_record(self.entity_properties, record) for record in records]
+        return [Parameter(self.driver.placeholder()) for _ in range(total)]
 
     @staticmethod
     def _build_status_filter(status: Optional[List[PropertyStatus]] = None) -> Tuple[List[Any], List[AnyStr]]:
@@ -97,7 +595,7 @@ class PropertiesRepository(MysqlRepository):
             f") AS status WHERE status_id IN ({place_holders})"
         )
 
-        records = self.driver.query(sql=sql, args=values)
+        records = deadline.query(self.driver, sql, values, 'find property ids by status')
 
         if not records:
             return None
@@ -0,0 +1,179 @@
+"""Properties repository backed by a catalog snapshot."""
+
+import bisect
+import math
+from typing import AnyStr, Callable, Iterator, List, Optional, Tuple
+
+from pypika import Order
+
+from src.commons.snapshot import NULL_INT, CatalogSnapshot
+from src.models import Property, PropertyFilters
+from src.models.types import PropertyStatus
+
+
+class SnapshotPropertiesRepository:
+    """Read only PropertiesRepository counterpart that answers searches from a memory-mapped catalog snapshot.
+
+    City filters are resolved with the snapshot city directory and year filters with a binary search inside each
+    city range, the remaining predicates are checked row by row. Text and proximity searches are not resolved here,
+    the adapter restricts `filters.ids` with the local indexes as it does for MySQL without FULLTEXT/SPATIAL indexes.
+
+    :param snapshot: Catalog snapshot
+    """
+
+    def __init__(self, snapshot: CatalogSnapshot):
+        self.snapshot = snapshot
+        self.entity = Property
+        self.entity_properties = set(vars(Property()))
+
+    @staticmethod
+    def has_fulltext_index() -> bool:
+        return False
+
+    @staticmethod
+    def has_spatial_index() -> bool:
+        return False
+
+    def find_by_filters(self, filters: Optional[PropertyFilters] = None) -> Optional[List[Property]]:
+        """Find all available properties by the given filters.
+
+        :param filters: Property search filters
+        :return Optional[List[Property]]: List of found properties
+        """
+
+        if filters is None:
+            filters = PropertyFilters()
+
+        if filters.ids is not None:
+            matches = self._build_predicate(filters, ranged=False)
+            rows = [row for row in map(self.snapshot.find_row, filters.ids) if row is not None and matches(row)]
+        else:
+            matches = self._build_predicate(filters, ranged=True)
+            rows = [row for start, end in self._candidate_ranges(filters) for row in range(start, end) if matches(row)]
+
+        if not rows:
+            return None
+
+        columns = self._select_columns(filters)
+        properties = [self._entity(columns, row) for row in rows]
+
+        for field, order in reversed(filters.sort or []):
+            properties.sort(
+                key=lambda item, name=field: (getattr(item, name) is not None, getattr(item, name)),
+                reverse=order == Order.desc,
+            )
+
+        return properties
+
+    def iter_locations(self, batch_size: int = 5000) -> Iterator[Tuple[int, float, float]]:
+        """Iterate over the coordinates of every located property.
+
+        :param batch_size: Unused, kept for PropertiesRepository compatibility
+        :return Iterator[Tuple[int, float, float]]: (property_id, latitude, longitude) tuples
+        """
+
+        ids = self.snapshot.column('id')
+        latitudes = self.snapshot.column('latitude')
+        longitudes = self.snapshot.column('longitude')
+
+        for row in self.snapshot.rows():
+            if not math.isnan(latitudes[row]) and not math.isnan(longitudes[row]):
+                yield ids[row], latitudes[row], longitudes[row]
+
+    def _candidate_ranges(self, filters: PropertyFilters) -> List[Tuple[int, int]]:
+        """Row ranges that can match the city and year filters.
+
+        :param filters: Property search filters
+        :return List[Tuple[int, int]]: (start_row, end_row) ranges
+        """
+
+        ranges = self.snapshot.city_ranges(filters.cities)
+        year_min, year_max = filters.year_bounds()
+
+        if year_min is None and year_max is None:
+            return ranges
+
+        years = self.snapshot.column('year')
+        narrowed = []
+
+        # Null years (NULL_INT) sort first inside every city range
+        year_min = year_min if year_min is not None else NULL_INT + 1
+
+        for start, end in ranges:
+            start = bisect.bisect_left(years, year_min, start, end)
+
+            if year_max is not None:
+                end = bisect.bisect_right(years, year_max, start, end)
+
+            if start < end:
+                narrowed.append((start, end))
+
+        return narrowed
+
+    def _build_predicate(self, filters: PropertyFilters, ranged: bool) -> Callable[[int], bool]:
+        """Row predicate with the filters that the candidate rows don't already satisfy.
+
+        :param filters: Property search filters
+        :param ranged: True when rows come from _candidate_ranges, which already applies the city and year filters
+        :return Callable[[int], bool]: Predicate over row numbers
+        """
+
+        checks = []
+
+        statuses = {item.value for item in filters.statuses or list(PropertyStatus)}
+        status_column = self.snapshot.column('status_id')
+        checks.append(lambda row: status_column[row] in statuses)
+
+        if not ranged and filters.cities:
+            cities = {self.snapshot.city_id(city) for city in filters.cities}
+            city_column = self.snapshot.column('city')
+            checks.append(lambda row: city_column[row] in cities)
+
+        if not ranged:
+            checks.extend(self._range_checks('year', *filters.year_bounds()))
+
+        checks.extend(self._range_checks('price', filters.price_min, filters.price_max))
+
+        return lambda row: all(check(row) for check in checks)
+
+    def _range_checks(self, column: AnyStr, minimum: Optional[int], maximum: Optional[int]) -> List[Callable]:
+        """Inclusive range checks over an integer column, null values (NULL_INT) never match.
+
+        :param column: Column name
+        :param minimum: Inclusive lower bound
+        :param maximum: Inclusive upper bound
+        :return List[Callable]: Row checks
+        """
+
+        values = self.snapshot.column(column)
+        checks = []
+
+        if minimum is not None:
+            checks.append(lambda row: values[row] >= minimum)
+
+        if maximum is not None:
+            checks.append(lambda row: values[row] != NULL_INT and values[row] <= maximum)
+
+        return checks
+
+    def _select_columns(self, filters: PropertyFilters) -> Tuple[AnyStr, ...]:
+        if not filters.fields:
+            return tuple(self.entity_properties)
+
+        return tuple(field for field in filters.fields if field in self.entity_properties)
+
+    def _entity(self, columns: Tuple[AnyStr, ...], row: int) -> Property:
+        """Build a property from a snapshot row. Columns are known entity fields, so they are set directly instead of
+        going through Entity.from_record, which serializes the instance to validate every key.
+
+        :param columns: Selected columns
+        :param row: Row number
+        :return Property: Property entity
+        """
+
+        item = self.entity()
+
+        for column in columns:
+            setattr(item, column, self.snapshot.value(column, row))
+
+        return item
@@ -0,0 +1,253 @@
+"""Property stats repository implementation."""
+
+# pylint: disable=E1101
+
+from datetime import datetime
+from typing import Any, AnyStr, Dict, List, NoReturn, Optional, Tuple
+
+from pydbrepo.drivers.mysql import Mysql
+from pydbrepo.repository.mysql_repository import MysqlRepository
+from pypika import Field
+from pypika import MySQLQuery as Query
+from pypika import Parameter, functions
+
+from src.models import PropertyFilters, PropertyStats
+from src.models.types import PropertyStatus
+from src.ports.repositories import deadline
+
+# Dimension name to property_stats column
+DIMENSION_COLUMNS = {'city': 'city', 'year': 'year', 'status': 'status_id'}
+
+
+class StatsRepository(MysqlRepository):
+    """Property stats class repository.
+
+    `property_stats` keeps the number of properties by (city, year, status) and `property_current_status` the
+    latest status of every property with the city and year it is counted under, both are maintained incrementally
+    from `status_history` rows newer than the high-water mark stored on `aggregate_watermark` and from the
+    properties whose city or year changed.
+    """
+
+    def __init__(self, driver: Mysql):
+        super().__init__(driver=driver, table='property_stats', entity=PropertyStats)
+
+    def lock_watermark(self, name: AnyStr) -> Optional[int]:
+        """Lock and return a high-water mark for the current transaction.
+
+        :param name: Aggregate name
+        :return Optional[int]: Last rolled up status_history id or None if another transaction holds the lock
+        """
+
+        sql = "SELECT last_id FROM aggregate_watermark WHERE name = %s FOR UPDATE SKIP LOCKED"
+        record = self.driver.query_one(sql=sql, args=[name])
+
+        return record[0] if record else None
+
+    def get_watermark(self, name: AnyStr) -> int:
+        """Return a high-water mark without locking it.
+
+        :param name: Aggregate name
+        :return int: Last rolled up status_history id
+        """
+
+        record = self.driver.query_one(sql="SELECT last_id FROM aggregate_watermark WHERE name = %s", args=[name])
+        return record[0] if record else 0
+
+    def find_status_changes(
+        self,
+        after_id: int,
+        limit: int,
+        settle_seconds: float = 0,
+    ) -> List[Tuple[int, int, int, datetime]]:
+        """Status history rows of any status newer than the given id. Ids are assigned on insert but only visible on
+        commit, so the batch stops at the first row recorded less than settle_seconds ago, transactions still
+        writing lower ids get that long to commit before the high-water mark goes past them.
+
+        :param after_id: High-water mark
+        :param limit: Max number of rows
+        :param settle_seconds: Age a row needs before it is rolled up
+        :return List[Tuple]: (id, property_id, status_id, update_date) rows ordered by id
+        """
+
+        sql = (
+            "SELECT id, property_id, status_id, update_date, recorded_at <= NOW(6) - INTERVAL %s SECOND "
+            "FROM status_history WHERE id > %s ORDER BY id LIMIT %s"
+        )
+
+        changes = []
+
+        for record in self.driver.query(sql=sql, args=[settle_seconds, after_id, limit]):
+            if not record[4]:
+                break
+
+            changes.append(tuple(record[:4]))
+
+        return changes
+
+    def find_current_statuses(
+        self,
+        property_ids: List[int],
+    ) -> Dict[int, Tuple[int, datetime, Optional[AnyStr], Optional[int]]]:
+        """Current rolled up status of the given properties.
+
+        :param property_ids: Property ids
+        :return Dict[int, Tuple]: {property_id: (status_id, update_date, city, year)}
+        """
+
+        place_holders = ','.join(['%s'] * len(property_ids))
+        sql = (
+            "SELECT property_id, status_id, update_date, city, year FROM property_current_status "
+            f"WHERE property_id IN ({place_holders})"
+        )
+
+        return {record[0]: tuple(record[1:]) for record in self.driver.query(sql=sql, args=property_ids)}
+
+    def find_moved_properties(self, limit: int) -> List[Tuple[int, int, Optional[AnyStr], Optional[int], AnyStr, int]]:
+        """Properties whose city or year differ from the ones they are counted under.
+
+        :param limit: Max number of properties
+        :return List[Tuple]: (property_id, status_id, counted_city, counted_year, city, year) rows
+        """
+
+        sql = (
+            "SELECT pcs.property_id, pcs.status_id, pcs.city, pcs.year, p.city, p.year "
+            "FROM property_current_status pcs JOIN property p ON p.id = pcs.property_id "
+            "WHERE NOT (pcs.city <=> p.city AND pcs.year <=> p.year) "
+            "ORDER BY pcs.property_id LIMIT %s"
+        )
+
+        return self.driver.query(sql=sql, args=[limit])
+
+    def find_dimensions(self, property_ids: List[int]) -> Dict[int, Tuple[AnyStr, int]]:
+        """Group by values of the given properties.
+
+        :param property_ids: Property ids
+        :return Dict[int, Tuple[AnyStr, int]]: {property_id: (city, year)}
+        """
+
+        place_holders = ','.join(['%s'] * len(property_ids))
+        sql = f"SELECT id, city, year FROM property WHERE id IN ({place_holders})"
+
+        return {record[0]: (record[1], record[2]) for record in self.driver.query(sql=sql, args=property_ids)}
+
+    def apply_rollup(
+        self,
+        name: AnyStr,
+        watermark: int,
+        deltas: Dict[Tuple[AnyStr, int, int], int],
+        current: Dict[int, Tuple[int, datetime, AnyStr, int]],
+    ) -> NoReturn:
+        """Store a rolled up batch: aggregate deltas, current statuses and the new high-water mark.
+
+        :param name: Aggregate name
+        :param watermark: Last status_history id of the batch
+        :param deltas: {(city, year, status_id): delta}
+        :param current: {property_id: (status_id, update_date, city, year)}
+        """
+
+        self._add_deltas(deltas)
+
+        if current:
+            rows = ','.join(['(%s,%s,%s,%s,%s)'] * len(current))
+            values = [value for property_id, status in current.items() for value in (property_id, *status)]
+            sql = (
+                f"INSERT INTO property_current_status (property_id, status_id, update_date, city, year) VALUES {rows} "
+                "ON DUPLICATE KEY UPDATE status_id = VALUES(status_id), update_date = VALUES(update_date), "
+                "city = VALUES(city), year = VALUES(year)"
+            )
+            self.driver.query_none(sql=sql, args=values)
+
+        sql = "UPDATE aggregate_watermark SET last_id = %s, update_date = NOW() WHERE name = %s"
+        self.driver.query_none(sql=sql, args=[watermark, name])
+
+    def apply_moves(self, deltas: Dict[Tuple[AnyStr, int, int], int], dimensions: Dict[int, Tuple[AnyStr, int]]):
+        """Store the aggregate deltas of moved properties and the city and year they are counted under now.
+
+        :param deltas: {(city, year, status_id): delta}
+        :param dimensions: {property_id: (city, year)}
+        """
+
+        self._add_deltas(deltas)
+
+        if not dimensions:
+            return
+
+        rows = ' UNION ALL '.join(
+            ['SELECT %s AS property_id, %s AS city, %s AS year'] + ['SELECT %s,%s,%s'] * (len(dimensions) - 1)
+        )
+        values = [value for property_id, (city, year) in dimensions.items() for value in (property_id, city, year)]
+        sql = (
+            f"UPDATE property_current_status pcs JOIN ({rows}) m ON m.property_id = pcs.property_id "
+            "SET pcs.city = m.city, pcs.year = m.year"
+        )
+        self.driver.query_none(sql=sql, args=values)
+
+    def find_stats(self, group_by: List[AnyStr], filters: PropertyFilters) -> List[Dict[AnyStr, Any]]:
+        """Aggregate property counts by the given dimensions.
+
+        :param group_by: Dimensions (city, year, status)
+        :param filters: Filters over the dimensions (statuses, listed ones by default, cities, year and year ranges)
+        :return List[Dict[AnyStr, Any]]: Rows with the dimension values and their total
+        """
+
+        columns = [Field(DIMENSION_COLUMNS[dimension]).as_(dimension) for dimension in group_by]
+        total = functions.Sum(Field('total'))
+
+        sql_query = Query.from_(self._table).select(*columns, total.as_('total'))
+        sql_query, values = self._add_stats_filters(sql_query, filters)
+
+        if group_by:
+            sql_query = sql_query.groupby(*[Field(DIMENSION_COLUMNS[dimension]) for dimension in group_by])
+            sql_query = sql_query.orderby(*[Field(DIMENSION_COLUMNS[dimension]) for dimension in group_by])
+
+        sql_query = sql_query.having(total > 0)
+        records = deadline.query(self.driver, str(sql_query), values, 'find stats')
+
+        return [dict(zip([*group_by, 'total'], [*record[:-1], int(record[-1])])) for record in records]
+
+    def _add_stats_filters(self, sql_query: Query, filters: PropertyFilters) -> Tuple[Query, List[Any]]:
+        """Add dimension filters to a stats query.
+
+        :param sql_query: Stats query
+        :param filters: Filters over the dimensions
+        :return Tuple[Query, List[Any]]: Filtered query and placeholder values
+        """
+
+        # Buckets of every status are rolled up, only the listed ones are served
+        statuses = [item.value for item in filters.statuses or list(PropertyStatus)]
+
+        sql_query = sql_query.where(Field('status_id').isin(self._placeholders(len(statuses))))
+        values = list(statuses)
+
+        if filters.cities:
+            sql_query = sql_query.where(Field('city').isin(self._placeholders(len(filters.cities))))
+            values.extend(filters.cities)
+
+        if filters.year is not None:
+            sql_query = sql_query.where(Field('year') == Parameter(self.driver.placeholder()))
+            values.append(filters.year)
+
+        if filters.year_min is not None:
+            sql_query = sql_query.where(Field('year') >= Parameter(self.driver.placeholder()))
+            values.append(filters.year_min)
+
+        if filters.year_max is not None:
+            sql_query = sql_query.where(Field('year') <= Parameter(self.driver.placeholder()))
+            values.append(filters.year_max)
+
+        return sql_query, values
+
+    def _add_deltas(self, deltas: Dict[Tuple[AnyStr, int, int], int]):
+        if not deltas:
+            return
+
+        rows = ','.join(['(%s,%s,%s,%s)'] * len(deltas))
+        values = [value for key, delta in deltas.items() for value in (*key, delta)]
+        sql = (
+            f"INSERT INTO property_stats (city, year, status_id, total) VALUES {rows} "
+            "ON DUPLICATE KEY UPDATE total = total + VALUES(total)"
+        )
+        self.driver.query_none(sql=sql, args=values)
+
+    def _placeholders(self, total: int) -> List[Parameter]:
+        return [Parameter(self.driver.placeholder()) for _ in range(total)]
@@ -0,0 +1,22 @@
+"""Property changes feed lambda methods."""
+
+from typing import Any, AnyStr, Dict
+
+from src.commons import http, warmup
+from src.commons.logging import config_logs
+from src.commons.middlewares import limits, request
+from src.handlers import changes
+
+config_logs()
+warmup.on_init()
+
+
+@request.validate()
+@limits.protect()
+def find(*_) -> Dict[AnyStr, Any]:
+    """Incremental feed of property status changes."""
+
+    try:
+        return http.json(body=changes.find())
+    except Exception as error:
+        return http.json_error(error)
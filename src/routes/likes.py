@@ -0,0 +1,33 @@
+"""Likes lambda methods."""
+
+from typing import Any, AnyStr, Dict
+
+from src.commons import http, warmup
+from src.commons.logging import config_logs
+from src.commons.middlewares import limits, request
+from src.handlers import likes
+
+config_logs()
+warmup.on_init()
+
+
+@request.validate()
+@limits.protect()
+def like(*_) -> Dict[AnyStr, Any]:
+    """Like a property."""
+
+    try:
+        return http.json(body=likes.like())
+    except Exception as error:
+        return http.json_error(error)
+
+
+@request.validate()
+@limits.protect()
+def unlike(*_) -> Dict[AnyStr, Any]:
+    """Remove a property like."""
+
+    try:
+        return http.json(body=likes.unlike())
+    except Exception as error:
+        return http.json_error(error)
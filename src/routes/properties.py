@@ -2,19 +2,22 @@
 
 from typing import Any, AnyStr, Dict
 
-from src.commons import http
+from src.commons import http, warmup
 from src.commons.logging import config_logs
-from src.commons.middlewares import request
+from src.commons.middlewares import limits, request
 from src.handlers import properties
 
 config_logs()
+properties.setup()
+warmup.on_init()
 
 
 @request.validate()
+@limits.protect()
 def find(*_) -> Dict[AnyStr, Any]:
     """Filter properties."""
 
     try:
-        return http.json(body=properties.find())
+        return http.content(body=properties.find(), table='properties')
     except Exception as error:
         return http.json_error(error)
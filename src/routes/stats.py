@@ -0,0 +1,31 @@
+"""Property stats lambda methods."""
+
+from typing import Any, AnyStr, Dict
+
+from src.commons import http, warmup
+from src.commons.logging import config_logs, logger
+from src.commons.middlewares import limits, request
+from src.handlers import stats
+
+config_logs()
+warmup.on_init()
+
+
+@request.validate()
+@limits.protect()
+def find(*_) -> Dict[AnyStr, Any]:
+    """Count properties grouped by city, year and current status."""
+
+    try:
+        return http.json(body=stats.find())
+    except Exception as error:
+        return http.json_error(error)
+
+
+def refresh(*_) -> Dict[AnyStr, Any]:
+    """Scheduled roll up of the stats aggregates."""
+
+    result = stats.refresh()
+    logger.fields(result).info('stats refresh finished')
+
+    return result
@@ -0,0 +1,3 @@
+"""Export resources."""
+
+from .properties import PROPERTY_IMPORT_SCHEMA
@@ -0,0 +1,53 @@
+"""Properties JSON schemas."""
+
+PROPERTY_IMPORT_SCHEMA = {
+    '$schema': 'http://json-schema.org/draft-07/schema#',
+    'type': 'object',
+    'required': ['id', 'address', 'city', 'price', 'year'],
+    'properties': {
+        'id': {
+            'type': 'integer',
+            'minimum': 1,
+        },
+        'address': {
+            'type': 'string',
+            'minLength': 1,
+            'maxLength': 120,
+        },
+        'city': {
+            'type': 'string',
+            'minLength': 1,
+            'maxLength': 32,
+        },
+        'price': {
+            'type': 'integer',
+            'minimum': 0,
+        },
+        'description': {
+            'type': ['string', 'null'],
+        },
+        'year': {
+            'type': 'integer',
+            'minimum': 1800,
+            'maximum': 2100,
+        },
+        'latitude': {
+            'type': ['number', 'null'],
+            'minimum': -90,
+            'maximum': 90,
+        },
+        'longitude': {
+            'type': ['number', 'null'],
+            'minimum': -180,
+            'maximum': 180,
+        },
+        'status_id': {
+            'type': ['integer', 'null'],
+            'enum': [3, 4, 5, None],
+        },
+        'update_date': {
+            'type': ['string', 'null'],
+            'pattern': r'^\d{4}-\d{2}-\d{2}([ T]\d{2}:\d{2}:\d{2})?$',
+        },
+    },
+}
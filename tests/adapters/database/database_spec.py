@@ -0,0 +1,83 @@
+"""Database routing specs."""
+
+from expects import equal, expect
+from mamba import before, description, it
+from mysql.connector.errors import OperationalError
+
+from src.adapters.database import ReplicaRouter
+
+
+class FakeDatabase:
+    """Database instance stand-in."""
+
+    def __init__(self, name, lag=0, fail=False):
+        self.name = name
+        self.lag = lag
+        self.fail = fail
+        self.queries = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        return False
+
+    def query_one(self, **_):
+        return (self.lag, )
+
+    def find(self):
+        if self.fail:
+            raise OperationalError('connection lost')
+
+        self.queries += 1
+        return self.name
+
+
+with description('ReplicaRouter') as self:
+
+    with before.each:
+        self.databases = {
+            'mysql://primary': FakeDatabase('primary'),
+            'mysql://replica-1': FakeDatabase('replica-1'),
+            'mysql://replica-2': FakeDatabase('replica-2'),
+        }
+
+        def connect(url, **_):
+            return self.databases[url]
+
+        self.router = lambda **kwargs: ReplicaRouter(
+            primary_url='mysql://primary',
+            replica_urls=['mysql://replica-1', 'mysql://replica-2'],
+            connect=connect,
+            **kwargs,
+        )
+
+    with it('balances reads between replicas with round robin'):
+        router = self.router(balancing='round_robin')
+        served = [router.read(lambda driver: driver.find()) for _ in range(4)]
+
+        expect(sorted(served)).to(equal(['replica-1', 'replica-1', 'replica-2', 'replica-2']))
+        expect(self.databases['mysql://primary'].queries).to(equal(0))
+
+    with it('fails over to the primary and skips the failed replica'):
+        self.databases['mysql://replica-1'].fail = True
+        router = self.router(balancing='round_robin', retry_after=60)
+        served = [router.read(lambda driver: driver.find()) for _ in range(4)]
+
+        expect(served.count('replica-1')).to(equal(0))
+        expect(served.count('primary')).to(equal(1))
+
+    with it('does not read from replicas over the max lag'):
+        self.databases['mysql://replica-1'].lag = 30
+        self.databases['mysql://replica-2'].lag = 40
+        router = self.router(max_lag=5, lag_check_interval=60)
+        served = [router.read(lambda driver: driver.find()) for _ in range(3)]
+
+        expect(served).to(equal(['primary'] * 3))
+
+    with it('does not read from replicas without replication heartbeat'):
+        self.databases['mysql://replica-1'].lag = None
+        self.databases['mysql://replica-2'].lag = None
+        router = self.router(max_lag=5, lag_check_interval=60)
+
+        expect(router.read(lambda driver: driver.find())).to(equal('primary'))
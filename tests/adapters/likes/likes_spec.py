@@ -0,0 +1,103 @@
+"""Likes adapter specs."""
+
+from expects import equal, expect, raise_error
+from mamba import after, before, description, it
+from mysql.connector.errors import IntegrityError
+
+from src.adapters.database import ReplicaRouter
+from src.adapters.database import database as database_module
+from src.adapters.likes import likes
+from src.commons.errors import NotFoundError
+
+
+class FakeDatabase:
+    """Primary database stand-in with the liked table of the given properties."""
+
+    def __init__(self, property_ids):
+        self.property_ids = set(property_ids)
+        self.liked = set()
+        self.history = 0
+        self.commits = 0
+
+    def __call__(self, **_):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        return False
+
+    @staticmethod
+    def placeholder(**_):
+        return '%s'
+
+    def get_real_driver(self):
+        return self
+
+    def cursor(self):
+        return self
+
+    def execute(self, sql, args):
+        self.rowcount = int(tuple(args) in self.liked)  # pylint: disable=attribute-defined-outside-init
+        self.query_none(sql, args)
+
+    def close(self):
+        pass
+
+    def query_none(self, sql, args):
+        if sql.startswith('INSERT INTO liked ('):
+            if args[0] not in self.property_ids:
+                raise IntegrityError(msg='foreign key constraint fails', errno=1452)
+
+            if tuple(args) in self.liked:
+                raise IntegrityError(msg='duplicate entry', errno=1062)
+
+            self.liked.add(tuple(args))
+        elif sql.startswith('DELETE FROM liked'):
+            self.liked.discard(tuple(args))
+        elif 'liked_history' in sql:
+            self.history += len(args) // 4
+
+    def query_one(self, sql, args):
+        position = 0 if 'property_id' in sql else 1
+        return (sum(1 for like in self.liked if like[position] == args[0]), )
+
+    def commit(self):
+        self.commits += 1
+
+
+with description('likes adapter') as self:
+
+    with before.each:
+        self.database = FakeDatabase(property_ids=[1, 2])
+        self.router = database_module.ROUTER
+        database_module.ROUTER = ReplicaRouter(primary_url='mysql://primary', replica_urls=[], connect=self.database)
+
+        for cache in (likes.PROPERTY_LIKES, likes.USER_LIKES):
+            cache.clear()
+
+    with after.each:
+        database_module.ROUTER = self.router
+
+    with it('counts a like once and records it in history with the like commit'):
+        likes.like_property(7, 1)
+        result = likes.like_property(7, 1)
+
+        expect((result['liked'], result['likes'], result['user_likes'])).to(equal((True, 1, 1)))
+        expect((self.database.history, self.database.commits)).to(equal((1, 2)))
+
+    with it('removes likes'):
+        likes.like_property(7, 1)
+        likes.like_property(8, 1)
+        result = likes.unlike_property(7, 1)
+        again = likes.unlike_property(7, 1)
+
+        expect((result['liked'], result['likes'], result['user_likes'])).to(equal((False, 1, 0)))
+        expect((again['likes'], self.database.history)).to(equal((1, 3)))
+
+    with it('does not like properties that do not exist'):
+        expect(lambda: likes.like_property(7, 404)).to(raise_error(NotFoundError))
+
+        expect(self.database.liked).to(equal(set()))
+        expect(self.database.history).to(equal(0))
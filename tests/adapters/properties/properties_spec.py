@@ -0,0 +1,107 @@
+"""Properties adapter specs."""
+
+import threading
+import time
+
+from expects import be, equal, expect
+from mamba import after, before, description, it
+
+from src.adapters.database import ReplicaRouter
+from src.adapters.database import database as database_module
+from src.adapters.properties import properties
+from src.models import PropertyFilters
+
+
+class FakeSearchIndex:
+    """Local search index stand-in that ranks the given ids and records the requested limits."""
+
+    def __init__(self, doc_ids):
+        self.doc_ids = doc_ids
+        self.limits = []
+
+    def search(self, _, limit=None):
+        self.limits.append(limit)
+        return [(doc_id, 1.0) for doc_id in self.doc_ids][:limit]
+
+
+class FakeLocations:
+    """Database and repository stand-in that serves property locations, reads block until released."""
+
+    def __init__(self, locations):
+        self.locations = locations
+        self.release = threading.Event()
+        self.release.set()
+        self.reads = 0
+
+    def __call__(self, **_):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        return False
+
+    def query(self, sql, args):
+        self.reads += 1
+        self.release.wait(2)
+        return [location for location in self.locations if location[0] > args[0]][:args[1]]
+
+    def iter_locations(self):
+        self.reads += 1
+        return iter(self.locations)
+
+
+with description('properties local search') as self:
+
+    with before.each:
+        self.index = FakeSearchIndex(list(range(1, 11)))
+        self.limit = properties.SEARCH_MAX_RESULTS
+        properties._SEARCH_INDEX = self.index  # pylint: disable=protected-access
+        properties.SEARCH_MAX_RESULTS = 3
+
+    with after.each:
+        properties._SEARCH_INDEX = None  # pylint: disable=protected-access
+        properties.SEARCH_MAX_RESULTS = self.limit
+
+    with it('only keeps the best ranked ids'):
+        filters = properties._apply_local_search(PropertyFilters(q='piscina'))  # pylint: disable=protected-access
+
+        expect(self.index.limits).to(equal([3]))
+        expect(filters.ids).to(equal([1, 2, 3]))
+        expect(filters.q).to(equal(None))
+
+with description('properties geo index') as self:
+
+    with before.each:
+        self.database = FakeLocations([(1, 4.711, -74.0721)])
+        self.router = database_module.ROUTER
+        database_module.ROUTER = ReplicaRouter(primary_url='mysql://primary', replica_urls=[], connect=self.database)
+
+    with after.each:
+        database_module.ROUTER = self.router
+        properties._GEO_INDEX = None  # pylint: disable=protected-access
+
+    with it('loads the index once and reuses it while it is fresh'):
+        index = properties._get_geo_index(self.database)  # pylint: disable=protected-access
+
+        expect(properties._get_geo_index(self.database)).to(be(index))  # pylint: disable=protected-access
+        expect(len(index)).to(equal(1))
+        expect(self.database.reads).to(equal(1))
+
+    with it('serves the loaded index while it is reloaded in background'):
+        index = properties._get_geo_index(self.database)  # pylint: disable=protected-access
+        properties._GEO_INDEX_LOADED_AT -= properties.GEO_INDEX_TTL  # pylint: disable=protected-access
+        self.database.locations.append((2, 6.2442, -75.5812))
+        self.database.release.clear()
+
+        expect(properties._get_geo_index(self.database)).to(be(index))  # pylint: disable=protected-access
+        expect(properties._get_geo_index(self.database)).to(be(index))  # pylint: disable=protected-access
+
+        self.database.release.set()
+        limit = time.monotonic() + 2
+
+        while properties._GEO_INDEX is index and time.monotonic() < limit:  # pylint: disable=protected-access
+            time.sleep(0.001)
+
+        expect(len(properties._get_geo_index(self.database))).to(equal(2))  # pylint: disable=protected-access
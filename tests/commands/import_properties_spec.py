@@ -0,0 +1,131 @@
+"""Properties import command specs."""
+
+import json
+import os
+import tempfile
+
+from expects import equal, expect, raise_error
+from mamba import after, before, description, it
+
+from src.commands.import_properties import PropertiesImporter
+from src.ports.repositories.properties_repository import UPSERT_COLUMNS
+
+FAILING_PRICE = 13
+
+
+class Crash(BaseException):
+    """Process interruption, it is not handled by the importer."""
+
+
+class FakeDatabase:
+    """Transactional database stand-in keeping the committed properties by id."""
+
+    def __init__(self, crash_on_commit=None):
+        self.properties = {}
+        self.commits = 0
+        self.crash_on_commit = crash_on_commit
+
+        self._pending = {}
+
+    def __call__(self, **_):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        return False
+
+    def query_none(self, sql, args):
+        if not sql.startswith('INSERT INTO property'):
+            return
+
+        size = len(UPSERT_COLUMNS)
+
+        for index in range(0, len(args), size):
+            record = dict(zip(UPSERT_COLUMNS, args[index:index + size]))
+
+            if record['price'] == FAILING_PRICE:
+                raise ValueError('constraint failed')
+
+            self._pending[record['id']] = record
+
+    def commit(self):
+        self.commits += 1
+
+        if self.commits == self.crash_on_commit:
+            self._pending = {}
+            raise Crash()
+
+        self.properties.update(self._pending)
+        self._pending = {}
+
+    def rollback(self):
+        self._pending = {}
+
+
+def record(property_id, **values):
+    return {'id': property_id, 'address': 'calle 1', 'city': 'bogota', 'price': 100, 'year': 2000, **values}
+
+
+with description('PropertiesImporter') as self:
+
+    with before.each:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'properties.jsonl')
+
+        def write(lines):
+            with open(self.path, 'w', encoding='utf-8') as file:
+                file.write(''.join(f'{line}\n' for line in lines))
+
+        def importer(database, chunk_size=2):
+            return PropertiesImporter(
+                path=self.path,
+                file_format='jsonl',
+                chunk_size=chunk_size,
+                checkpoint_path=f'{self.path}.checkpoint',
+                rejected_path=f'{self.path}.rejected.jsonl',
+                connect=database,
+            )
+
+        def rejected():
+            with open(f'{self.path}.rejected.jsonl', encoding='utf-8') as file:
+                return [json.loads(line) for line in file]
+
+        self.write, self.importer, self.rejected = write, importer, rejected
+
+    with after.each:
+        self.tmp.cleanup()
+
+    with it('isolates the failing records of a chunk by splitting it'):
+        self.write([json.dumps(record(item, price=FAILING_PRICE if item == 3 else 100)) for item in range(1, 5)])
+        database = FakeDatabase()
+
+        summary = self.importer(database, chunk_size=4).run()
+
+        expect(sorted(database.properties)).to(equal([1, 2, 4]))
+        expect((summary['imported'], summary['rejected'])).to(equal((3, 1)))
+        expect([(row['line'], row['error']) for row in self.rejected()]).to(equal([(3, 'constraint failed')]))
+
+    with it('writes invalid records to the rejected rows file'):
+        self.write([json.dumps(record(1)), '{not json', json.dumps(record(3, year=1500))])
+        database = FakeDatabase()
+
+        summary = self.importer(database).run()
+
+        expect(sorted(database.properties)).to(equal([1]))
+        expect(summary['rejected']).to(equal(2))
+        expect([row['line'] for row in self.rejected()]).to(equal([2, 3]))
+
+    with it('resumes from the last checkpoint after a crash'):
+        self.write([json.dumps(record(1)), '{not json', *(json.dumps(record(item)) for item in range(3, 7))])
+        database = FakeDatabase(crash_on_commit=2)
+
+        expect(self.importer(database).run).to(raise_error(Crash))
+        expect(sorted(database.properties)).to(equal([1, 3]))
+
+        summary = self.importer(database).run()
+
+        expect(sorted(database.properties)).to(equal([1, 3, 4, 5, 6]))
+        expect((summary['line'], summary['imported'], summary['rejected'])).to(equal((6, 5, 1)))
+        expect([row['line'] for row in self.rejected()]).to(equal([2]))
@@ -0,0 +1,36 @@
+"""Batch buffer specs."""
+
+from expects import equal, expect, raise_error
+from mamba import before, description, it
+
+from src.commons.batching import BatchBuffer
+
+with description('BatchBuffer') as self:
+
+    with before.each:
+        self.batches = []
+        self.buffer = BatchBuffer(name='spec', flush_fn=self.batches.append, max_size=3, max_wait=60)
+
+    with it('flushes all items in one batch when max size is reached'):
+        for item in range(4):
+            self.buffer.add(item)
+
+        expect(self.batches).to(equal([[0, 1, 2]]))
+        expect(len(self.buffer)).to(equal(1))
+
+    with it('flushes pending items on demand'):
+        self.buffer.add('a')
+
+        expect(self.buffer.flush()).to(equal(1))
+        expect(self.batches).to(equal([['a']]))
+
+    with it('keeps items on the buffer when the flush fails'):
+
+        def fail(_):
+            raise ValueError('db down')
+
+        buffer = BatchBuffer(name='failing', flush_fn=fail, max_size=10, max_wait=60)
+        buffer.add('a')
+
+        expect(buffer.flush).to(raise_error(ValueError))
+        expect(len(buffer)).to(equal(1))
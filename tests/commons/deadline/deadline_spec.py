@@ -0,0 +1,45 @@
+"""Request deadline specs."""
+
+from expects import be_above, be_below, be_none, equal, expect, raise_error
+from mamba import after, description, it
+
+from src.commons import deadline
+from src.commons.errors import DeadlineExceededError
+
+
+class FakeLambdaContext:
+    """Lambda context stand-in."""
+
+    def __init__(self, remaining_ms):
+        self.remaining_ms = remaining_ms
+
+    def get_remaining_time_in_millis(self):
+        return self.remaining_ms
+
+
+with description('deadline') as self:
+
+    with after.each:
+        deadline.clear()
+
+    with it('derives timeouts from the Lambda remaining time'):
+        deadline.start(FakeLambdaContext(3000))
+
+        expect(deadline.timeout('query')).to(be_above(2))
+        expect(deadline.timeout('query')).to(be_below(2.6))
+        expect(deadline.timeout('query', limit=1)).to(equal(1))
+
+    with it('raises with timing details once the deadline passed'):
+        deadline.start(FakeLambdaContext(100))
+
+        expect(lambda: deadline.timeout('find properties')).to(raise_error(DeadlineExceededError))
+
+        cause = deadline.exceeded('find properties').root_causes[0]
+        expect(cause['operation']).to(equal('find properties'))
+        expect(cause['budget_ms']).to(equal(0))
+
+    with it('has no timeout without Lambda context'):
+        deadline.start(None)
+
+        expect(deadline.timeout('query')).to(be_none)
+        expect(deadline.timeout('query', limit=5)).to(equal(5))
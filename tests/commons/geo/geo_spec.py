@@ -0,0 +1,34 @@
+"""Geospatial index specs."""
+
+import random
+
+from expects import be_below, equal, expect
+from mamba import description, it
+
+from src.commons.geo import build_grid, haversine_km
+
+BOGOTA = (4.711, -74.0721)
+MEDELLIN = (6.2442, -75.5812)
+
+with description('Geospatial grid index'):
+
+    with it('computes great-circle distances'):
+        expect(abs(haversine_km(*BOGOTA, *MEDELLIN) - 238.7)).to(be_below(0.5))
+
+    with it('finds the same points as a full scan ordered by distance'):
+        rand = random.Random(7)
+        points = [(item_id, rand.uniform(3.5, 7.5), rand.uniform(-76.5, -73)) for item_id in range(2000)]
+        index = build_grid(points, cell_size=0.02)
+
+        found = index.within(*BOGOTA, 30)
+        expected = sorted(
+            (haversine_km(*BOGOTA, lat, lon), item_id) for item_id, lat, lon in points
+            if haversine_km(*BOGOTA, lat, lon) <= 30
+        )
+
+        expect([item_id for item_id, _ in found]).to(equal([item_id for _, item_id in expected]))
+
+    with it('finds points across the antimeridian'):
+        index = build_grid([(1, 0.0, 179.95), (2, 0.0, -179.95), (3, 0.0, 170.0)])
+
+        expect(sorted(item_id for item_id, _ in index.within(0.0, 179.99, 20))).to(equal([1, 2]))
@@ -0,0 +1,88 @@
+"""Http response formats specs."""
+
+import base64
+import json
+
+import msgpack
+from expects import be, equal, expect
+from mamba import after, before, description, it
+
+from src.commons import context, http, masking
+from src.commons.errors import BadRequestError
+from src.commons.http import http as http_module
+from src.commons.types import CaseInsensitiveMapping
+
+ROWS = [{'id': 1, 'city': 'cali', 'price': 10}, {'id': 2, 'city': 'bogota', 'year': 2000}]
+
+with description('http content negotiation') as self:
+
+    with before.each:
+        self.request = lambda accept: context.set_value(
+            'request', {
+                'headers': CaseInsensitiveMapping({'Accept': accept}),
+                'path': '/',
+                'method': 'GET'
+            }
+        )
+
+    with after.each:
+        context.reset()
+
+    with it('chooses the supported media type with the highest quality'):
+        expect(http.negotiate(None)).to(equal(http.JSON))
+        expect(http.negotiate('text/html, application/msgpack')).to(equal(http.MSGPACK))
+        expect(http.negotiate('application/msgpack;q=0.5, application/vnd.columnar+json')).to(equal(http.COLUMNAR_JSON))
+        expect(http.negotiate('application/msgpack;q=0, text/html')).to(equal(http.JSON))
+
+    with it('sends rows as columns on columnar json'):
+        self.request(http.COLUMNAR_JSON)
+        res = http.content(body={'properties': ROWS}, table='properties')
+
+        expect(res['headers']['Content-Type']).to(equal(http.COLUMNAR_JSON))
+        expect(json.loads(res['body'])).to(
+            equal(
+                {
+                    'properties': {
+                        'columns': ['id', 'city', 'price', 'year'],
+                        'rows': [[1, 'cali', 10, None], [2, 'bogota', None, 2000]],
+                    }
+                }
+            )
+        )
+
+    with it('encodes msgpack responses as base64 binary bodies'):
+        self.request('application/x-msgpack')
+        res = http.content(body={'properties': ROWS}, table='properties')
+
+        expect(res['isBase64Encoded']).to(equal(True))
+        expect(msgpack.unpackb(base64.b64decode(res['body']))['properties']['columns']
+               ).to(equal(['id', 'city', 'price', 'year']))
+
+with description('http.json_error'):
+
+    with before.each:
+        context.set_value('request', {'headers': CaseInsensitiveMapping({}), 'path': '/', 'method': 'GET'})
+
+    with after.each:
+        context.reset()
+
+    with it('serves client errors with the same body as the full error path'):
+        error = BadRequestError(root_causes=[{'param': 'year', 'message': 'should be an integer'}])
+
+        fast = http.json_error(error)
+        again = http.json_error(BadRequestError(root_causes=[{'param': 'year', 'message': 'should be an integer'}]))
+
+        expect(fast).to(equal(http.json(code=400, error=error)))
+        expect(again['body']).to(be(fast['body']))
+
+    with it('logs client error bodies through the masker'):
+        logged = []
+        log_request_data = http_module._log_request_data  # pylint: disable=protected-access
+        http_module._log_request_data = logged.append  # pylint: disable=protected-access
+
+        try:
+            http.json_error(BadRequestError(root_causes=[{'param': 'user', 'password': 'secret'}]))
+        finally:
+            http_module._log_request_data = log_request_data  # pylint: disable=protected-access
+
+        expect(logged[0]['root_causes']).to(equal([{'param': 'user', 'password': masking.MASK}]))
@@ -0,0 +1,37 @@
+"""Async log pipeline specs."""
+
+import io
+import logging
+
+from expects import be_true, contain, equal, expect
+from mamba import before, description, it
+
+from src.commons.logging.pipeline import AsyncBatchHandler
+
+
+def _record(message):
+    return logging.LogRecord('spec', logging.INFO, __file__, 0, message, None, None)
+
+
+with description('AsyncBatchHandler') as self:
+
+    with before.each:
+        self.stream = io.StringIO()
+        self.target = logging.StreamHandler(self.stream)
+
+    with it('writes every buffered record on flush'):
+        handler = AsyncBatchHandler([self.target], batch_size=10, flush_interval=60)
+
+        for index in range(3):
+            handler.emit(_record(f'message {index}'))
+
+        expect(handler.flush()).to(be_true)
+        expect(self.stream.getvalue()).to(equal('message 0\nmessage 1\nmessage 2\n'))
+
+    with it('drops and counts records when the buffer is full'):
+        handler = AsyncBatchHandler([self.target], capacity=0)
+        handler.emit(_record('lost'))
+
+        expect(handler.dropped).to(equal(1))
+        expect(handler.flush()).to(be_true)
+        expect(self.stream.getvalue()).to(contain('log records dropped'))
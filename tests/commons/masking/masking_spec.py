@@ -0,0 +1,33 @@
+"""Masking specs."""
+
+from expects import be, equal, expect
+from mamba import before, description, it
+
+from src.commons.masking import MASK, Masker
+
+with description('Masker') as self:
+
+    with before.each:
+        self.masker = Masker({'password'}, safe_shapes=[{'id', 'city'}])
+
+    with it('masks nested protected keys without mutating the original'):
+        data = {'user': {'name': 'ana', 'password': 'secret'}, 'items': [{'password': 'other'}, 1]}
+        masked = self.masker.mask(data)
+
+        expect(masked).to(equal({'user': {'name': 'ana', 'password': MASK}, 'items': [{'password': MASK}, 1]}))
+        expect(data['user']['password']).to(equal('secret'))
+        expect(data['items'][0]['password']).to(equal('other'))
+
+    with it('returns the same objects for subtrees without protected keys'):
+        data = {'user': {'password': 'secret'}, 'properties': [{'id': 1, 'city': 'cali'}], 'meta': {'page': 1}}
+        masked = self.masker.mask(data)
+
+        expect(masked['properties']).to(be(data['properties']))
+        expect(masked['meta']).to(be(data['meta']))
+        expect(self.masker.mask(data['meta'])).to(be(data['meta']))
+
+    with it('masks nested values of dicts with a safe shape'):
+        data = {'id': 1, 'city': {'password': 'secret'}}
+
+        expect(self.masker.mask(data)).to(equal({'id': 1, 'city': {'password': MASK}}))
+        expect(self.masker.mask({'id': 1, 'city': 'cali'})).to(equal({'id': 1, 'city': 'cali'}))
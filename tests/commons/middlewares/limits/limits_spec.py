@@ -0,0 +1,58 @@
+"""Rate limit and load shedding specs."""
+
+import time
+
+from expects import be_above, be_below, be_none, equal, expect
+from mamba import before, description, it
+
+from src.commons import metrics
+from src.commons.middlewares.limits import LoadShedder, RateLimiter
+
+with description('RateLimiter') as self:
+
+    with it('allows bursts up to the bucket size per client'):
+        limiter = RateLimiter(rate=1, burst=3)
+        waits = [limiter.acquire('user:1') for _ in range(4)]
+
+        expect(waits[:3]).to(equal([0.0, 0.0, 0.0]))
+        expect(waits[3]).to(be_above(0))
+        expect(limiter.acquire('user:2')).to(equal(0.0))
+
+with description('LoadShedder') as self:
+
+    with before.each:
+        metrics.reset()
+
+    with it('sheds requests over the max in flight'):
+        shedder = LoadShedder(max_in_flight=1, max_db_wait=0)
+
+        expect(shedder.enter()).to(be_none)
+        expect(shedder.enter()).to(equal('too many requests in flight'))
+
+        shedder.leave()
+        expect(shedder.enter()).to(be_none)
+
+    with it('sheds requests while database connections are slow'):
+        shedder = LoadShedder(max_in_flight=0, max_db_wait=0.5, probe_interval=60)
+        metrics.observe('database.connect_seconds', 2)
+
+        expect(shedder.enter()).to(be_none)
+        expect(shedder.enter()).to(equal('database saturated'))
+
+    with it('recovers through probe requests once connections are fast again'):
+        shedder = LoadShedder(max_in_flight=0, max_db_wait=0.5, probe_interval=0.01)
+        metrics.observe('database.connect_seconds', 2)
+
+        # Seven fast connections bring the moving average from 2s under 0.5s
+        for _ in range(7):
+            expect(shedder.enter()).to(be_none)
+            expect(shedder.enter()).to(equal('database saturated'))
+
+            # Fast connection opened by the probe
+            metrics.observe('database.connect_seconds', 0.01)
+            shedder.leave()
+            time.sleep(0.011)
+
+        expect(metrics.gauge('database.connect_seconds')).to(be_below(0.5))
+        expect(shedder.enter()).to(be_none)
+        expect(shedder.enter()).to(be_none)
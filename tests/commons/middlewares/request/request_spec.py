@@ -0,0 +1,39 @@
+"""Request middleware specs."""
+
+from expects import equal, expect
+from mamba import after, before, description, it
+
+from src.commons.middlewares.request import request
+
+
+class Recorder:
+    """Callable stand-in that records its calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+
+
+with description('request pending writes flush') as self:
+
+    with before.each:
+        self.originals = request.batching.FLUSH_ON_RETURN, request.batching.flush_all, request.flush_logs
+        self.flush_all, self.flush_logs = Recorder(), Recorder()
+        request.batching.flush_all, request.flush_logs = self.flush_all, self.flush_logs
+
+    with after.each:
+        request.batching.FLUSH_ON_RETURN, request.batching.flush_all, request.flush_logs = self.originals
+
+    with it('flushes the write buffers and the logs before returning'):
+        request.batching.FLUSH_ON_RETURN = True
+        request._flush_pending_writes()  # pylint: disable=protected-access
+
+        expect((self.flush_all.calls, self.flush_logs.calls)).to(equal((1, 1)))
+
+    with it('flushes the logs when the write buffers are flushed in background'):
+        request.batching.FLUSH_ON_RETURN = False
+        request._flush_pending_writes()  # pylint: disable=protected-access
+
+        expect((self.flush_all.calls, self.flush_logs.calls)).to(equal((0, 1)))
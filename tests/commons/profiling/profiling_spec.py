@@ -0,0 +1,65 @@
+"""Request profiling specs."""
+
+import os
+import pstats
+import tempfile
+import time
+
+from expects import be_none, contain, equal, expect, start_with
+from mamba import after, before, description, it
+
+from src.commons import profiling
+from src.commons.profiling import profiling as profiling_module
+
+
+def busy_handler():
+    deadline = time.perf_counter() + 0.05
+
+    while time.perf_counter() < deadline:
+        pass
+
+    return {'statusCode': 200, 'headers': {}}
+
+
+with description('profiling') as self:
+
+    with before.each:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.settings = (
+            profiling_module.PROFILING_ENABLED, profiling_module.PROFILING_USERS, profiling_module.PROFILING_STORE
+        )
+        profiling_module.PROFILING_ENABLED = True
+        profiling_module.PROFILING_USERS = {'7'}
+        profiling_module.PROFILING_STORE = f'file://{self.tmp.name}'
+
+    with after.each:
+        (
+            profiling_module.PROFILING_ENABLED, profiling_module.PROFILING_USERS, profiling_module.PROFILING_STORE
+        ) = self.settings
+        self.tmp.cleanup()
+
+    with it('only profiles requests of allowed users'):
+        expect(profiling.requested_mode({'x-profile': 'sampling', 'x-user-id': '7'})).to(equal('sampling'))
+        expect(profiling.requested_mode({'x-profile': 'true', 'x-user-id': '7'})).to(equal('cprofile'))
+        expect(profiling.requested_mode({'x-profile': 'sampling', 'x-user-id': '8'})).to(be_none)
+
+    with it('stores a pstats profile keyed by trace id'):
+        res = profiling.profile('cprofile', 'trace-1', busy_handler)
+        stats = pstats.Stats(res['headers']['X-Profile-Key'])
+
+        expect(res['headers']['X-Profile-Key']).to(equal(f'{self.tmp.name}/trace-1.pstats'))
+        expect(str([name for _, _, name in stats.stats])).to(contain('busy_handler'))
+
+    with it('stores collapsed stacks with the sampling profiler'):
+        res = profiling.profile('sampling', 'trace-2', busy_handler)
+
+        with open(res['headers']['X-Profile-Key'], encoding='utf-8') as file:
+            expect(file.read()).to(contain('busy_handler (profiling_spec.py'))
+
+    with it('does not use unsafe trace ids as profile names'):
+        res = profiling.profile('cprofile', '../../escaped', busy_handler)
+        key = res['headers']['X-Profile-Key']
+
+        expect(os.path.dirname(key)).to(equal(self.tmp.name))
+        expect(os.path.basename(key)).not_to(start_with('.'))
+        expect(profiling.profile_id_of('../x')).not_to(contain('/'))
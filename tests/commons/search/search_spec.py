@@ -0,0 +1,43 @@
+"""Local search index specs."""
+
+import os
+import tempfile
+
+from expects import be_empty, equal, expect
+from mamba import after, before, description, it
+
+from src.commons.search import InvertedIndex, build_index, tokenize
+
+DOCUMENTS = [
+    (10, 'Apartamento con balcón y piscina, calle 10'),
+    (20, 'Casa campestre con jardín y piscina climatizada, piscina para niños'),
+    (30, 'Estudio en el centro'),
+]
+
+with description('Local search index') as self:
+
+    with before.each:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'properties.idx')
+        build_index(DOCUMENTS, self.path)
+        self.index = InvertedIndex(self.path)
+
+    with after.each:
+        self.index.close()
+        self.tmp.cleanup()
+
+    with it('normalizes tokens removing accents and stop words'):
+        expect(tokenize('Balcón con Jardín')).to(equal(['balcon', 'jardin']))
+
+    with it('ranks documents with higher term frequency first'):
+        ids = [doc_id for doc_id, _ in self.index.search('piscina')]
+
+        expect(ids).to(equal([20, 10]))
+
+    with it('matches any of the query terms'):
+        ids = sorted(doc_id for doc_id, _ in self.index.search('jardin centro'))
+
+        expect(ids).to(equal([20, 30]))
+
+    with it('returns nothing for unknown terms'):
+        expect(self.index.search('penthouse')).to(be_empty)
@@ -0,0 +1,143 @@
+"""Single flight specs."""
+
+import threading
+import time
+
+from expects import be_above, be_below, equal, expect, raise_error
+from mamba import before, description, it
+
+from src.commons import deadline, metrics
+from src.commons.deadline.deadline import DEADLINE_MARGIN
+from src.commons.errors import DeadlineExceededError
+from src.commons.singleflight import SingleFlight
+
+
+class FakeLambdaContext:
+    """Lambda context stand-in with the given remaining seconds."""
+
+    def __init__(self, remaining):
+        self.remaining = remaining
+
+    def get_remaining_time_in_millis(self):
+        return self.remaining * 1000
+
+
+def _wait_for_waiters(flight, key, waiters):
+    deadline = time.monotonic() + 2
+
+    while time.monotonic() < deadline:
+        call = flight._calls.get(key, None)  # pylint: disable=protected-access
+
+        if call is not None and call.waiters >= waiters:
+            return
+
+        time.sleep(0.001)
+
+
+with description('SingleFlight') as self:
+
+    with before.each:
+        metrics.reset()
+        self.release = threading.Event()
+        self.executions = []
+
+    with it('shares one execution between concurrent calls with the same key'):
+        flight = SingleFlight('spec', timeout=2)
+        results = []
+
+        def query():
+            self.executions.append(1)
+            self.release.wait(2)
+            return ['result']
+
+        threads = [threading.Thread(target=lambda: results.append(flight.do('key', query))) for _ in range(5)]
+
+        for thread in threads:
+            thread.start()
+
+        _wait_for_waiters(flight, 'key', 4)
+        self.release.set()
+
+        for thread in threads:
+            thread.join()
+
+        expect(len(self.executions)).to(equal(1))
+        expect(results).to(equal([['result']] * 5))
+        expect(metrics.get('singleflight.spec.coalesced')).to(equal(4))
+
+    with it('runs the function again when the in flight call times out'):
+        flight = SingleFlight('spec', timeout=0.01)
+        leader = threading.Thread(target=lambda: flight.do('key', lambda: self.release.wait(2)))
+        leader.start()
+
+        _wait_for_waiters(flight, 'key', 0)
+        expect(flight.do('key', lambda: 'own')).to(equal('own'))
+        expect(metrics.get('singleflight.spec.timeouts')).to(equal(1))
+
+        self.release.set()
+        leader.join()
+
+    with it('stops waiting for the in flight call when the request deadline is reached'):
+        flight = SingleFlight('spec', timeout=5)
+        leader = threading.Thread(target=lambda: flight.do('key', lambda: self.release.wait(2)))
+        leader.start()
+
+        _wait_for_waiters(flight, 'key', 0)
+        deadline.start(FakeLambdaContext(DEADLINE_MARGIN + 0.05))
+        started_at = time.monotonic()
+
+        try:
+            expect(lambda: flight.do('key', lambda: 'own')).to(raise_error(DeadlineExceededError))
+            expect(time.monotonic() - started_at).to(be_below(1))
+        finally:
+            deadline.clear()
+            self.release.set()
+            leader.join()
+
+    with it('keeps the deadline of every thread apart'):
+        deadline.start(FakeLambdaContext(DEADLINE_MARGIN + 60))
+        remaining = []
+
+        def short_request():
+            deadline.start(FakeLambdaContext(DEADLINE_MARGIN + 0.05))
+            remaining.append(deadline.remaining())
+
+        try:
+            thread = threading.Thread(target=short_request)
+            thread.start()
+            thread.join()
+
+            expect(remaining[0]).to(be_below(1))
+            expect(deadline.remaining()).to(be_above(59))
+        finally:
+            deadline.clear()
+
+    with it('runs the function under its own deadline when the leader ran out of time'):
+        flight = SingleFlight('spec', timeout=2)
+        results = []
+
+        def short_leader():
+            deadline.start(FakeLambdaContext(DEADLINE_MARGIN + 0.05))
+            self.release.wait(2)
+            raise deadline.exceeded('find properties')
+
+        def run_leader():
+            try:
+                flight.do('key', short_leader)
+            except DeadlineExceededError:
+                results.append('leader failed')
+
+        leader = threading.Thread(target=run_leader)
+        leader.start()
+        _wait_for_waiters(flight, 'key', 0)
+
+        waiter = threading.Thread(target=lambda: results.append(flight.do('key', lambda: 'own')))
+        waiter.start()
+        _wait_for_waiters(flight, 'key', 1)
+
+        self.release.set()
+        leader.join()
+        waiter.join()
+
+        expect(sorted(results)).to(equal(['leader failed', 'own']))
+        expect(metrics.get('singleflight.spec.retries')).to(equal(1))
@@ -0,0 +1,75 @@
+"""Catalog snapshot specs."""
+
+import os
+import tempfile
+
+from expects import equal, expect
+from mamba import after, before, description, it
+
+from src.commons.snapshot import CatalogSnapshot, build_snapshot
+
+RECORDS = [
+    {
+        'id': 7,
+        'address': 'calle 1',
+        'city': 'medellín',
+        'price': 300,
+        'year': 2001,
+        'status_id': 3
+    },
+    {
+        'id': 3,
+        'address': 'calle 2',
+        'city': 'bogota',
+        'price': None,
+        'year': 1999,
+        'latitude': 4.7,
+        'status_id': 4
+    },
+    {
+        'id': 5,
+        'address': None,
+        'city': 'bogota',
+        'price': 100,
+        'year': 1990,
+        'status_id': 5
+    },
+    {
+        'id': 9,
+        'address': 'calle 3',
+        'city': None,
+        'price': 200,
+        'year': None,
+        'status_id': 3
+    },
+]
+
+with description('Catalog snapshot') as self:
+
+    with before.each:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'catalog.snap')
+        build_snapshot(RECORDS, self.path)
+        self.snapshot = CatalogSnapshot(self.path)
+
+    with after.each:
+        self.snapshot.close()
+        self.tmp.cleanup()
+
+    with it('stores rows sorted by city and year with their values and nulls'):
+        rows = [row for start, end in self.snapshot.city_ranges() for row in range(start, end)]
+        values = [(self.snapshot.value('id', row), self.snapshot.value('city', row)) for row in rows]
+
+        expect(values).to(equal([(5, 'bogota'), (3, 'bogota'), (7, 'medellín'), (9, None)]))
+
+    with it('decodes null values as None'):
+        row = self.snapshot.find_row(3)
+
+        expect(self.snapshot.value('price', row)).to(equal(None))
+        expect(self.snapshot.value('latitude', row)).to(equal(4.7))
+        expect(self.snapshot.value('address', self.snapshot.find_row(5))).to(equal(None))
+
+    with it('finds city ranges and rows by id'):
+        expect(self.snapshot.city_ranges(['bogota', 'cali'])).to(equal([(0, 2)]))
+        expect(self.snapshot.find_row(7)).to(equal(2))
+        expect(self.snapshot.find_row(8)).to(equal(None))
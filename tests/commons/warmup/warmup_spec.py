@@ -0,0 +1,37 @@
+"""Container warm-up specs."""
+
+from expects import be_false, be_true, equal, expect
+from mamba import after, before, description, it
+
+from src.commons import warmup
+from src.commons.warmup import warmup as warmup_module
+
+with description('warmup') as self:
+
+    with before.each:
+        self.warmers = list(warmup_module._WARMERS)  # pylint: disable=protected-access
+        self.calls = []
+
+    with after.each:
+        warmup_module._WARMERS[:] = self.warmers  # pylint: disable=protected-access
+
+    with it('recognizes warm-up events'):
+        expect(warmup.is_warmup({'warmup': True})).to(be_true)
+        expect(warmup.is_warmup({'source': 'serverless-plugin-warmup'})).to(be_true)
+        expect(warmup.is_warmup({'source': 'aws.events'})).to(be_false)
+        expect(warmup.is_warmup({'headers': {}, 'body': None})).to(be_false)
+
+    with it('runs every warmer even when one of them fails'):
+
+        def fail():
+            raise ConnectionError('database down')
+
+        warmup_module._WARMERS[:] = []  # pylint: disable=protected-access
+        warmup.register(fail)
+        warmup.register(lambda: self.calls.append('primed'))
+
+        summary = warmup.run()
+
+        expect(self.calls).to(equal(['primed']))
+        expect(summary['warmers']).to(equal(2))
+        expect(summary['failed']).to(equal(1))
@@ -0,0 +1,42 @@
+"""Property changes feed helpers specs."""
+
+from datetime import datetime
+
+from expects import equal, expect, raise_error
+from mamba import description, it
+
+from src.commons.errors import BadRequestError
+from src.helpers.changes import decode_cursor, encode_cursor, latest_changes
+from src.models import Property
+
+
+def _property(property_id):
+    item = Property()
+    item.id = property_id
+    return item
+
+
+with description('Property changes cursor'):
+
+    with it('decodes the encoded history id'):
+        expect(decode_cursor(encode_cursor(42))).to(equal(42))
+
+    with it('takes the history id of former update date cursors'):
+        expect(decode_cursor('MjAyMS0wMy0wNFQwNTowNjowN3w0Mg')).to(equal(42))
+
+    with it('starts from the first change without cursor'):
+        expect(decode_cursor(None)).to(equal(None))
+
+    with it('rejects malformed cursors'):
+        expect(lambda: decode_cursor('not-a-cursor')).to(raise_error(BadRequestError))
+
+with description('latest_changes'):
+
+    with it('keeps the last change of every property in cursor order'):
+        rows = [
+            (1, 3, datetime(2021, 1, 1), _property(10)),
+            (2, 3, datetime(2021, 1, 2), _property(20)),
+            (3, 4, datetime(2021, 1, 3), _property(10)),
+        ]
+
+        expect([row[0] for row in latest_changes(rows)]).to(equal([2, 3]))
@@ -0,0 +1,17 @@
+"""Properties helpers specs."""
+
+from expects import equal, expect, raise_error
+from mamba import description, it
+
+from src.commons.errors import BadRequestError
+from src.helpers.properties import transform_year_from_params
+
+with description('transform_year_from_params'):
+
+    with it('casts the exact year and the year range'):
+        expect(transform_year_from_params('2000')).to(equal((2000, None, None)))
+        expect(transform_year_from_params(None, '1990', '2010')).to(equal((None, 1990, 2010)))
+
+    with it('rejects an exact year combined with a year range'):
+        expect(lambda: transform_year_from_params('2000', '1990')).to(raise_error(BadRequestError))
+        expect(lambda: transform_year_from_params('2000', None, '2010')).to(raise_error(BadRequestError))
@@ -0,0 +1,69 @@
+"""Property stats helpers specs."""
+
+from datetime import datetime
+
+from expects import equal, expect
+from mamba import description, it
+
+from src.helpers.stats import (
+    compute_moves,
+    compute_rollup,
+    transform_group_by_from_params,
+)
+
+DIMENSIONS = {1: ('cali', 2000), 2: ('bogota', 2010)}
+
+with description('compute_rollup'):
+
+    with it('counts new properties on their latest status'):
+        changes = [(10, 1, 3, datetime(2021, 1, 1)), (11, 1, 4, datetime(2021, 1, 2))]
+        deltas, current = compute_rollup(changes, {}, DIMENSIONS)
+
+        expect(deltas).to(equal({('cali', 2000, 4): 1}))
+        expect(current).to(equal({1: (4, datetime(2021, 1, 2), 'cali', 2000)}))
+
+    with it('moves properties between status buckets'):
+        changes = [(12, 2, 5, datetime(2021, 2, 1))]
+        deltas, _ = compute_rollup(changes, {2: (4, datetime(2021, 1, 1), 'bogota', 2010)}, DIMENSIONS)
+
+        expect(deltas).to(equal({('bogota', 2010, 4): -1, ('bogota', 2010, 5): 1}))
+
+    with it('moves properties out of the listed statuses'):
+        changes = [(13, 2, 1, datetime(2021, 2, 1))]
+        deltas, _ = compute_rollup(changes, {2: (4, datetime(2021, 1, 1), 'bogota', 2010)}, DIMENSIONS)
+
+        expect(deltas).to(equal({('bogota', 2010, 4): -1, ('bogota', 2010, 1): 1}))
+
+    with it('ignores changes older than the current status'):
+        changes = [(13, 2, 3, datetime(2020, 1, 1))]
+        deltas, current = compute_rollup(changes, {2: (4, datetime(2021, 1, 1), 'bogota', 2010)}, DIMENSIONS)
+
+        expect(deltas).to(equal({}))
+        expect(current).to(equal({}))
+
+    with it('moves properties out of the city and year they were counted under'):
+        changes = [(14, 2, 5, datetime(2021, 2, 1))]
+        deltas, current = compute_rollup(changes, {2: (4, datetime(2021, 1, 1), 'cali', 1999)}, DIMENSIONS)
+
+        expect(deltas).to(equal({('cali', 1999, 4): -1, ('bogota', 2010, 5): 1}))
+        expect(current).to(equal({2: (5, datetime(2021, 2, 1), 'bogota', 2010)}))
+
+with description('compute_moves'):
+
+    with it('moves properties to the bucket of their new city and year keeping the status'):
+        deltas, dimensions = compute_moves([(1, 3, 'cali', 2000, 'bogota', 2000), (2, 4, 'cali', 2000, 'cali', 2001)])
+
+        expect(deltas).to(
+            equal({
+                ('cali', 2000, 3): -1,
+                ('bogota', 2000, 3): 1,
+                ('cali', 2000, 4): -1,
+                ('cali', 2001, 4): 1,
+            })
+        )
+        expect(dimensions).to(equal({1: ('bogota', 2000), 2: ('cali', 2001)}))
+
+with description('transform_group_by_from_params'):
+
+    with it('keeps the canonical dimensions order and skips unknown ones'):
+        expect(transform_group_by_from_params('status,foo,city')).to(equal(['city', 'status']))
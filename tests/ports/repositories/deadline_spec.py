@@ -0,0 +1,52 @@
+"""Deadline bounded queries specs."""
+
+from expects import equal, expect, raise_error, start_with
+from mamba import after, description, it
+from mysql.connector.errors import DatabaseError
+
+from src.commons import deadline as clock
+from src.commons.deadline.deadline import DEADLINE_MARGIN
+from src.commons.errors import DeadlineExceededError
+from src.ports.repositories import deadline
+
+
+class FakeLambdaContext:
+    """Lambda context stand-in with the given remaining seconds."""
+
+    def __init__(self, remaining):
+        self.remaining = remaining
+
+    def get_remaining_time_in_millis(self):
+        return self.remaining * 1000
+
+
+class TimeoutDriver:
+    """Driver stand-in that records queries and fails like an interrupted statement."""
+
+    def __init__(self):
+        self.queries = []
+
+    def query(self, sql, args):
+        self.queries.append(sql)
+        raise DatabaseError(msg='maximum statement execution time exceeded', errno=deadline.ER_QUERY_TIMEOUT)
+
+
+with description('deadline bounded queries') as self:
+
+    with after.each:
+        clock.clear()
+
+    with it('adds the MAX_EXECUTION_TIME hint to SELECT statements'):
+        sql = deadline.with_max_execution_time('SELECT `id` FROM `property`', 1.25)
+
+        expect(sql).to(equal('SELECT /*+ MAX_EXECUTION_TIME(1250) */ `id` FROM `property`'))
+        expect(deadline.with_max_execution_time('UPDATE t SET a = 1', 1)).to(equal('UPDATE t SET a = 1'))
+
+    with it('turns interrupted statements into deadline errors'):
+        clock.start(FakeLambdaContext(DEADLINE_MARGIN + 5))
+        driver = TimeoutDriver()
+
+        query = lambda: deadline.query(driver, 'SELECT 1', [], 'find properties')
+
+        expect(query).to(raise_error(DeadlineExceededError))
+        expect(driver.queries[0]).to(start_with('SELECT /*+ MAX_EXECUTION_TIME(4'))
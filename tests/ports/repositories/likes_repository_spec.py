@@ -0,0 +1,64 @@
+"""Likes repository specs."""
+
+from expects import be_false, be_true, equal, expect, raise_error
+from mamba import description, it
+from mysql.connector.errors import IntegrityError
+
+from src.commons.errors import NotFoundError
+from src.ports.repositories import LikesRepository
+
+
+class FailingDriver:
+    """Driver stand-in whose statements fail with the given MySQL error number."""
+
+    def __init__(self, errno=None):
+        self.errno = errno
+
+    def query_none(self, **_):
+        if self.errno is not None:
+            raise IntegrityError(msg='integrity error', errno=self.errno)
+
+
+with description('LikesRepository like'):
+
+    with it('reports new likes'):
+        expect(LikesRepository(FailingDriver()).like(7, 1)).to(be_true)
+
+    with it('reports repeated likes as unchanged'):
+        expect(LikesRepository(FailingDriver(errno=1062)).like(7, 1)).to(be_false)
+
+    with it('raises not found for properties that do not exist'):
+        expect(lambda: LikesRepository(FailingDriver(errno=1452)).like(7, 404)).to(raise_error(NotFoundError))
+
+    with it('raises other database errors'):
+        expect(lambda: LikesRepository(FailingDriver(errno=1213)).like(7, 1)).to(raise_error(IntegrityError))
+
+
+class CursorDriver:
+    """Driver stand-in whose cursor reports the given number of affected rows."""
+
+    def __init__(self, rowcount):
+        self.rowcount = rowcount
+        self.statements = []
+
+    def get_real_driver(self):
+        return self
+
+    def cursor(self):
+        return self
+
+    def execute(self, sql, args):
+        self.statements.append((sql, args))
+
+    def close(self):
+        pass
+
+
+with description('LikesRepository unlike'):
+
+    with it('reads the deleted rows from the DELETE cursor'):
+        driver = CursorDriver(rowcount=1)
+
+        expect(LikesRepository(driver).unlike(7, 1)).to(be_true)
+        expect(LikesRepository(CursorDriver(rowcount=0)).unlike(7, 1)).to(be_false)
+        expect(driver.statements).to(equal([('DELETE FROM liked WHERE property_id = %s AND user_id = %s', (1, 7))]))
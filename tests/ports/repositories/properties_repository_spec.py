@@ -0,0 +1,200 @@
+"""Properties repository specs."""
+
+import os
+from datetime import datetime
+
+from expects import contain, end_with, equal, expect, start_with
+from mamba import before, description, it
+from pydbrepo.drivers.mysql import Mysql
+from pypika import Order
+
+from src.models import PropertyFilters
+from src.ports.repositories import PropertiesRepository
+from src.ports.repositories.properties_repository import INDEX_HINT_MAX_IDS
+
+
+class FakeDriver:
+    """Driver stand-in that only builds placeholders."""
+
+    @staticmethod
+    def placeholder(**_):
+        return '%s'
+
+
+class RecordingDriver(FakeDriver):
+    """Driver stand-in that records the executed queries and answers them with the given records."""
+
+    def __init__(self, records):
+        self.records = records
+        self.queries = []
+
+    def query(self, sql, args):
+        self.queries.append((sql, args))
+        return self.records
+
+    def query_none(self, sql, args):
+        self.queries.append((sql, args))
+
+
+# Long enough for the composite index hint
+MANY_IDS = list(range(1, INDEX_HINT_MAX_IDS + 2))
+
+# Filter shapes with the index that should resolve them when the status id list is long
+COMMON_FILTERS = [
+    (PropertyFilters(cities=['bogota']), 'idx_property_city_year_price'),
+    (PropertyFilters(cities=['bogota', 'medellin'], year=2000), 'idx_property_city_year_price'),
+    (PropertyFilters(cities=['bogota'], year_min=1990, year_max=2010), 'idx_property_city_year_price'),
+    (PropertyFilters(year=2000, price_max=500000000), 'idx_property_year_price'),
+    (PropertyFilters(year_min=2000), 'idx_property_year_price'),
+    (PropertyFilters(price_min=100000000, price_max=500000000), 'idx_property_price'),
+]
+
+with description('PropertiesRepository filters query') as self:
+
+    with before.each:
+        self.repo = PropertiesRepository(FakeDriver())
+
+    with it('uses the city composite index and sorts equality predicates first'):
+        filters = PropertyFilters(cities=['bogota'], price_min=10, year_min=1990, year_max=2000)
+        sql_query, values = self.repo.build_filters_query(filters, MANY_IDS)
+        sql = str(sql_query)
+
+        expect(sql).to(contain('USE INDEX (`idx_property_city_year_price`)'))
+        expect(sql.split(' WHERE ')[1]).to(start_with('`city` IN (%s) AND `year` BETWEEN %s AND %s'))
+        expect(values).to(equal(['bogota', 1990, 2000, 10, *MANY_IDS]))
+
+    with it('uses the year composite index when no city is given'):
+        sql_query, values = self.repo.build_filters_query(PropertyFilters(year=2000, price_max=10), MANY_IDS)
+
+        expect(str(sql_query)).to(contain('USE INDEX (`idx_property_year_price`)'))
+        expect(values).to(equal([2000, 10, *MANY_IDS]))
+
+    with it('leaves short id lists to the optimizer so PRIMARY can resolve them'):
+        sql_query, values = self.repo.build_filters_query(PropertyFilters(year=2000, price_max=10), [1, 2])
+
+        expect(str(sql_query)).not_to(contain('USE INDEX'))
+        expect(values).to(equal([2000, 10, 1, 2]))
+
+    with it('intersects an exact year with the year range'):
+        sql_query, values = self.repo.build_filters_query(PropertyFilters(year=2000, year_max=2010), [1])
+        _, empty = self.repo.build_filters_query(PropertyFilters(year=2000, year_min=2005), [1])
+
+        expect(str(sql_query)).to(contain('`year`=%s'))
+        expect(values).to(equal([2000, 1]))
+        expect(empty).to(equal([2005, 2000, 1]))
+
+    with it('does not add an index hint without indexed filters'):
+        sql_query, values = self.repo.build_filters_query(PropertyFilters(), [1, 2, 3])
+
+        expect(str(sql_query)).not_to(contain('USE INDEX'))
+        expect(values).to(equal([1, 2, 3]))
+
+    with it('only selects the requested fields'):
+        sql_query, _ = self.repo.build_filters_query(PropertyFilters(fields=['id', 'city', 'price']), [1])
+
+        expect(str(sql_query)).to(start_with('SELECT `id`,`city`,`price` FROM `property`'))
+
+    with it('adds the requested ordering'):
+        filters = PropertyFilters(sort=[('price', Order.desc), ('year', Order.asc)])
+        sql_query, _ = self.repo.build_filters_query(filters, [1])
+
+        expect(str(sql_query)).to(contain('ORDER BY `price` DESC,`year` ASC'))
+
+    with it('searches full text without index hints ordering by relevance'):
+        sql_query, values = self.repo.build_filters_query(PropertyFilters(q='piscina', cities=['cali']), [1])
+        sql = str(sql_query)
+
+        expect(sql).not_to(contain('USE INDEX'))
+        expect(sql).to(contain('WHERE MATCH(`description`,`address`) AGAINST (%s IN NATURAL LANGUAGE MODE)'))
+        expect(sql).to(contain('ORDER BY MATCH(`description`,`address`)'))
+        expect(values).to(equal(['piscina', 'cali', 1, 'piscina']))
+
+    with it('splits proximity boxes that cross the antimeridian'):
+        filters = PropertyFilters(lat=0.0, lon=179.99, radius=5)
+        sql_query, values = self.repo.build_filters_query(filters, [1])
+        boxes = values[:2]
+
+        expect(str(sql_query).split(' WHERE ')[1]).to(
+            start_with('(MBRContains(ST_GeomFromText(%s),`location`) OR MBRContains(ST_GeomFromText(%s),`location`))')
+        )
+        expect(boxes[0]).to(start_with('POLYGON((179.9'))
+        expect(boxes[0]).to(contain(',180.0 '))
+        expect(boxes[1]).to(start_with('POLYGON((-180.0 '))
+        expect(boxes[1]).to(contain(',-179.96'))
+
+    with it('searches by proximity with the spatial index ordering by distance'):
+        filters = PropertyFilters(cities=['bogota'], year_min=2000, lat=4.711, lon=-74.0721, radius=5)
+        sql_query, values = self.repo.build_filters_query(filters, [1])
+        sql = str(sql_query)
+
+        expect(sql).not_to(contain('USE INDEX'))
+        expect(sql.split(' WHERE ')[1]).to(start_with('MBRContains(ST_GeomFromText(%s),`location`)'))
+        expect(sql).to(contain('ST_Distance_Sphere(`location`,POINT(%s,%s))<=%s'))
+        expect(sql).to(contain('ORDER BY ST_Distance_Sphere(`location`,POINT(%s,%s)) ASC'))
+        expect(values[0]).to(start_with('POLYGON(('))
+        expect(values[1:]).to(equal(['bogota', 2000, 1, -74.0721, 4.711, 5000, -74.0721, 4.711]))
+
+    if os.getenv('TEST_DATABASE_URL'):
+
+        with it('resolves common filter shapes with the expected property index'):
+            with Mysql(url=os.getenv('TEST_DATABASE_URL')) as driver:
+                repo = PropertiesRepository(driver)
+
+                for filters, index in COMMON_FILTERS:
+                    for ids, key in ((MANY_IDS, index), ([1, 2], 'PRIMARY')):
+                        sql_query, values = repo.build_filters_query(filters, ids)
+                        plan = driver.query(sql=f'EXPLAIN {sql_query}', args=values)
+                        keys = [row[6] for row in plan if row[2] == 'property']
+
+                        expect(keys).to(equal([key]))
+
+with description('PropertiesRepository status changes') as self:
+
+    with before.each:
+        self.columns = tuple(PropertiesRepository(FakeDriver()).entity_properties)
+
+    def record(self, history_id, settled, property_id):
+        values = {'id': property_id, 'city': 'bogota'}
+        return (history_id, 3, datetime(2021, 1, 1), settled, *(values.get(column, None) for column in self.columns))
+
+    with it('pages over the status history id from the cursor'):
+        driver = RecordingDriver([self.record(43, 1, 7)])
+        changes = PropertiesRepository(driver).find_status_changes(42, 100, settle_seconds=5)
+        sql, args = driver.queries[0]
+
+        expect(sql).to(contain('WHERE sh.id > %s AND sh.status_id IN (%s,%s,%s)'))
+        expect(sql).to(contain('sh.recorded_at <= NOW(6) - INTERVAL %s SECOND'))
+        expect(sql).to(end_with('ORDER BY sh.id LIMIT %s'))
+        expect(sql).not_to(contain('update_date >'))
+        expect(args).to(equal([5, 42, 3, 4, 5, 100]))
+        expect([(change[0], change[3].id) for change in changes]).to(equal([(43, 7)]))
+
+    with it('starts from the first change without cursor'):
+        driver = RecordingDriver([])
+        PropertiesRepository(driver).find_status_changes(None, 10)
+
+        expect(driver.queries[0][1][:2]).to(equal([0, 0]))
+
+    with it('stops the page at the first change that has not settled'):
+        driver = RecordingDriver([self.record(43, 1, 7), self.record(44, 0, 8), self.record(45, 1, 9)])
+        changes = PropertiesRepository(driver).find_status_changes(42, 100, settle_seconds=5)
+
+        expect([change[0] for change in changes]).to(equal([43]))
+
+with description('PropertiesRepository status history insert'):
+
+    with it('skips the status changes that are already stored'):
+        driver = RecordingDriver([])
+        records = [
+            dict(property_id=1, status_id=3, update_date=None),
+            dict(property_id=2, status_id=4, update_date='2021-01-01 00:00:00'),
+        ]
+
+        PropertiesRepository(driver).insert_status_history(records)
+        sql, args = driver.queries[0]
+
+        expect(sql).to(start_with('INSERT INTO status_history (`property_id`,`status_id`,`update_date`) SELECT '))
+        expect(sql).to(contain('FROM (SELECT %s AS `property_id`,%s AS `status_id`,%s AS `update_date` UNION ALL'))
+        expect(sql).to(contain('WHERE NOT EXISTS ('))
+        expect(sql).to(contain(') <=> n.status_id))'))
+        expect(args).to(equal([1, 3, None, 2, 4, '2021-01-01 00:00:00']))
@@ -0,0 +1,86 @@
+"""Snapshot properties repository specs."""
+
+import os
+import tempfile
+
+from expects import equal, expect
+from mamba import after, before, description, it
+from pypika import Order
+
+from src.commons.snapshot import CatalogSnapshot, build_snapshot
+from src.models import PropertyFilters
+from src.models.types import PropertyStatus
+from src.ports.repositories import SnapshotPropertiesRepository
+
+RECORDS = [
+    {
+        'id': 1,
+        'city': 'bogota',
+        'price': 300,
+        'year': 2001,
+        'status_id': 3
+    },
+    {
+        'id': 2,
+        'city': 'bogota',
+        'price': 100,
+        'year': 1995,
+        'status_id': 4
+    },
+    {
+        'id': 3,
+        'city': 'cali',
+        'price': 200,
+        'year': 2005,
+        'status_id': 5
+    },
+    {
+        'id': 4,
+        'city': 'cali',
+        'price': None,
+        'year': None,
+        'status_id': 4
+    },
+    {
+        'id': 5,
+        'city': 'medellin',
+        'price': 500,
+        'year': 2010,
+        'status_id': 3
+    },
+]
+
+
+def _ids(properties):
+    return [item.id for item in properties or []]
+
+
+with description('SnapshotPropertiesRepository') as self:
+
+    with before.each:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'catalog.snap')
+        build_snapshot(RECORDS, self.path)
+        self.snapshot = CatalogSnapshot(self.path)
+        self.repo = SnapshotPropertiesRepository(self.snapshot)
+
+    with after.each:
+        self.snapshot.close()
+        self.tmp.cleanup()
+
+    with it('filters by city, year range and price'):
+        filters = PropertyFilters(cities=['bogota', 'cali'], year_max=2004, price_min=150)
+
+        expect(_ids(self.repo.find_by_filters(filters))).to(equal([1]))
+
+    with it('filters by status and sorts'):
+        filters = PropertyFilters(
+            statuses=[PropertyStatus.pre_venta, PropertyStatus.vendido], sort=[('price', Order.desc)]
+        )
+
+        expect(_ids(self.repo.find_by_filters(filters))).to(equal([5, 1, 3]))
+
+    with it('keeps the ids order and only reads the requested fields'):
+        properties = self.repo.find_by_filters(PropertyFilters(ids=[4, 9, 2], year_max=2000, fields=['id', 'city']))
+
+        expect([(item.id, item.city, item.price) for item in properties]).to(equal([(2, 'bogota', None)]))
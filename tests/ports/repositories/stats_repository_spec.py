@@ -0,0 +1,56 @@
+"""Property stats repository specs."""
+
+from datetime import datetime
+
+from expects import contain, equal, expect, start_with
+from mamba import description, it
+
+from src.models import PropertyFilters
+from src.models.types import PropertyStatus
+from src.ports.repositories import StatsRepository
+
+
+class RecordingDriver:
+    """Driver stand-in that records the executed queries and answers them with the given records."""
+
+    def __init__(self, records):
+        self.records = records
+        self.queries = []
+
+    @staticmethod
+    def placeholder(**_):
+        return '%s'
+
+    def query(self, sql, args):
+        self.queries.append((sql, args))
+        return self.records
+
+
+with description('StatsRepository status changes'):
+
+    with it('reads changes of every status after the high-water mark'):
+        driver = RecordingDriver([(43, 7, 1, datetime(2021, 1, 1), 1)])
+        changes = StatsRepository(driver).find_status_changes(42, 100, settle_seconds=5)
+        sql, args = driver.queries[0]
+
+        expect(sql).to(contain('recorded_at <= NOW(6) - INTERVAL %s SECOND'))
+        expect(sql).to(contain('WHERE id > %s ORDER BY id LIMIT %s'))
+        expect(sql).not_to(contain('status_id IN'))
+        expect(args).to(equal([5, 42, 100]))
+        expect(changes).to(equal([(43, 7, 1, datetime(2021, 1, 1))]))
+
+    with it('stops the batch at the first change that has not settled'):
+        driver = RecordingDriver([(43, 7, 3, None, 1), (44, 8, 4, None, 0), (45, 9, 5, None, 1)])
+        changes = StatsRepository(driver).find_status_changes(42, 100, settle_seconds=5)
+
+        expect([change[0] for change in changes]).to(equal([43]))
+
+with description('StatsRepository stats'):
+
+    with it('only serves the listed statuses by default'):
+        driver = RecordingDriver([])
+        StatsRepository(driver).find_stats(['status'], PropertyFilters())
+        sql, args = driver.queries[0]
+
+        expect(sql.split(' WHERE ')[1]).to(start_with('`status_id` IN (%s,%s,%s)'))
+        expect(args).to(equal([item.value for item in PropertyStatus]))